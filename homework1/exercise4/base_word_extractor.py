@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Base Word Extractor for Emphatic Vowel Duplications
+
+exercise4b_refined.py and exercise4c.py call extract_base_word_and_vowel for
+every emphatic match. The original method tried the five vowels one after the
+other, building a pattern string and calling re.search and re.sub with
+IGNORECASE for each, although the same surface forms ("sooooo", "soooo")
+repeat thousands of times in the corpus.
+
+This module finds all runs of 3+ identical vowels in a single left-to-right
+pass of one compiled pattern and derives the result from those runs. Both
+functions sit behind a bounded LRU cache.
+
+- extract_base_word_and_vowel(word): same result as the original method.
+  The first vowel in a, e, i, o, u order that has a run wins, and only that
+  vowel's runs are collapsed:
+  "reeeaaally" -> ("reeeally", "a").
+- extract_base_word_and_vowels(word): collapses every emphatic run and
+  returns the duplicated vowels in the order they appear:
+  "reeeaaally" -> ("really", ("e", "a")).
+
+Author: NLP Course Exercise
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+
+VOWEL_ORDER = 'aeiou'
+EMPHATIC_RUN = re.compile(r'([aeiou])\1{2,}')
+CACHE_SIZE = 65536
+
+
+def _runs(word: str) -> List[Tuple[str, int, int]]:
+    """Return (vowel, start, end) for every run of 3+ identical vowels."""
+    return [(m.group(1), m.start(), m.end()) for m in EMPHATIC_RUN.finditer(word)]
+
+
+def _collapse(word: str, runs: List[Tuple[str, int, int]]) -> str:
+    pieces = []
+    position = 0
+    for vowel, start, end in runs:
+        pieces.append(word[position:start])
+        pieces.append(vowel)
+        position = end
+    pieces.append(word[position:])
+    return ''.join(pieces)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def extract_base_word_and_vowel(emphatic_word: str) -> Optional[Tuple[str, str]]:
+    """
+    Extract the base word and the duplicated vowel of an emphatic word.
+
+    Args:
+        emphatic_word: Word containing emphatic vowel duplications (3+ consecutive)
+
+    Returns:
+        Tuple of (base_word, duplicated_vowel) or None if there is no emphatic run
+    """
+    word = emphatic_word.lower()
+    runs = _runs(word)
+    if not runs:
+        return None
+
+    vowel = min((run[0] for run in runs), key=VOWEL_ORDER.index)
+    return (_collapse(word, [run for run in runs if run[0] == vowel]), vowel)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def extract_base_word_and_vowels(emphatic_word: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+    """
+    Collapse every emphatic vowel run of a word.
+
+    Args:
+        emphatic_word: Word containing emphatic vowel duplications
+
+    Returns:
+        Tuple of (base_word, duplicated vowels in order of first appearance),
+        or None if there is no emphatic run
+    """
+    word = emphatic_word.lower()
+    runs = _runs(word)
+    if not runs:
+        return None
+
+    vowels = tuple(dict.fromkeys(run[0] for run in runs))
+    return (_collapse(word, runs), vowels)
+
+
+def cache_info() -> dict:
+    """Hit/miss statistics of both caches."""
+    return {
+        'single_vowel': extract_base_word_and_vowel.cache_info()._asdict(),
+        'multi_vowel': extract_base_word_and_vowels.cache_info()._asdict()
+    }
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Bytes-Mode Scanning for the Vowel Duplication Engines
+
+The finder and the normalizers read every blog with encoding='utf-8',
+errors='ignore' and decode the whole file, although all their patterns
+(([aeiou])\\1{2,}, \\b\\w*...\\w*\\b, [^a-zA-Z]) only concern ASCII. This
+module runs the same patterns as compiled bytes regexes on the raw file
+contents and decodes only what is needed, with results identical to text
+mode:
+
+- ASCII stretches of a buffer are scanned with the bytes pattern and only
+  the matched spans are decoded. On ASCII, bytes \\w, \\b and IGNORECASE
+  agree with their Unicode counterparts.
+- A line that contains non-ASCII bytes (é, curly quotes, ...) is decoded on
+  its own and scanned with the text pattern, since Unicode \\w and
+  case-folding differ there. None of the patterns crosses a newline, so
+  scanning line by line finds exactly the matches of a whole-text scan.
+
+Files are memory-mapped for scanning. Carriage returns are translated to
+newlines first, as the universal-newline text mode does.
+
+Author: NLP Course Exercise
+"""
+
+import re
+import mmap
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple, Union
+
+Buffer = Union[bytes, mmap.mmap]
+
+NON_ASCII = re.compile(rb'[\x80-\xff]')
+
+# (start, end, decoded line) for non-ASCII lines, (start, end, None) for ASCII stretches
+Segment = Tuple[int, int, Optional[str]]
+
+
+class DualPattern:
+    """One ASCII regular expression compiled for both str and bytes input."""
+
+    def __init__(self, pattern: str, flags: int = 0):
+        self.pattern = pattern
+        self.text = re.compile(pattern, flags)
+        self.bytes = re.compile(pattern.encode('ascii'), flags)
+
+    def against(self, data: Union[str, bytes]) -> re.Pattern:
+        """The compiled pattern matching the type of data."""
+        return self.text if isinstance(data, str) else self.bytes
+
+    def sub(self, repl, data: Union[str, bytes]) -> Union[str, bytes]:
+        """re.sub with a template (str, encoded for bytes input) or a callable replacement."""
+        if isinstance(repl, str) and not isinstance(data, str):
+            repl = repl.encode('ascii')
+        return self.against(data).sub(repl, data)
+
+    def finditer(self, data: Union[str, bytes]) -> Iterator[re.Match]:
+        return self.against(data).finditer(data)
+
+    def findall(self, data: Union[str, bytes]) -> list:
+        return self.against(data).findall(data)
+
+
+def as_text(value: Union[str, bytes]) -> str:
+    """Decode a matched span of an ASCII buffer; str values pass through."""
+    return value if isinstance(value, str) else value.decode('ascii')
+
+
+def is_ascii(buffer: Buffer) -> bool:
+    return NON_ASCII.search(buffer) is None
+
+
+def read_bytes(path: str) -> bytes:
+    """
+    Read a file as raw bytes with universal newlines.
+
+    Args:
+        path: File to read
+
+    Returns:
+        The contents, with \\r\\n and \\r translated to \\n
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if b'\r' in data:
+        data = data.replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+    return data
+
+
+def decode(data: bytes) -> str:
+    """Decode like the text-mode readers (UTF-8, undecodable bytes dropped)."""
+    return data.decode('utf-8', errors='ignore')
+
+
+@contextmanager
+def mapped(path: str) -> Iterator[Buffer]:
+    """
+    Memory-map a file for scanning.
+
+    Empty files and files containing carriage returns are read into memory
+    instead (an empty file cannot be mapped, and newline translation needs a
+    copy).
+
+    Yields:
+        A read-only buffer the bytes patterns can search
+    """
+    with open(path, 'rb') as f:
+        try:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            yield b''
+            return
+        try:
+            if buffer.find(b'\r') == -1:
+                yield buffer
+            else:
+                yield read_bytes(path)
+        finally:
+            buffer.close()
+
+
+def split_segments(buffer: Buffer) -> List[Segment]:
+    """
+    Split a buffer into ASCII stretches and decoded non-ASCII lines.
+
+    Args:
+        buffer: Raw file contents
+
+    Returns:
+        Segments covering the buffer in order; an ASCII buffer is one segment
+    """
+    segments = []
+    position = 0
+    size = len(buffer)
+    while position < size:
+        found = NON_ASCII.search(buffer, position)
+        if found is None:
+            segments.append((position, size, None))
+            break
+        line_start = buffer.rfind(b'\n', position, found.start()) + 1
+        if line_start == 0:
+            line_start = position
+        line_end = buffer.find(b'\n', found.end())
+        if line_end == -1:
+            line_end = size
+        if line_start > position:
+            segments.append((position, line_start, None))
+        segments.append((line_start, line_end, decode(buffer[line_start:line_end])))
+        position = line_end
+    return segments
+
+
+def scan_words(buffer: Buffer, pattern: DualPattern,
+               segments: Optional[List[Segment]] = None) -> Iterator[str]:
+    """
+    Yield the text of every match of pattern, as a text-mode scan would.
+
+    Args:
+        buffer: Raw file contents
+        pattern: Pattern that does not match across newlines
+        segments: Result of split_segments(buffer), to share between patterns
+
+    Yields:
+        group(0) of each match, as str
+    """
+    if segments is None:
+        segments = split_segments(buffer)
+    for start, end, line in segments:
+        if line is None:
+            for match in pattern.bytes.finditer(buffer, start, end):
+                yield match.group(0).decode('ascii')
+        else:
+            for match in pattern.text.finditer(line):
+                yield match.group(0)
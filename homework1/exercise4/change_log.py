@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Change Logs for Regex Normalization
+
+The normalization scripts measured their own effect after the fact:
+exercise4d_simple.py kept the original and every normalized copy of a file
+to compute len(content) - len(normalized) and re-scanned the original to
+guess which runs had changed, and exercise4d_regex_normalization.py ran
+re.findall before every re.sub just to count matches.
+
+Here the substitution callback records each change as it happens as
+(offset, original run, replacement), offsets being positions in the input.
+Statistics come from the log:
+
+- changed: whether the text changed at all,
+- char_reduction(): characters removed,
+- transformations(): how often each (original, replacement) pair occurred.
+
+substitute() builds the normalized text and fills a log in one pass;
+record_changes() only fills the log (re.finditer, no output string), and
+ChangeLog.apply() can rebuild the output later if needed.
+
+Author: NLP Course Exercise
+"""
+
+from collections import Counter
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+
+from bytes_scanner import DualPattern, as_text
+
+Change = Tuple[int, str, str]
+
+
+class ChangeLog:
+    """Substitutions applied to one text: (offset, original, replacement)."""
+
+    def __init__(self):
+        self.entries: List[Change] = []
+
+    def record(self, offset: int, original: str, replacement: str) -> None:
+        self.entries.append((offset, original, replacement))
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[Change]:
+        return iter(self.entries)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.entries)
+
+    def char_reduction(self) -> int:
+        """Characters removed by all substitutions together."""
+        return sum(len(original) - len(replacement) for _, original, replacement in self.entries)
+
+    def transformations(self, lowercase: bool = True) -> Counter:
+        """
+        Count the distinct substitutions.
+
+        Args:
+            lowercase: Merge case variants ("OOO" -> "oo" counts as "ooo" -> "oo")
+
+        Returns:
+            Counter of (original, replacement) pairs
+        """
+        if lowercase:
+            return Counter((original.lower(), replacement.lower()) for _, original, replacement in self.entries)
+        return Counter((original, replacement) for _, original, replacement in self.entries)
+
+    def apply(self, text: str) -> str:
+        """Rebuild the normalized text from the original it was recorded on."""
+        pieces = []
+        position = 0
+        for offset, original, replacement in self.entries:
+            pieces.append(text[position:offset])
+            pieces.append(replacement)
+            position = offset + len(original)
+        pieces.append(text[position:])
+        return ''.join(pieces)
+
+
+Replacement = Union[str, Callable]
+
+
+def _replacer(repl: Replacement, text: Union[str, bytes]) -> Callable:
+    """Turn a template (str) or callable replacement into a callable one."""
+    if callable(repl):
+        return repl
+    template = repl if isinstance(text, str) else repl.encode('ascii')
+    return lambda match: match.expand(template)
+
+
+def _compiled(pattern, text: Union[str, bytes]):
+    return pattern.against(text) if isinstance(pattern, DualPattern) else pattern
+
+
+def substitute(pattern, repl: Replacement, text: Union[str, bytes],
+               log: Optional[ChangeLog] = None) -> Union[str, bytes]:
+    """
+    re.sub that records every change in a log.
+
+    Args:
+        pattern: Compiled pattern or DualPattern (for str and bytes input)
+        repl: Replacement template or function, as for re.sub
+        text: Input text (or raw bytes of an ASCII file)
+        log: Log to record into; without one this is a plain re.sub
+
+    Returns:
+        The normalized text
+    """
+    compiled = _compiled(pattern, text)
+    if log is None:
+        return compiled.sub(repl if callable(repl) or isinstance(text, str) else repl.encode('ascii'), text)
+
+    replace = _replacer(repl, text)
+
+    def logged(match):
+        replacement = replace(match)
+        original = match.group(0)
+        if replacement != original:
+            log.record(match.start(), as_text(original), as_text(replacement))
+        return replacement
+
+    return compiled.sub(logged, text)
+
+
+def record_changes(pattern, repl: Replacement, text: Union[str, bytes],
+                   log: Optional[ChangeLog] = None) -> ChangeLog:
+    """
+    Log the changes re.sub would make, without building the normalized text.
+
+    Args:
+        pattern: Compiled pattern or DualPattern
+        repl: Replacement template or function, as for re.sub
+        text: Input text (or raw bytes of an ASCII file)
+        log: Log to extend (a new one by default)
+
+    Returns:
+        The log
+    """
+    log = ChangeLog() if log is None else log
+    replace = _replacer(repl, text)
+    for match in _compiled(pattern, text).finditer(text):
+        replacement = replace(match)
+        original = match.group(0)
+        if replacement != original:
+            log.record(match.start(), as_text(original), as_text(replacement))
+    return log
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Seedable Stratified Sampling of the Blog Corpus
+
+VowelNormalizationExperiment.process_sample_files used to take the first N
+files returned by glob.glob, so its sample depended on filesystem order
+(and in practice came from one author gender). This module draws
+representative, reproducible samples in one streaming pass over the
+directory entries (names and sizes only, no file is opened):
+
+- every file gets a pseudo-random key derived from the seed and its name,
+  and each stratum keeps the k files with the smallest keys (a bottom-k
+  reservoir). The sample is uniform within each stratum and does not
+  depend on the order in which files are listed;
+- strata are built from the file name (F-/M- gender prefix, train/test
+  split) and a file size bin;
+- after the pass, the sample size is allocated to the strata
+  proportionally (largest remainder) or equally.
+
+Only the sampled files are read, once, and their texts are cached in
+memory, so several normalization strategies can share them.
+
+Author: NLP Course Exercise
+"""
+
+import os
+import re
+import heapq
+import bisect
+import hashlib
+import fnmatch
+from dataclasses import dataclass
+from collections import Counter
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+
+# File size bin edges in bytes: small (< 11,000), medium, large (>= 12,500)
+DEFAULT_SIZE_BINS = (11_000, 12_500)
+SIZE_BIN_NAMES = ('small', 'medium', 'large')
+STRATUM_FIELDS = ('gender', 'split', 'size')
+
+FILENAME_PATTERN = re.compile(r'^(?P<gender>[FM])-(?P<split>train|test)', re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class SampleFile:
+    """A file of the sample with its stratum attributes."""
+    path: str
+    name: str
+    gender: str
+    split: str
+    size: int
+    size_bin: str
+
+
+def describe_file(path: str, size: int, size_bins: Sequence[int] = DEFAULT_SIZE_BINS) -> SampleFile:
+    """
+    Derive gender, split and size bin of a corpus file.
+
+    Args:
+        path: Path of the file
+        size: File size in bytes
+        size_bins: Ascending size bin edges
+
+    Returns:
+        SampleFile; gender and split are 'unknown' for names not shaped like F-train12.txt
+    """
+    name = os.path.basename(path)
+    match = FILENAME_PATTERN.match(name)
+    gender = match.group('gender').upper() if match else 'unknown'
+    split = match.group('split').lower() if match else 'unknown'
+    index = bisect.bisect_right(size_bins, size)
+    size_bin = SIZE_BIN_NAMES[index] if len(size_bins) == len(SIZE_BIN_NAMES) - 1 else f"bin{index}"
+    return SampleFile(path, name, gender, split, size, size_bin)
+
+
+def stratum_of(sample_file: SampleFile, by: Sequence[str]) -> Tuple[str, ...]:
+    """Stratum of a file: its values of the attributes in by."""
+    values = {'gender': sample_file.gender, 'split': sample_file.split, 'size': sample_file.size_bin}
+    return tuple(values[field] for field in by)
+
+
+def _sample_key(seed: int, name: str) -> int:
+    """Reproducible pseudo-random key of a file (independent of PYTHONHASHSEED)."""
+    digest = hashlib.blake2b(f"{seed}:{name}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def _allocate(counts: Dict[Tuple, int], available: Dict[Tuple, int], size: int, allocation: str) -> Dict[Tuple, int]:
+    """Split the sample size over the strata (largest remainder, capped by the files available)."""
+    if allocation not in ('proportional', 'equal'):
+        raise ValueError(f"Unknown allocation '{allocation}' (use 'proportional' or 'equal')")
+    weights = counts if allocation == 'proportional' else {key: 1 for key in counts}
+    total_weight = sum(weights.values())
+
+    quotas = {}
+    remainders = []
+    for key in sorted(counts):
+        exact = size * weights[key] / total_weight
+        quotas[key] = min(int(exact), available[key])
+        remainders.append((exact - int(exact), key))
+
+    order = [key for _, key in sorted(remainders, key=lambda item: -item[0])]
+    left = min(size, sum(available.values())) - sum(quotas.values())
+    while left > 0:
+        for key in order:
+            if left and quotas[key] < available[key]:
+                quotas[key] += 1
+                left -= 1
+    return quotas
+
+
+class StratifiedSampler:
+    """One-pass stratified bottom-k sampler; feed it files with add()."""
+
+    def __init__(self, size: int, seed: int = 0, by: Sequence[str] = STRATUM_FIELDS,
+                 size_bins: Sequence[int] = DEFAULT_SIZE_BINS, allocation: str = 'proportional'):
+        """
+        Initialize the sampler.
+
+        Args:
+            size: Number of files to sample
+            seed: Random seed; the same seed and corpus give the same sample
+            by: Stratum attributes, any of 'gender', 'split', 'size' (empty: plain reservoir sample)
+            size_bins: Ascending file size bin edges in bytes
+            allocation: 'proportional' to the stratum sizes or 'equal' per stratum
+        """
+        unknown = set(by) - set(STRATUM_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown stratum attribute(s): {', '.join(sorted(unknown))}")
+        self.size = size
+        self.seed = seed
+        self.by = tuple(by)
+        self.size_bins = tuple(size_bins)
+        self.allocation = allocation
+        self.counts = Counter()
+        # stratum -> max-heap (negated keys) of the smallest-key files
+        self.reservoirs = {}
+
+    def add(self, path: str, size: int) -> None:
+        """
+        Offer one file to the sampler.
+
+        Args:
+            path: Path of the file
+            size: File size in bytes
+        """
+        sample_file = describe_file(path, size, self.size_bins)
+        stratum = stratum_of(sample_file, self.by)
+        self.counts[stratum] += 1
+
+        reservoir = self.reservoirs.setdefault(stratum, [])
+        item = (-_sample_key(self.seed, sample_file.name), sample_file.name, sample_file)
+        if len(reservoir) < self.size:
+            heapq.heappush(reservoir, item)
+        elif reservoir and item[0] > reservoir[0][0]:
+            heapq.heapreplace(reservoir, item)
+
+    def sample(self) -> 'CorpusSample':
+        """The sample of the files offered so far, allocated over the strata."""
+        available = {stratum: len(reservoir) for stratum, reservoir in self.reservoirs.items()}
+        quotas = _allocate(self.counts, available, self.size, self.allocation) if self.counts else {}
+
+        files = []
+        for stratum, quota in quotas.items():
+            smallest = sorted(self.reservoirs[stratum], key=lambda item: -item[0])[:quota]
+            files.extend(item[2] for item in smallest)
+        files.sort(key=lambda sample_file: sample_file.name)
+        return CorpusSample(files, dict(self.counts), self.by)
+
+
+class CorpusSample:
+    """Sampled files with a shared in-memory text cache."""
+
+    def __init__(self, files: List[SampleFile], population: Dict[Tuple, int], by: Sequence[str] = STRATUM_FIELDS):
+        self.files = files
+        self.population = population
+        self.by = tuple(by)
+        self._texts = {}
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __iter__(self) -> Iterator[SampleFile]:
+        return iter(self.files)
+
+    def text(self, sample_file: SampleFile) -> str:
+        """Text of a sampled file, read on first use and cached."""
+        text = self._texts.get(sample_file.path)
+        if text is None:
+            with open(sample_file.path, 'r', encoding='utf-8', errors='ignore') as f:
+                text = self._texts[sample_file.path] = f.read()
+        return text
+
+    def items(self) -> Iterator[Tuple[SampleFile, str]]:
+        """(file, text) pairs of the sample."""
+        for sample_file in self.files:
+            yield sample_file, self.text(sample_file)
+
+    def strata(self) -> Dict[Tuple, int]:
+        """Sampled files per stratum."""
+        return dict(Counter(stratum_of(sample_file, self.by) for sample_file in self.files))
+
+    def describe(self) -> str:
+        """One-line summary such as 'F/train/medium: 2, M/train/small: 1'."""
+        return ', '.join(f"{'/'.join(stratum) or 'all'}: {count}"
+                         for stratum, count in sorted(self.strata().items()))
+
+
+def iter_corpus(corpus_path: str, pattern: str = '*.txt') -> Iterator[Tuple[str, int]]:
+    """
+    Stream (path, size) of the corpus files without building a file list.
+
+    Args:
+        corpus_path: Directory containing the text files
+        pattern: File name pattern
+
+    Yields:
+        (path, size in bytes) per matching regular file
+    """
+    with os.scandir(corpus_path) as entries:
+        for entry in entries:
+            if fnmatch.fnmatch(entry.name, pattern) and entry.is_file():
+                yield entry.path, entry.stat().st_size
+
+
+def stratified_sample(corpus_path: str, size: int, seed: int = 0, by: Sequence[str] = STRATUM_FIELDS,
+                      size_bins: Sequence[int] = DEFAULT_SIZE_BINS, allocation: str = 'proportional',
+                      pattern: str = '*.txt') -> CorpusSample:
+    """
+    Draw a stratified sample of corpus files in one pass.
+
+    Args:
+        corpus_path: Directory containing the text files
+        size: Number of files to sample
+        seed: Random seed
+        by: Stratum attributes ('gender', 'split', 'size')
+        size_bins: Ascending file size bin edges in bytes
+        allocation: 'proportional' or 'equal'
+        pattern: File name pattern
+
+    Returns:
+        The sample (texts are read on first use)
+    """
+    sampler = StratifiedSampler(size, seed, by, size_bins, allocation)
+    for path, file_size in iter_corpus(corpus_path, pattern):
+        sampler.add(path, file_size)
+    return sampler.sample()
+
+
+def reservoir_sample(corpus_path: str, size: int, seed: int = 0, pattern: str = '*.txt') -> CorpusSample:
+    """Uniform sample of corpus files without strata."""
+    return stratified_sample(corpus_path, size, seed, by=(), pattern=pattern)
+
+
+def main():
+    """Show the strata of the blog corpus and a stratified sample."""
+    import argparse
+
+    default_corpus = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets', 'blogs')
+
+    parser = argparse.ArgumentParser(description='Stratified sampling of the blog corpus')
+    parser.add_argument('--corpus', default=default_corpus)
+    parser.add_argument('--size', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--by', default='gender,split,size', help="comma-separated stratum attributes, '' for none")
+    parser.add_argument('--allocation', choices=['proportional', 'equal'], default='proportional')
+    args = parser.parse_args()
+
+    by = [field for field in args.by.split(',') if field]
+    sample = stratified_sample(args.corpus, args.size, args.seed, by, allocation=args.allocation)
+
+    print("Stratified Corpus Sample")
+    print("=" * 50)
+    print(f"Corpus: {args.corpus}")
+    print(f"{sum(sample.population.values())} files, sample of {len(sample)} (seed {args.seed})")
+    print(f"\n{'Stratum':<25} {'Files':>7} {'Sampled':>8}")
+    print("-" * 42)
+    sampled = sample.strata()
+    for stratum, count in sorted(sample.population.items()):
+        print(f"{'/'.join(stratum) or 'all':<25} {count:>7} {sampled.get(stratum, 0):>8}")
+    print("\nSampled files:")
+    for sample_file in sample:
+        print(f"  {sample_file.name} ({sample_file.size:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,10 +10,16 @@ Author: NLP Course Exercise
 
 import re
 import os
+import sys
 import glob
 from collections import defaultdict, Counter
 from typing import Dict, List, Tuple
-import json
+
+from base_word_extractor import extract_base_word_and_vowel
+
+# results_writer.py lives in homework1/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from results_writer import ResultsWriter
 
 
 class RefinedVowelAnalyzer:
@@ -48,17 +54,8 @@ class RefinedVowelAnalyzer:
         Returns:
             Tuple of (base_word, duplicated_vowel) or None if no clear pattern
         """
-        # Find emphatic duplications (3+ consecutive identical vowels)
-        for vowel in self.vowels:
-            pattern = f'({vowel})\\1{{2,}}'  # 3+ consecutive identical vowels
-            match = re.search(pattern, emphatic_word, re.IGNORECASE)
-
-            if match:
-                # Replace the emphatic sequence with single vowel to get base word
-                base_word = re.sub(pattern, vowel, emphatic_word, flags=re.IGNORECASE)
-                return (base_word.lower(), vowel)
-
-        return None
+        # Single compiled run-length pass, memoized across calls (see base_word_extractor.py)
+        return extract_base_word_and_vowel(emphatic_word)
 
     def find_emphatic_duplications_in_text(self, text: str) -> None:
         """
@@ -199,25 +196,14 @@ class RefinedVowelAnalyzer:
             print(f"  Total occurrences: {total_occurrences}")
 
     def save_results_to_file(self, output_file: str) -> None:
-        """Save results to a JSON file for further analysis."""
-        top_3_results = self.get_top_3_for_each_vowel()
-
-        # Convert to serializable format with examples
-        results_dict = {}
-        for vowel, word_list in top_3_results.items():
-            results_dict[vowel] = []
-            for word, freq in word_list:
-                examples = self.find_example_duplications(word, vowel)
-                results_dict[vowel].append({
-                    "word": word,
-                    "frequency": freq,
-                    "examples": examples
-                })
-
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results_dict, f, indent=2, ensure_ascii=False)
+        """Save the full base word frequency table (Parquet, or JSON Lines without pyarrow)."""
+        with ResultsWriter(output_file, 'vowel_frequencies') as writer:
+            for vowel in self.vowels:
+                ranked = sorted(self.vowel_word_frequencies[vowel].items(), key=lambda x: x[1], reverse=True)
+                for base_word, freq in ranked:
+                    writer.write(('all', vowel, base_word, freq))
 
-        print(f"\nResults saved to {output_file}")
+        print(f"\nResults: {writer.summary()}")
 
 
 def main():
@@ -235,7 +221,7 @@ def main():
     analyzer.print_results()
 
     # Save results to file
-    output_file = "/Users/kornelovics/EIT/UT/NLP/project-nlp/homework1/exercise4/exercise4b_refined_results.json"
+    output_file = "/Users/kornelovics/EIT/UT/NLP/project-nlp/homework1/exercise4/exercise4b_refined_results"
     analyzer.save_results_to_file(output_file)
 
 
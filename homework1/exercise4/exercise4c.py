@@ -13,10 +13,17 @@ Author: NLP Course Exercise
 
 import re
 import os
+import sys
 import glob
 from collections import defaultdict, Counter
 from typing import Dict, List, Tuple
-import json
+
+from base_word_extractor import extract_base_word_and_vowel
+from gender_contrast import GroupContrast
+
+# results_writer.py lives in homework1/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from results_writer import ResultsWriter
 
 
 class GenderSeparatedVowelAnalyzer:
@@ -75,17 +82,8 @@ class GenderSeparatedVowelAnalyzer:
         Returns:
             Tuple of (base_word, duplicated_vowel) or None if no clear pattern
         """
-        # Find emphatic duplications (3+ consecutive identical vowels)
-        for vowel in self.vowels:
-            pattern = f'({vowel})\\1{{2,}}'  # 3+ consecutive identical vowels
-            match = re.search(pattern, emphatic_word, re.IGNORECASE)
-
-            if match:
-                # Replace the emphatic sequence with single vowel to get base word
-                base_word = re.sub(pattern, vowel, emphatic_word, flags=re.IGNORECASE)
-                return (base_word.lower(), vowel)
-
-        return None
+        # Single compiled run-length pass, memoized across calls (see base_word_extractor.py)
+        return extract_base_word_and_vowel(emphatic_word)
 
     def find_emphatic_duplications_in_text(self, text: str, gender: str) -> None:
         """
@@ -258,37 +256,24 @@ class GenderSeparatedVowelAnalyzer:
         print("GENDER COMPARISON ANALYSIS")
         print("="*80)
 
-        top_3_results = self.get_top_3_for_each_vowel_by_gender()
+        contrast = self.build_contrast()
+        female, male = contrast.groups.index('female'), contrast.groups.index('male')
+        totals = contrast.totals()
+        word_types = contrast.word_types().sum(axis=1)
+        occurrences = totals.sum(axis=1)
 
         print(f"Dataset composition:")
         print(f"- Female bloggers: {self.file_counts['female']} files")
         print(f"- Male bloggers: {self.file_counts['male']} files")
 
-        # Calculate overall statistics
-        total_stats = {
-            'female': {'word_types': 0, 'total_occurrences': 0},
-            'male': {'word_types': 0, 'total_occurrences': 0}
-        }
-
-        for gender in ['female', 'male']:
-            for vowel in self.vowels:
-                total_stats[gender]['word_types'] += len(self.vowel_word_frequencies[gender][vowel])
-                total_stats[gender]['total_occurrences'] += sum(self.vowel_word_frequencies[gender][vowel].values())
-
         print(f"\nOverall Statistics:")
-        print(f"Female bloggers: {total_stats['female']['word_types']} unique word types, {total_stats['female']['total_occurrences']} total occurrences")
-        print(f"Male bloggers: {total_stats['male']['word_types']} unique word types, {total_stats['male']['total_occurrences']} total occurrences")
+        print(f"Female bloggers: {word_types[female]} unique word types, {occurrences[female]} total occurrences")
+        print(f"Male bloggers: {word_types[male]} unique word types, {occurrences[male]} total occurrences")
 
-        # Calculate rates per file
-        if self.file_counts['female'] > 0:
-            female_rate = total_stats['female']['total_occurrences'] / self.file_counts['female']
-        else:
-            female_rate = 0
-
-        if self.file_counts['male'] > 0:
-            male_rate = total_stats['male']['total_occurrences'] / self.file_counts['male']
-        else:
-            male_rate = 0
+        # Rates per file (files of a gender with no files count as rate 0)
+        rates = contrast.rates_per_file().sum(axis=1)
+        female_rate = rates[female] if self.file_counts['female'] > 0 else 0
+        male_rate = rates[male] if self.file_counts['male'] > 0 else 0
 
         print(f"Average emphatic duplications per file:")
         print(f"- Female bloggers: {female_rate:.2f}")
@@ -298,9 +283,9 @@ class GenderSeparatedVowelAnalyzer:
         print(f"\nVowel-by-vowel comparison:")
         vowel_comparison = {}
 
-        for vowel in self.vowels:
-            female_total = sum(self.vowel_word_frequencies['female'][vowel].values())
-            male_total = sum(self.vowel_word_frequencies['male'][vowel].values())
+        for v, vowel in enumerate(self.vowels):
+            female_total = int(totals[female, v])
+            male_total = int(totals[male, v])
 
             vowel_comparison[vowel] = {
                 'female': female_total,
@@ -312,7 +297,7 @@ class GenderSeparatedVowelAnalyzer:
 
         # Find most distinctive words by gender
         print(f"\nMost distinctive words by gender:")
-        self._find_distinctive_words(top_3_results)
+        self._find_distinctive_words(contrast)
 
         # Discussion
         print(f"\nDISCUSSION OF FINDINGS:")
@@ -337,71 +322,39 @@ class GenderSeparatedVowelAnalyzer:
         else:
             print(f"• Both genders show similar vowel emphasis patterns")
 
-    def _find_distinctive_words(self, top_3_results: Dict[str, Dict[str, List[Tuple[str, int]]]]) -> None:
-        """Find words that appear prominently in one gender but not the other."""
-        female_words = set()
-        male_words = set()
-
-        # Collect all prominent words by gender
-        for vowel in self.vowels:
-            for word, freq in top_3_results['female'][vowel]:
-                female_words.add((word, freq))
-            for word, freq in top_3_results['male'][vowel]:
-                male_words.add((word, freq))
-
-        female_only = []
-        male_only = []
+    def build_contrast(self) -> GroupContrast:
+        """Load the per-gender, per-vowel counts into a sparse contrast table."""
+        return GroupContrast.from_nested(self.vowel_word_frequencies, self.file_counts, self.vowels)
 
-        # Find gender-distinctive words
-        for word, freq in female_words:
-            if not any(w == word for w, _ in male_words):
-                female_only.append((word, freq))
-
-        for word, freq in male_words:
-            if not any(w == word for w, _ in female_words):
-                male_only.append((word, freq))
-
-        # Sort by frequency
-        female_only.sort(key=lambda x: x[1], reverse=True)
-        male_only.sort(key=lambda x: x[1], reverse=True)
+    def _find_distinctive_words(self, contrast: GroupContrast) -> None:
+        """Find the words most over-represented in each gender (log-odds with informative prior)."""
+        distinctive = contrast.top_distinctive(k=3)
 
         print("  Female-distinctive words (top 3):")
-        for i, (word, freq) in enumerate(female_only[:3], 1):
-            print(f"    {i}. '{word}' ({freq} occurrences)")
+        for i, (word, z_score, freq) in enumerate(distinctive['female'], 1):
+            print(f"    {i}. '{word}' ({freq} occurrences, z={z_score:.2f})")
 
         print("  Male-distinctive words (top 3):")
-        for i, (word, freq) in enumerate(male_only[:3], 1):
-            print(f"    {i}. '{word}' ({freq} occurrences)")
-
-    def save_results_to_file(self, output_file: str) -> None:
-        """Save results to a JSON file for further analysis."""
-        top_3_results = self.get_top_3_for_each_vowel_by_gender()
-
-        # Convert to serializable format with examples
-        results_dict = {
-            'metadata': {
-                'file_counts': self.file_counts,
-                'description': 'Gender-separated emphatic vowel duplication analysis'
-            },
-            'results_by_gender': {}
-        }
+        for i, (word, z_score, freq) in enumerate(distinctive['male'], 1):
+            print(f"    {i}. '{word}' ({freq} occurrences, z={z_score:.2f})")
 
-        for gender in ['female', 'male']:
-            results_dict['results_by_gender'][gender] = {}
-            for vowel, word_list in top_3_results[gender].items():
-                results_dict['results_by_gender'][gender][vowel] = []
-                for word, freq in word_list:
-                    examples = self.find_example_duplications(word, vowel, gender)
-                    results_dict['results_by_gender'][gender][vowel].append({
-                        "word": word,
-                        "frequency": freq,
-                        "examples": examples
-                    })
+        print("  Most distinctive word per vowel:")
+        for vowel in self.vowels:
+            by_gender = contrast.top_distinctive(k=1, vowel=vowel)
+            female_top = by_gender['female'][0][0] if by_gender['female'] else '-'
+            male_top = by_gender['male'][0][0] if by_gender['male'] else '-'
+            print(f"    Vowel '{vowel}': Female='{female_top}', Male='{male_top}'")
 
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(results_dict, f, indent=2, ensure_ascii=False)
+    def save_results_to_file(self, output_file: str) -> None:
+        """Save the full base word frequency table by gender (Parquet, or JSON Lines without pyarrow)."""
+        with ResultsWriter(output_file, 'vowel_frequencies') as writer:
+            for gender, by_vowel in self.vowel_word_frequencies.items():
+                for vowel in self.vowels:
+                    ranked = sorted(by_vowel[vowel].items(), key=lambda x: x[1], reverse=True)
+                    for base_word, freq in ranked:
+                        writer.write((gender, vowel, base_word, freq))
 
-        print(f"\nResults saved to {output_file}")
+        print(f"\nResults: {writer.summary()}")
 
 
 def main():
@@ -420,7 +373,7 @@ def main():
     analyzer.analyze_gender_differences()
 
     # Save results to file
-    output_file = "/Users/kornelovics/EIT/UT/NLP/project-nlp/homework1/exercise4/exercise4c_results.json"
+    output_file = "/Users/kornelovics/EIT/UT/NLP/project-nlp/homework1/exercise4/exercise4c_results"
     analyzer.save_results_to_file(output_file)
 
 
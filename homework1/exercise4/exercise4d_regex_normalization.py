@@ -13,25 +13,50 @@ Author: NLP Course Exercise
 
 import re
 import os
-import glob
+import sys
 from collections import defaultdict, Counter
-from typing import Dict, List, Tuple, Set
-import json
+from typing import Dict, List, Optional, Tuple, Set
+
+from corpus_sampler import CorpusSample, stratified_sample
+from legit_lexicon import LegitLexicon
+from change_log import ChangeLog, substitute
+
+# results_writer.py lives in homework1/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from results_writer import ResultsWriter
+
+# Runs of identical vowels; all five vowels are handled in one pass
+VOWEL_RUN_2PLUS = re.compile(r'([aeiou])\1+', re.IGNORECASE)
+VOWEL_RUN_3PLUS = re.compile(r'([aeiou])\1{2,}', re.IGNORECASE)
+VOWEL_RUN_4PLUS = re.compile(r'([aeiou])\1{3,}', re.IGNORECASE)
+
+# Character matched by a vowel class -> the vowel (IGNORECASE also folds two Turkish i's onto i)
+VOWEL_OF = {char: char.lower() for char in 'aeiouAEIOU'}
+VOWEL_OF.update({'\u0130': 'i', '\u0131': 'i'})
 
 
 class VowelNormalizationExperiment:
     """Experiments with regex-based vowel duplication normalization."""
 
-    def __init__(self, corpus_path: str):
+    def __init__(self, corpus_path: str, lexicon_path: Optional[str] = None):
         """
         Initialize the normalization experiment.
 
         Args:
             corpus_path: Path to the directory containing blog text files
+            lexicon_path: Prebuilt lexicon of legitimate words for the contextual
+                strategy (see legit_lexicon.py); a short built-in list otherwise
         """
         self.corpus_path = corpus_path
         self.vowels = ['a', 'e', 'i', 'o', 'u']
 
+        # Common English words with legitimate double vowels (built once, not per call)
+        self.legitimate_words = LegitLexicon.open(lexicon_path) if lexicon_path else LegitLexicon.from_words({
+            'good', 'book', 'look', 'took', 'cool', 'pool', 'room', 'soon', 'moon', 'noon',
+            'been', 'seen', 'keep', 'deep', 'sleep', 'meet', 'feet', 'feel', 'need', 'free',
+            'tree', 'three', 'green', 'sweet', 'speed', 'agree', 'coffee'
+        })
+
         # Track statistics
         self.stats = {
             'total_files_processed': 0,
@@ -42,6 +67,10 @@ class VowelNormalizationExperiment:
             'unique_transformations': set()
         }
 
+        # Sample of corpus files shared by all strategies (see draw_sample)
+        self.sample = None
+        self.sample_args = None
+
         # Different normalization strategies to try
         self.strategies = {
             'simple': self._simple_normalization,
@@ -50,49 +79,41 @@ class VowelNormalizationExperiment:
             'threshold_based': self._threshold_based_normalization
         }
 
-    def _simple_normalization(self, text: str) -> str:
+    def _collapse_runs(self, pattern: re.Pattern, text: str) -> str:
         """
-        Strategy 1: Simple approach - replace any 2+ consecutive vowels with single vowel.
-        This will have many false positives with legitimate English words.
-        """
-        normalized = text
-        substitution_count = 0
+        Replace every vowel run matched by pattern with its single (lowercase) vowel.
 
-        for vowel in self.vowels:
-            # Pattern: 2+ consecutive identical vowels
-            pattern = f'({vowel})\\1+'
-            # Replace with single vowel
-            matches = re.findall(pattern, normalized, re.IGNORECASE)
-            if matches:
-                substitution_count += len(matches)
-                self.stats['substitutions_by_vowel'][vowel] += len(matches)
+        One substitution pass covers all five vowels; the substitutions are
+        counted from the change log instead of a separate re.findall pass.
 
-            normalized = re.sub(pattern, vowel, normalized, flags=re.IGNORECASE)
+        Args:
+            pattern: Run pattern with the vowel in group 1
+            text: Text to normalize
 
-        self.stats['total_substitutions'] += substitution_count
+        Returns:
+            The normalized text
+        """
+        log = ChangeLog()
+        normalized = substitute(pattern, lambda match: VOWEL_OF[match.group(1)], text, log)
+
+        for _, original, _ in log:
+            self.stats['substitutions_by_vowel'][VOWEL_OF[original[0]]] += 1
+        self.stats['total_substitutions'] += len(log)
         return normalized
 
+    def _simple_normalization(self, text: str) -> str:
+        """
+        Strategy 1: Simple approach - replace any 2+ consecutive vowels with single vowel.
+        This will have many false positives with legitimate English words.
+        """
+        return self._collapse_runs(VOWEL_RUN_2PLUS, text)
+
     def _conservative_normalization(self, text: str) -> str:
         """
         Strategy 2: Conservative - only normalize 3+ consecutive vowels.
         This should avoid most legitimate English words.
         """
-        normalized = text
-        substitution_count = 0
-
-        for vowel in self.vowels:
-            # Pattern: 3+ consecutive identical vowels
-            pattern = f'({vowel})\\1{{2,}}'
-            # Replace with single vowel
-            matches = re.findall(pattern, normalized, re.IGNORECASE)
-            if matches:
-                substitution_count += len(matches)
-                self.stats['substitutions_by_vowel'][vowel] += len(matches)
-
-            normalized = re.sub(pattern, vowel, normalized, flags=re.IGNORECASE)
-
-        self.stats['total_substitutions'] += substitution_count
-        return normalized
+        return self._collapse_runs(VOWEL_RUN_3PLUS, text)
 
     def _contextual_normalization(self, text: str) -> str:
         """
@@ -101,12 +122,7 @@ class VowelNormalizationExperiment:
         normalized = text
         substitution_count = 0
 
-        # Common English words with legitimate double vowels (incomplete list)
-        legitimate_words = {
-            'good', 'book', 'look', 'took', 'cool', 'pool', 'room', 'soon', 'moon', 'noon',
-            'been', 'seen', 'keep', 'deep', 'sleep', 'meet', 'feet', 'feel', 'need', 'free',
-            'tree', 'three', 'green', 'sweet', 'speed', 'agree', 'coffee'
-        }
+        legitimate_words = self.legitimate_words
 
         for vowel in self.vowels:
             # Find words with 2+ consecutive vowels
@@ -139,20 +155,7 @@ class VowelNormalizationExperiment:
         Strategy 4: Threshold-based - normalize based on length of duplication.
         Short duplications (2-3) might be legitimate, longer ones (4+) are likely emphatic.
         """
-        normalized = text
-        substitution_count = 0
-
-        for vowel in self.vowels:
-            # Pattern for 4+ consecutive identical vowels (very likely emphatic)
-            long_pattern = f'({vowel})\\1{{3,}}'
-            matches = re.findall(long_pattern, normalized, re.IGNORECASE)
-            if matches:
-                substitution_count += len(matches)
-                self.stats['substitutions_by_vowel'][vowel] += len(matches)
-            normalized = re.sub(long_pattern, vowel, normalized, flags=re.IGNORECASE)
-
-        self.stats['total_substitutions'] += substitution_count
-        return normalized
+        return self._collapse_runs(VOWEL_RUN_4PLUS, text)
 
     def analyze_original_text(self, text: str) -> Dict:
         """Analyze the original text to understand vowel duplication patterns."""
@@ -215,25 +218,44 @@ class VowelNormalizationExperiment:
 
         return results
 
-    def process_sample_files(self, max_files: int = 10) -> None:
+    def draw_sample(self, max_files: int = 10, seed: int = 0) -> CorpusSample:
+        """
+        Draw a reproducible sample stratified by gender, train/test split and file size.
+
+        The sample (and the texts read from it) is kept, so repeated calls
+        with the same arguments do not touch the corpus again.
+
+        Args:
+            max_files: Number of files to sample
+            seed: Random seed of the sample
+
+        Returns:
+            The cached sample
+        """
+        if self.sample is None or self.sample_args != (max_files, seed):
+            self.sample = stratified_sample(self.corpus_path, max_files, seed=seed)
+            self.sample_args = (max_files, seed)
+        return self.sample
+
+    def process_sample_files(self, max_files: int = 10, seed: int = 0) -> None:
         """Process a sample of files to demonstrate the normalization approaches."""
-        pattern = os.path.join(self.corpus_path, '*.txt')
-        files = glob.glob(pattern)[:max_files]
+        sample = self.draw_sample(max_files, seed)
 
-        print(f"Testing normalization strategies on {len(files)} sample files...")
+        print(f"Testing normalization strategies on {len(sample)} sample files (seed {seed})...")
+        print(f"Strata: {sample.describe()}")
 
         all_results = []
 
-        for i, filepath in enumerate(files):
-            print(f"\nProcessing file {i+1}/{len(files)}: {os.path.basename(filepath)}")
+        for i, sample_file in enumerate(sample):
+            filepath = sample_file.path
+            print(f"\nProcessing file {i+1}/{len(sample)}: {sample_file.name}")
 
             try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as file:
-                    text = file.read()
+                text = sample.text(sample_file)
 
                 # Test all strategies on this text
                 results = self.test_normalization_strategies(text)
-                results['filename'] = os.path.basename(filepath)
+                results['filename'] = sample_file.name
                 all_results.append(results)
 
                 # Show a summary for this file
@@ -405,34 +427,13 @@ while avoiding most false positives with legitimate English words.
         return report.strip()
 
     def save_results(self, results: List[Dict], output_file: str) -> None:
-        """Save detailed results to JSON file."""
-        # Convert sets to lists for JSON serialization
-        serializable_results = []
-        for result in results:
-            serialized = {}
-            for key, value in result.items():
-                if key == 'original_analysis':
-                    # Handle the analysis dict
-                    serialized[key] = {
-                        'vowel_duplications_found': value['vowel_duplications_found'],
-                        'patterns': dict(value['patterns']),
-                        'total_duplications': len(value['vowel_duplications_found'])
-                    }
-                else:
-                    serialized[key] = value
-            serializable_results.append(serialized)
-
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'analysis_report': self.write_analysis_report(),
-                'sample_results': serializable_results,
-                'summary': {
-                    'total_files_tested': len(results),
-                    'strategies_compared': list(self.strategies.keys())
-                }
-            }, f, indent=2, ensure_ascii=False)
+        """Save substitutions per strategy and file (Parquet, or JSON Lines without pyarrow)."""
+        with ResultsWriter(output_file, 'normalization') as writer:
+            for result in results:
+                for strategy in self.strategies:
+                    writer.write((strategy, result['filename'], result[strategy]['substitutions_made']))
 
-        print(f"Detailed results saved to {output_file}")
+        print(f"Results: {writer.summary()}")
 
 
 def main():
@@ -462,7 +463,7 @@ def main():
     print(experiment.write_analysis_report())
 
     # Save results to file
-    output_file = "/Users/kornelovics/EIT/UT/NLP/project-nlp/homework1/exercise4/exercise4d_normalization_results.json"
+    output_file = "/Users/kornelovics/EIT/UT/NLP/project-nlp/homework1/exercise4/exercise4d_normalization_results"
     experiment.save_results(sample_results, output_file)
 
 
@@ -13,33 +13,23 @@ import re
 import os
 from collections import defaultdict
 
-def normalize_vowel_duplications(text):
-    """
-    Normalize vowel duplications using different regex substitution approaches
-    """
-    results = {}
-
-    # Approach 1: Aggressive - reduce 3+ identical vowels to 1
-    aggressive = re.sub(r'([aeiou])\1{2,}', r'\1', text, flags=re.IGNORECASE)
-    results['aggressive'] = aggressive
+from bytes_scanner import DualPattern, as_text, decode, is_ascii, read_bytes
+from change_log import ChangeLog, record_changes, substitute
 
-    # Approach 1b: Reduce 2+ identical vowels to 1 (even more aggressive)
-    reduce2plus = re.sub(r'([aeiou])\1+', r'\1', text, flags=re.IGNORECASE)
-    results['reduce2plus'] = reduce2plus
+# Compiled once, for text and for bytes input
+RUN_2PLUS = DualPattern(r'([aeiou])\1+', re.IGNORECASE)
+RUN_3PLUS = DualPattern(r'([aeiou])\1{2,}', re.IGNORECASE)
+RUN_5PLUS = DualPattern(r'([aeiou])\1{4,}', re.IGNORECASE)
 
-    # Approach 2: Conservative - reduce 3+ identical vowels to 2
-    conservative = re.sub(r'([aeiou])\1{2,}', r'\1\1', text, flags=re.IGNORECASE)
-    results['conservative'] = conservative
 
-    # Approach 3: Extreme cases only - reduce 5+ identical vowels to 2
-    extreme_only = re.sub(r'([aeiou])\1{4,}', r'\1\1', text, flags=re.IGNORECASE)
-    results['extreme_only'] = extreme_only
+def _approaches(text):
+    """(name, pattern, replacement) of every normalization approach, in report order"""
 
     # Approach 4: Smart normalization - preserve common English words
     def smart_normalize(match):
         word_start = max(0, match.start() - 10)
         word_end = min(len(text), match.end() + 10)
-        context = text[word_start:word_end].lower()
+        context = as_text(text[word_start:word_end]).lower()
 
         # Don't normalize common English words
         preserve_words = ['good', 'been', 'see', 'too', 'book', 'look', 'keep', 'feel']
@@ -50,15 +40,51 @@ def normalize_vowel_duplications(text):
         # Otherwise, reduce to double vowel
         return match.group(1) + match.group(1)
 
-    smart = re.sub(r'([aeiou])\1{1,}', smart_normalize, text, flags=re.IGNORECASE)
-    results['smart'] = smart
+    return [
+        # Approach 1: Aggressive - reduce 3+ identical vowels to 1
+        ('aggressive', RUN_3PLUS, r'\1'),
+        # Approach 1b: Reduce 2+ identical vowels to 1 (even more aggressive)
+        ('reduce2plus', RUN_2PLUS, r'\1'),
+        # Approach 2: Conservative - reduce 3+ identical vowels to 2
+        ('conservative', RUN_3PLUS, r'\1\1'),
+        # Approach 3: Extreme cases only - reduce 5+ identical vowels to 2
+        ('extreme_only', RUN_5PLUS, r'\1\1'),
+        ('smart', RUN_2PLUS, smart_normalize)
+    ]
 
+
+def normalize_vowel_duplications(text, logs=None):
+    """
+    Normalize vowel duplications using different regex substitution approaches
+
+    text may also be the raw bytes of an ASCII file (bytes mode); the
+    normalized results are then bytes as well. If a logs dictionary is given,
+    the changes of every approach are recorded in logs[approach] while
+    substituting (see change_log.py).
+    """
+    results = {}
+    for name, pattern, replacement in _approaches(text):
+        log = logs.setdefault(name, ChangeLog()) if logs is not None else None
+        results[name] = substitute(pattern, replacement, text, log)
     return results
 
 
-def analyze_entire_corpus():
+def vowel_change_logs(text):
+    """
+    Record the changes of all 5 approaches without building the normalized texts
+
+    Returns a dictionary {approach: ChangeLog}; offsets refer to text.
+    """
+    return {name: record_changes(pattern, replacement, text)
+            for name, pattern, replacement in _approaches(text)}
+
+
+def analyze_entire_corpus(bytes_mode=True):
     """
     Analyze all files in the actual corpus with all 5 normalization approaches
+
+    In bytes mode, ASCII files are normalized without decoding them; files
+    with non-ASCII characters are decoded as before.
     """
     corpus_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "blogs")
 
@@ -98,30 +124,33 @@ def analyze_entire_corpus():
 
         filepath = os.path.join(corpus_path, filename)
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            if bytes_mode:
+                content = read_bytes(filepath)
+                if not is_ascii(content):
+                    content = decode(content)
+            else:
+                with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+                    content = f.read()
 
             total_chars_original += len(content)
 
-            # Apply all 5 normalization approaches
-            all_results = normalize_vowel_duplications(content)
+            # Record the changes of all 5 normalization approaches (no normalized copies)
+            all_logs = vowel_change_logs(content)
 
             for approach_name in approach_names:
-                normalized = all_results[approach_name]
+                log = all_logs[approach_name]
 
-                if content != normalized:
+                if log.changed:
                     approach_stats[approach_name]['files_with_changes'] += 1
 
                     # Count character reduction
-                    char_reduction = len(content) - len(normalized)
-                    approach_stats[approach_name]['total_char_reduction'] += char_reduction
+                    approach_stats[approach_name]['total_char_reduction'] += log.char_reduction()
 
                     # Count changes
-                    changes = count_vowel_changes(content, normalized)
-                    approach_stats[approach_name]['total_words_changed'] += len(changes)
+                    approach_stats[approach_name]['total_words_changed'] += len(log)
 
                     # Store all changes for summary
-                    for original, new, count in changes:
+                    for original, new, count in count_vowel_changes(log):
                         approach_stats[approach_name]['all_changes'][(original, new)] += count
 
         except Exception as e:
@@ -147,28 +176,12 @@ def analyze_entire_corpus():
         'approach_names': approach_names
     }
 
-def count_vowel_changes(original, normalized):
+def count_vowel_changes(log):
     """
-    Count what specific vowel duplications were changed
+    Count what specific vowel duplications were changed, from an approach's change log
     """
-    from collections import defaultdict
-
-    # Find all 3+ vowel sequences that were changed
-    changes = defaultdict(int)
-
-    # Find original sequences
-    original_matches = set(re.findall(r'([aeiou])\1{2,}', original, re.IGNORECASE))
-    normalized_matches = set(re.findall(r'([aeiou])\1{2,}', normalized, re.IGNORECASE))
-
-    # Count changes (this is simplified - in reality more complex)
-    pattern = r'([aeiou])\1{2,}'
-    for match in re.finditer(pattern, original, re.IGNORECASE):
-        original_seq = match.group(0).lower()
-        expected_new = (match.group(1) * 2).lower()
-        changes[(original_seq, expected_new)] += 1
-
     # Convert to list format
-    return [(orig, new, count) for (orig, new), count in changes.items()]
+    return [(orig, new, count) for (orig, new), count in log.transformations().items()]
 
 # Sample demonstration function removed - now using full corpus analysis
 
@@ -190,11 +203,12 @@ def analyze_sample_files():
         print(f"\nParagraph {i}:")
         print(f"Original: {text}")
 
-        conservative = normalize_vowel_duplications(text)['conservative']
+        logs = {}
+        conservative = normalize_vowel_duplications(text, logs)['conservative']
 
-        if text != conservative:
+        if logs['conservative'].changed:
             print(f"Normalized: {conservative}")
-            changes = count_vowel_changes(text, conservative)
+            changes = count_vowel_changes(logs['conservative'])
             print(f"Changes: {len(changes)} types")
 
 def main():
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Compact Lexicon of Legitimate Double-Vowel Words
+
+VowelDuplicationFinder.common_words and the contextual normalization
+strategy's legitimate_words are small hard-coded sets (the latter was even
+rebuilt on every call). To filter false positives with a real dictionary
+(hundreds of thousands of forms) this module stores a lexicon in one
+prebuilt binary file that is memory-mapped instead of parsed:
+
+- a Bloom filter (10 bits per word, 7 probes, about 1% false positives)
+  answers most "not a word" queries, such as emphatic forms ("sooooo"),
+  with a few bit tests,
+- a sorted array of 64-bit word hashes confirms the rest by binary search
+  (bisect over memoryview.cast('Q'), no Python objects per entry).
+
+Opening the file maps it without reading it; worker processes mapping
+the same file share the operating system's page cache, and a pickled
+lexicon reopens its file. Only words containing two or more consecutive
+vowels are stored, since the finder and the normalizer only ask about
+those.
+
+File layout: a 32-byte header (magic, version, word count, Bloom filter
+bits, probes), the Bloom filter padded to 8 bytes, then the sorted hashes in
+native byte order.
+
+Author: NLP Course Exercise
+"""
+
+import os
+import re
+import mmap
+import array
+import bisect
+import struct
+import hashlib
+from typing import Iterable, Optional, Set, Union
+
+
+MAGIC = b'LEXB'
+VERSION = 1
+HEADER = struct.Struct('<4sIQQI4x')
+BITS_PER_WORD = 10
+PROBES = 7
+
+DOUBLE_VOWEL = re.compile(r'[aeiou]{2,}')
+
+# Legitimate words from VowelDuplicationFinder.common_words and the contextual normalizer
+SEED_WORDS = {
+    'good', 'been', 'see', 'too', 'feel', 'school', 'need', 'look',
+    'week', 'keep', 'cool', 'took', 'looking', 'soon', 'sleep', 'room',
+    'seems', 'feeling', 'free', 'three', 'you', 'out', 'about', 'really',
+    'your', 'would', 'people', 'going', 'our', 'because', 'their', 'could',
+    'again', 'said', 'being', 'beautiful', 'seeing', 'seriously', 'serious',
+    'obviously', 'quiet', 'previous', 'beauty', 'various', 'obvious',
+    'religious', 'hilarious', 'precious', 'queen', 'delicious', 'gorgeous',
+    'book', 'pool', 'moon', 'noon', 'seen', 'deep', 'meet', 'feet',
+    'tree', 'green', 'sweet', 'speed', 'agree', 'coffee'
+}
+
+
+def word_hash(word: str) -> int:
+    """64-bit hash of a word, stable across processes and runs."""
+    return int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _probes(key: int, bits: int, probes: int):
+    """Bloom filter bit positions of a hash (double hashing)."""
+    first = key & 0xFFFFFFFF
+    step = (key >> 32) | 1
+    return ((first + i * step) % bits for i in range(probes))
+
+
+def encode_lexicon(words: Iterable[str], bits_per_word: int = BITS_PER_WORD, probes: int = PROBES) -> bytes:
+    """
+    Serialize a set of words into the lexicon file format.
+
+    Args:
+        words: Words to store (stored as given; callers look up lowercase forms)
+        bits_per_word: Bloom filter size per word
+        probes: Bloom filter probes per word
+
+    Returns:
+        The file contents
+    """
+    keys = sorted({word_hash(word) for word in words})
+    bits = max(64, len(keys) * bits_per_word)
+    bits += -bits % 64  # the hash array that follows stays 8-byte aligned
+    bloom = bytearray(bits // 8)
+    for key in keys:
+        for position in _probes(key, bits, probes):
+            bloom[position >> 3] |= 1 << (position & 7)
+
+    header = HEADER.pack(MAGIC, VERSION, len(keys), bits, probes)
+    return header + bytes(bloom) + array.array('Q', keys).tobytes()
+
+
+def build_lexicon(words: Iterable[str], path: str, bits_per_word: int = BITS_PER_WORD) -> int:
+    """
+    Write a lexicon file (atomically, so running readers keep a valid file).
+
+    Args:
+        words: Words to store
+        path: Output file
+        bits_per_word: Bloom filter size per word
+
+    Returns:
+        Number of distinct words written
+    """
+    data = encode_lexicon(words, bits_per_word)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+    return HEADER.unpack_from(data)[2]
+
+
+def read_word_list(path: str, double_vowel_only: bool = True) -> Set[str]:
+    """
+    Read a dictionary with one word per line (e.g. /usr/share/dict/words).
+
+    Args:
+        path: Word list file
+        double_vowel_only: Keep only words with 2+ consecutive vowels
+
+    Returns:
+        Set of lowercase words
+    """
+    words = set()
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            word = line.strip().lower()
+            if word and (not double_vowel_only or DOUBLE_VOWEL.search(word)):
+                words.add(word)
+    return words
+
+
+class LegitLexicon:
+    """Read-only membership test over a lexicon file or in-memory lexicon."""
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], path: Optional[str] = None):
+        """
+        Wrap serialized lexicon data.
+
+        Args:
+            buffer: Contents in the format written by encode_lexicon
+            path: File the buffer maps, if any (used when pickling)
+        """
+        magic, version, count, bits, probes = HEADER.unpack_from(buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a version {VERSION} lexicon file: {path or 'buffer'}")
+        self.path = path
+        self._buffer = buffer
+        self._count = count
+        self._bits = bits
+        self._probes = probes
+        view = memoryview(buffer)
+        bloom_end = HEADER.size + bits // 8
+        self._bloom = view[HEADER.size:bloom_end]
+        self._keys = view[bloom_end:bloom_end + count * 8].cast('Q')
+
+    @classmethod
+    def open(cls, path: str) -> 'LegitLexicon':
+        """Memory-map a lexicon file."""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(buffer, path)
+
+    @classmethod
+    def from_words(cls, words: Iterable[str]) -> 'LegitLexicon':
+        """Build a lexicon in memory (for small word sets and defaults)."""
+        return cls(encode_lexicon(words))
+
+    def __contains__(self, word: str) -> bool:
+        key = word_hash(word)
+        bloom = self._bloom
+        for position in _probes(key, self._bits, self._probes):
+            if not bloom[position >> 3] >> (position & 7) & 1:
+                return False
+        index = bisect.bisect_left(self._keys, key)
+        return index < self._count and self._keys[index] == key
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getstate__(self):
+        # Workers reopen (and share) the mapped file instead of copying it
+        return {'path': self.path, 'buffer': None if self.path else bytes(self._buffer)}
+
+    def __setstate__(self, state):
+        if state['path']:
+            other = LegitLexicon.open(state['path'])
+            self.__dict__.update(other.__dict__)
+        else:
+            self.__init__(state['buffer'])
+
+
+def main():
+    """Build a lexicon file from word lists and report its size."""
+    import time
+    import argparse
+
+    here = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(description='Build the legitimate double-vowel word lexicon')
+    parser.add_argument('word_lists', nargs='*', help='dictionary files with one word per line')
+    parser.add_argument('--output', default=os.path.join(here, 'legit_lexicon.lexb'))
+    parser.add_argument('--bits-per-word', type=int, default=BITS_PER_WORD)
+    args = parser.parse_args()
+
+    words = set(SEED_WORDS)
+    for path in args.word_lists:
+        words |= read_word_list(path)
+
+    count = build_lexicon(words, args.output, args.bits_per_word)
+    size = os.path.getsize(args.output)
+    print(f"Wrote {count:,} words to {args.output} ({size:,} bytes, {size / max(count, 1):.1f} bytes/word)")
+
+    start = time.perf_counter()
+    lexicon = LegitLexicon.open(args.output)
+    opened = time.perf_counter()
+    probes = ['good', 'sooooo', 'coffee', 'noooo', 'queen', 'yeeees']
+    print(f"Opened in {(opened - start) * 1000:.2f} ms")
+    for word in probes:
+        print(f"  {word!r}: {'legitimate' if word in lexicon else 'not in lexicon'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+"""
+Trigram-Indexed Regex Search over the Blog Corpus
+
+Every exercise4 analyzer answers a vowel-pattern question by running its
+regex over every character of every blog file. This module builds a
+code-search style index instead:
+
+- a persistent trigram posting index: for every lower-cased three-character
+  sequence of word characters, the sorted list of documents containing it,
+  stored next to the corpus (blogs.trigram/) and rebuilt only when a file
+  is added, removed or changed,
+- a query planner that walks the parsed regex (re._parser) and derives a
+  boolean trigram query every match must satisfy; for example
+  (?i)\\b\\w*([aeiou])\\1{2,}\\w*\\b needs one of aaa, eee, iii, ooo, uuu,
+- search(pattern, threshold=..., gender=...), which runs the real regex
+  only on the candidate documents and returns matches with offsets.
+
+The planner is conservative: whenever it cannot reason about part of a
+pattern it drops that constraint, so candidates are always a superset of the
+documents that match and results are identical to a full scan. Case is
+handled the way re.IGNORECASE matches: the non-ASCII characters it equates
+with an ASCII letter (ı, İ, ſ and the Kelvin sign) are folded to that letter
+in the index and in queries, and other non-ASCII characters of
+case-insensitive parts of a pattern constrain nothing.
+VERBOSE patterns are not planned (full scan).
+
+Author: NLP Course Exercise
+"""
+
+import os
+import re
+import json
+import glob
+import mmap
+import time
+from array import array
+from collections import Counter
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+
+INDEX_VERSION = 2
+WORD_TRIGRAM = re.compile(r'\w{3}')
+
+# Non-ASCII characters re.IGNORECASE matches to an ASCII letter (str.lower() only maps the Kelvin sign)
+CASE_FOLD = str.maketrans({'\u0130': 'i', '\u0131': 'i', '\u017f': 's', '\u212a': 'k'})
+
+# Largest set of alternative strings tracked before falling back to a trigram query
+MAX_EXACT = 64
+# Largest character class expanded into alternative strings
+MAX_CLASS = 10
+
+ALL = ('all',)
+
+
+# ---------------------------------------------------------------------------
+# Query planner
+# ---------------------------------------------------------------------------
+
+def _fold(text: str) -> str:
+    """Lower-case text, folding the characters of CASE_FOLD first (used for index and queries)."""
+    return text.translate(CASE_FOLD).lower()
+
+
+def _fold_char(code: int, ignorecase: bool) -> Optional[str]:
+    """
+    Folded form of one pattern character, or None if it cannot constrain the query.
+
+    Under IGNORECASE a non-ASCII character can match characters that fold
+    differently (µ and μ, σ and ς, ...), so only ASCII results are kept.
+    """
+    folded = _fold(chr(code))
+    if len(folded) != 1 or (ignorecase and not folded.isascii()):
+        return None
+    return folded
+
+
+def _and(queries: List[Tuple]) -> Tuple:
+    parts = []
+    for query in queries:
+        if query == ALL:
+            continue
+        if query[0] == 'and':
+            parts.extend(query[1])
+        elif query not in parts:
+            parts.append(query)
+    if not parts:
+        return ALL
+    return parts[0] if len(parts) == 1 else ('and', parts)
+
+
+def _or(queries: List[Tuple]) -> Tuple:
+    parts = []
+    for query in queries:
+        if query == ALL:
+            return ALL
+        if query[0] == 'or':
+            parts.extend(query[1])
+        elif query not in parts:
+            parts.append(query)
+    if not parts:
+        return ALL
+    return parts[0] if len(parts) == 1 else ('or', parts)
+
+
+def _string_query(text: str) -> Tuple:
+    """All indexed trigrams of one string must be present."""
+    return _and([('tri', text[i:i + 3]) for i in range(len(text) - 2)
+                 if WORD_TRIGRAM.fullmatch(text[i:i + 3])])
+
+
+# An exact set holds (string, bindings) pairs: the possible texts matched so far
+# and the text each capture group matched in them, so \1 can be followed exactly.
+Exact = Set[Tuple[str, FrozenSet[Tuple[int, str]]]]
+
+EMPTY: Exact = {('', frozenset())}
+
+
+def _cross(left: Exact, right: Exact) -> Optional[Exact]:
+    if len(left) * len(right) > MAX_EXACT:
+        return None
+    return {(ls + rs, lb | rb) for ls, lb in left for rs, rb in right}
+
+
+def _class_chars(items, ignorecase: bool) -> Optional[Set[str]]:
+    """Folded characters of a small character class, or None."""
+    codes = []
+    for op, value in items:
+        if op is sre_constants.LITERAL:
+            codes.append(value)
+        elif op is sre_constants.RANGE and value[1] - value[0] < MAX_CLASS:
+            codes.extend(range(value[0], value[1] + 1))
+        else:
+            return None  # NEGATE, CATEGORY (\w, \d, ...) or a large range
+    chars = {_fold_char(code, ignorecase) for code in codes}
+    if None in chars:
+        return None
+    return chars if len(chars) <= MAX_CLASS else None
+
+
+def _sequence(nodes, ignorecase: bool = False) -> Tuple[Optional[Exact], Tuple]:
+    """
+    Analyze a sequence of parsed regex nodes.
+
+    Args:
+        nodes: Parsed nodes
+        ignorecase: Whether IGNORECASE is in effect for them
+
+    Returns:
+        Tuple of (exact set or None, query). The exact set lists every string
+        the sequence can match (None if unknown); the query holds for any
+        document containing a match.
+    """
+    current = set(EMPTY)
+    queries = []
+    exact_ok = True
+
+    def flush():
+        # Turn the strings collected so far into a query and start over
+        nonlocal current, exact_ok
+        queries.append(_or([_string_query(s) for s, _ in sorted(current)]))
+        current = set(EMPTY)
+        exact_ok = False
+
+    def extend(options: Optional[Exact]):
+        nonlocal current
+        if options is None:
+            flush()
+            return
+        crossed = _cross(current, options)
+        if crossed is None:
+            flush()
+            crossed = set(options) if len(options) <= MAX_EXACT else set(EMPTY)
+        current = crossed
+
+    def bound(group: int) -> bool:
+        return all(any(g == group for g, _ in b) for _, b in current)
+
+    for op, value in nodes:
+        if op is sre_constants.LITERAL:
+            char = _fold_char(value, ignorecase)
+            if char is None:
+                flush()
+            else:
+                current = {(s + char, b) for s, b in current}
+
+        elif op is sre_constants.AT:
+            continue  # anchors and \b match no characters
+
+        elif op is sre_constants.IN:
+            chars = _class_chars(value, ignorecase)
+            extend({(c, frozenset()) for c in chars} if chars else None)
+
+        elif op is sre_constants.SUBPATTERN:
+            group, sub = value[0], value[-1]
+            sub_ignorecase = ignorecase
+            if len(value) == 4:
+                # Scoped inline flags such as (?i:...) or (?-i:...)
+                add_flags, del_flags = value[1], value[2]
+                sub_ignorecase = bool(add_flags & re.IGNORECASE) or (ignorecase and not del_flags & re.IGNORECASE)
+            exact, query = _sequence(sub, sub_ignorecase)
+            if exact is None:
+                flush()
+                queries.append(query)
+            else:
+                if group is not None:
+                    exact = {(s, b | {(group, s)}) for s, b in exact}
+                extend(exact)
+
+        elif op is sre_constants.BRANCH:
+            results = [_sequence(alternative, ignorecase) for alternative in value[1]]
+            if all(exact is not None for exact, _ in results):
+                union = set().union(*(exact for exact, _ in results))
+                if len(union) <= MAX_EXACT:
+                    extend(union)
+                    continue
+            flush()
+            queries.append(_or([query for _, query in results]))
+
+        elif op is sre_constants.GROUPREF:
+            if bound(value):
+                current = {(s + dict(b)[value], b) for s, b in current}
+            else:
+                flush()
+
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            low, high, sub = value
+            if low == 0:
+                flush()
+                continue
+
+            if len(sub) == 1 and sub[0][0] is sre_constants.GROUPREF:
+                group = sub[0][1]
+                if not bound(group):
+                    flush()
+                    continue
+                for _ in range(min(low, 8)):
+                    current = {(s + dict(b)[group], b) for s, b in current}
+                if high != low or low > 8:
+                    tails = {(dict(b)[group], b) for _, b in current}
+                    flush()
+                    current = tails
+                continue
+
+            exact, query = _sequence(sub, ignorecase)
+            if exact is None:
+                flush()
+                queries.append(query)
+                continue
+            for _ in range(min(low, 8)):
+                extend(exact)
+            if high != low or low > 8:
+                # More repetitions may follow; the text goes on from one copy of sub
+                flush()
+                current = set(exact)
+
+        else:
+            flush()  # ANY, NOT_LITERAL, CATEGORY, lookarounds, ...
+
+    if exact_ok:
+        return current, _or([_string_query(s) for s, _ in sorted(current)])
+    flush()
+    return None, _and(queries)
+
+
+def plan_query(pattern: str, flags: int = 0) -> Tuple:
+    """
+    Derive the trigram query that every document matching a regex satisfies.
+
+    Args:
+        pattern: Regular expression (Python syntax)
+        flags: re flags the pattern is compiled with
+
+    Returns:
+        Nested tuples: ('all',), ('tri', 'abc'), ('and', [...]) or ('or', [...])
+    """
+    parsed = sre_parse.parse(pattern, flags)
+    # Global flags: the ones passed in plus leading inline flags such as (?i)
+    global_flags = parsed.state.flags
+    if global_flags & re.VERBOSE:
+        return ALL
+    _, query = _sequence(list(parsed), bool(global_flags & re.IGNORECASE))
+    return query
+
+
+def format_query(query: Tuple) -> str:
+    """Readable form of a planned query."""
+    if query == ALL:
+        return '*'
+    if query[0] == 'tri':
+        return query[1]
+    joiner = ' AND ' if query[0] == 'and' else ' OR '
+    return '(' + joiner.join(format_query(part) for part in query[1]) + ')'
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+
+def _gender(filename: str) -> str:
+    if filename.startswith('F-'):
+        return 'female'
+    if filename.startswith('M-'):
+        return 'male'
+    return 'unknown'
+
+
+def _read(path: str) -> str:
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return f.read()
+
+
+def _document_trigrams(text: str) -> Set[str]:
+    trigrams = set()
+    for word in Counter(re.findall(r'\w{3,}', _fold(text))):
+        for i in range(len(word) - 2):
+            trigrams.add(word[i:i + 3])
+    return trigrams
+
+
+class TrigramIndex:
+    """Persistent trigram posting index over a directory of .txt files."""
+
+    def __init__(self, corpus_path: str, index_dir: Optional[str] = None):
+        """
+        Initialize the index (call open() to load or build it).
+
+        Args:
+            corpus_path: Directory with the blog .txt files
+            index_dir: Index location (default: <corpus_path>.trigram)
+        """
+        self.corpus_path = corpus_path.rstrip(os.sep)
+        self.index_dir = index_dir or self.corpus_path + '.trigram'
+        self.documents = []
+        self.keys = {}
+        self.postings = memoryview(b'').cast('I')
+        self.last_stats = {}
+
+    def _corpus_files(self) -> List[Dict]:
+        files = []
+        for path in sorted(glob.glob(os.path.join(self.corpus_path, '*.txt'))):
+            stat = os.stat(path)
+            name = os.path.basename(path)
+            files.append({'file': name, 'gender': _gender(name), 'size': stat.st_size,
+                          'mtime_ns': stat.st_mtime_ns})
+        return files
+
+    def open(self) -> 'TrigramIndex':
+        """Load the index from disk, rebuilding it if the corpus changed."""
+        meta_path = os.path.join(self.index_dir, 'meta.json')
+        files = self._corpus_files()
+
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('version') == INDEX_VERSION and meta['documents'] == files:
+                self._load(meta)
+                return self
+
+        self.build(files)
+        return self
+
+    def _load(self, meta: Dict) -> None:
+        self.documents = meta['documents']
+        with open(os.path.join(self.index_dir, 'keys.json'), 'r', encoding='utf-8') as f:
+            self.keys = json.load(f)
+        postings_path = os.path.join(self.index_dir, 'postings.u32')
+        if os.path.getsize(postings_path):
+            with open(postings_path, 'rb') as f:
+                self.postings = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)).cast('I')
+        else:
+            self.postings = memoryview(b'').cast('I')
+
+    def build(self, files: Optional[List[Dict]] = None) -> None:
+        """
+        Build the index from scratch.
+
+        Args:
+            files: Document list from _corpus_files (computed if omitted)
+        """
+        files = files if files is not None else self._corpus_files()
+        start = time.perf_counter()
+
+        doc_lists = {}
+        for doc_id, doc in enumerate(files):
+            for trigram in _document_trigrams(_read(os.path.join(self.corpus_path, doc['file']))):
+                doc_lists.setdefault(trigram, []).append(doc_id)
+
+        os.makedirs(self.index_dir, exist_ok=True)
+        keys = {}
+        offset = 0
+        with open(os.path.join(self.index_dir, 'postings.u32'), 'wb') as f:
+            for trigram in sorted(doc_lists):
+                ids = array('I', doc_lists[trigram])
+                f.write(ids.tobytes())
+                keys[trigram] = [offset, len(ids)]
+                offset += len(ids)
+
+        with open(os.path.join(self.index_dir, 'keys.json'), 'w', encoding='utf-8') as f:
+            json.dump(keys, f, ensure_ascii=False)
+        meta = {'version': INDEX_VERSION, 'documents': files,
+                'build_seconds': round(time.perf_counter() - start, 2)}
+        # meta.json is written last, so an interrupted build is never loaded
+        with open(os.path.join(self.index_dir, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+
+        self._load(meta)
+
+    def _posting(self, trigram: str) -> Set[int]:
+        entry = self.keys.get(trigram)
+        if entry is None:
+            return set()
+        offset, length = entry
+        return set(self.postings[offset:offset + length].tolist())
+
+    def evaluate(self, query: Tuple) -> Optional[Set[int]]:
+        """
+        Evaluate a planned query against the postings.
+
+        Returns:
+            Candidate document ids, or None meaning every document
+        """
+        if query == ALL:
+            return None
+        if query[0] == 'tri':
+            return self._posting(query[1])
+        if query[0] == 'and':
+            result = None
+            # Start with the rarest trigram so intersections stay small
+            for part in sorted(query[1], key=lambda q: self.keys.get(q[1], [0, 0])[1] if q[0] == 'tri' else 1 << 30):
+                ids = self.evaluate(part)
+                if ids is None:
+                    continue
+                result = ids if result is None else result & ids
+                if not result:
+                    return set()
+            return result
+        result = set()
+        for part in query[1]:
+            ids = self.evaluate(part)
+            if ids is None:
+                return None
+            result |= ids
+        return result
+
+    def search(self, pattern: str, threshold: int = 1, gender: Optional[str] = None,
+               flags: int = 0) -> List[Dict]:
+        """
+        Find all regex matches, scanning only the documents the index allows.
+
+        Args:
+            pattern: Regular expression
+            threshold: Only return documents with at least this many matches
+            gender: 'female', 'male' or None for all documents
+            flags: re flags for the verification regex
+
+        Returns:
+            One dictionary per document: file name, gender and a list of
+            (start, end, matched text) character offsets
+        """
+        start = time.perf_counter()
+        query = plan_query(pattern, flags)
+        candidates = self.evaluate(query)
+        doc_ids = range(len(self.documents)) if candidates is None else sorted(candidates)
+
+        regex = re.compile(pattern, flags)
+        hits = []
+        scanned = 0
+        for doc_id in doc_ids:
+            doc = self.documents[doc_id]
+            if gender is not None and doc['gender'] != gender:
+                continue
+            scanned += 1
+            text = _read(os.path.join(self.corpus_path, doc['file']))
+            matches = [(m.start(), m.end(), m.group(0)) for m in regex.finditer(text)]
+            if matches and len(matches) >= threshold:
+                hits.append({'file': doc['file'], 'gender': doc['gender'], 'matches': matches})
+
+        self.last_stats = {
+            'query': format_query(query),
+            'documents': len(self.documents),
+            'scanned': scanned,
+            'matching_documents': len(hits),
+            'milliseconds': round((time.perf_counter() - start) * 1000, 2)
+        }
+        return hits
+
+
+def search(pattern: str, threshold: int = 1, gender: Optional[str] = None,
+           corpus_path: Optional[str] = None) -> List[Dict]:
+    """
+    Convenience wrapper: open (or build) the index for a corpus and search it.
+
+    Args:
+        pattern: Regular expression
+        threshold: Minimum number of matches per returned document
+        gender: 'female', 'male' or None
+        corpus_path: Blog directory (default: homework1/assets/blogs)
+
+    Returns:
+        See TrigramIndex.search
+    """
+    corpus_path = corpus_path or os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'assets', 'blogs')
+    return TrigramIndex(os.path.normpath(corpus_path)).open().search(pattern, threshold, gender)
+
+
+def main():
+    """Run the exercise4 patterns through the index and compare with a full scan."""
+    import argparse
+
+    default_corpus = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                   '..', 'assets', 'blogs'))
+    parser = argparse.ArgumentParser(description='Trigram-indexed regex search over the blog corpus')
+    parser.add_argument('patterns', nargs='*', default=[
+        r'(?i)\b\w*([aeiou])\1{2,}\w*\b',
+        r'(?i)\bso+o{2,}\b',
+        r'(?i)\b(?:lo+l|ha(?:ha)+)\b',
+        r'(?i)\bre+a+l+y+\b'
+    ])
+    parser.add_argument('--corpus', default=default_corpus)
+    parser.add_argument('--gender', choices=['female', 'male'], default=None)
+    parser.add_argument('--threshold', type=int, default=1)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = TrigramIndex(args.corpus).open()
+    print(f"Index ready for {len(index.documents)} documents, {len(index.keys)} trigrams "
+          f"({time.perf_counter() - start:.2f}s)\n")
+
+    for pattern in args.patterns:
+        hits = index.search(pattern, args.threshold, args.gender)
+        stats = index.last_stats
+        total = sum(len(hit['matches']) for hit in hits)
+        print(f"Pattern: {pattern}")
+        print(f"  Trigram query: {stats['query']}")
+        print(f"  Scanned {stats['scanned']}/{stats['documents']} documents in {stats['milliseconds']} ms; "
+              f"{total} matches in {stats['matching_documents']} documents")
+        for hit in hits[:3]:
+            examples = ', '.join(text for _, _, text in hit['matches'][:5])
+            print(f"    {hit['file']} ({hit['gender']}): {examples}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -14,24 +14,29 @@ import re
 import os
 import glob
 from collections import defaultdict, Counter
-from typing import List, Dict, Tuple, Set
+from typing import List, Dict, Optional, Tuple, Set
+
+from bytes_scanner import DualPattern, mapped, scan_words, split_segments
+from legit_lexicon import LegitLexicon
 
 
 class VowelDuplicationFinder:
     """Finds and analyzes vowel duplications in text files."""
 
-    def __init__(self, corpus_path: str):
+    def __init__(self, corpus_path: str, lexicon_path: Optional[str] = None):
         """
         Initialize the vowel duplication finder.
 
         Args:
             corpus_path: Path to the directory containing blog text files
+            lexicon_path: Prebuilt lexicon of legitimate words (see legit_lexicon.py);
+                the built-in list of common words is used when omitted
         """
         self.corpus_path = corpus_path
         self.vowels = 'aeiou'
 
         # Common English words with natural double vowels to exclude
-        self.common_words = {
+        self.common_words = LegitLexicon.open(lexicon_path) if lexicon_path else LegitLexicon.from_words({
             'good', 'been', 'see', 'too', 'feel', 'school', 'need', 'look',
             'week', 'keep', 'cool', 'took', 'looking', 'soon', 'sleep', 'room',
             'seems', 'feeling', 'free', 'three', 'you', 'out', 'about', 'really',
@@ -39,7 +44,7 @@ class VowelDuplicationFinder:
             'again', 'said', 'being', 'beautiful', 'seeing', 'seriously', 'serious',
             'obviously', 'quiet', 'previous', 'beauty', 'various', 'obvious',
             'religious', 'hilarious', 'precious', 'queen', 'delicious', 'gorgeous'
-        }
+        })
 
         # Regular expression patterns for vowel duplication (with inline case-insensitive flag)
         # Pattern 1: Emphatic duplications - 3+ identical vowels (clearly for emphasis)
@@ -54,6 +59,14 @@ class VowelDuplicationFinder:
         # Pattern 4: Repeated vowel pairs (like "aaaa", "eeee", "oooo")
         self.repeated_pairs_pattern = r'(?i)\b\w*([aeiou])\1{3,}\w*\b'
 
+        # Compiled for both text and bytes mode, in the order the categories are scanned
+        self.category_patterns = {
+            'emphatic_identical': DualPattern(self.emphatic_identical_pattern),
+            'mixed_emphasis': DualPattern(self.mixed_emphasis_pattern),
+            'long_vowels': DualPattern(self.long_vowel_pattern),
+            'repeated_pairs': DualPattern(self.repeated_pairs_pattern)
+        }
+
         self.results = {
             'emphatic_identical': defaultdict(list),
             'mixed_emphasis': defaultdict(list),
@@ -107,38 +120,43 @@ class VowelDuplicationFinder:
             filename: Name of the file being processed (for tracking)
         """
         # Patterns now use (?i) inline flag, so no need for text.lower() or re.IGNORECASE
+        for category, pattern in self.category_patterns.items():
+            self._record(category, (match.group(0) for match in pattern.text.finditer(text)), filename)
 
-        # Pattern 1: Emphatic identical vowels (3+ consecutive identical vowels)
-        for match in re.finditer(self.emphatic_identical_pattern, text):
-            word = match.group(0).lower()  # Still lowercase for consistent storage
+    def find_duplications_in_buffer(self, buffer, filename: str) -> None:
+        """
+        Find vowel duplications in raw file contents without decoding them (bytes mode).
+
+        Gives the same results as find_duplications_in_text on the decoded
+        text; see bytes_scanner.py.
+
+        Args:
+            buffer: Raw bytes or memory-mapped file contents
+            filename: Name of the file being processed (for tracking)
+        """
+        segments = split_segments(buffer)
+        for category, pattern in self.category_patterns.items():
+            self._record(category, scan_words(buffer, pattern, segments), filename)
+
+    def _record(self, category: str, words, filename: str) -> None:
+        """Store matched words of one category, skipping common words and overlong matches."""
+        for word in words:
+            word = word.lower()  # Still lowercase for consistent storage
             # Filter out common English words and very long matches (likely paragraphs)
-            if word not in self.common_words and len(word) <= 30:
-                self.results['emphatic_identical'][word].append(filename)
-
-        # Pattern 2: Mixed emphasis (multiple vowel duplications in same word)
-        for match in re.finditer(self.mixed_emphasis_pattern, text):
-            word = match.group(0).lower()  # Still lowercase for consistent storage
-            # Ensure it's not a common word and not too long (to avoid paragraphs)
-            if word not in self.common_words and len(word) <= 30:
-                # Additional check to ensure it actually has multiple duplications
-                vowel_sequences = re.findall(r'(?i)[aeiou]{2,}', word)
-                if len(vowel_sequences) >= 2:
-                    self.results['mixed_emphasis'][word].append(filename)
-
-        # Pattern 3: Long vowel sequences (4+ consecutive vowels)
-        for match in re.finditer(self.long_vowel_pattern, text):
-            word = match.group(0).lower()  # Still lowercase for consistent storage
-            if word not in self.common_words and len(word) <= 30:
-                self.results['long_vowels'][word].append(filename)
-
-        # Pattern 4: Repeated pairs (4+ identical consecutive vowels)
-        for match in re.finditer(self.repeated_pairs_pattern, text):
-            word = match.group(0).lower()  # Still lowercase for consistent storage
-            if word not in self.common_words and len(word) <= 30:
-                self.results['repeated_pairs'][word].append(filename)
-
-    def process_corpus(self) -> None:
-        """Process all text files in the corpus directory."""
+            if word in self.common_words or len(word) > 30:
+                continue
+            # Mixed emphasis: ensure the word actually has multiple duplications
+            if category == 'mixed_emphasis' and len(re.findall(r'(?i)[aeiou]{2,}', word)) < 2:
+                continue
+            self.results[category][word].append(filename)
+
+    def process_corpus(self, bytes_mode: bool = True) -> None:
+        """
+        Process all text files in the corpus directory.
+
+        Args:
+            bytes_mode: Scan the raw (memory-mapped) files instead of decoding them
+        """
         pattern = os.path.join(self.corpus_path, '*.txt')
         files = glob.glob(pattern)
 
@@ -147,14 +165,17 @@ class VowelDuplicationFinder:
         processed_count = 0
         for filepath in files:
             try:
-                with open(filepath, 'r', encoding='utf-8', errors='ignore') as file:
-                    text = file.read()
-                    filename = os.path.basename(filepath)
-                    self.find_duplications_in_text(text, filename)
-                    processed_count += 1
-
-                    if processed_count % 100 == 0:
-                        print(f"Processed {processed_count} files...")
+                filename = os.path.basename(filepath)
+                if bytes_mode:
+                    with mapped(filepath) as buffer:
+                        self.find_duplications_in_buffer(buffer, filename)
+                else:
+                    with open(filepath, 'r', encoding='utf-8', errors='ignore') as file:
+                        self.find_duplications_in_text(file.read(), filename)
+                processed_count += 1
+
+                if processed_count % 100 == 0:
+                    print(f"Processed {processed_count} files...")
 
             except Exception as e:
                 print(f"Error processing {filepath}: {e}")
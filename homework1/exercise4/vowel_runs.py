@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Vectorized Vowel Run-Length Histograms
+
+exercise4d_regex_normalization.py (analyze_original_text) and
+exercise4d_simple.py (count_vowel_changes) find vowel runs one regex match at
+a time and build a dictionary per match. For corpus-wide statistics this
+module maps the whole corpus to one uint8 array and finds every run of 2+
+identical vowels (case-insensitive, as with re.IGNORECASE) in a few array
+operations:
+
+1. a 256-entry lookup table turns bytes into vowel codes (a=1 ... u=5, else 0),
+2. np.diff over "same vowel as the previous byte" flags gives the run
+   boundaries, np.flatnonzero their positions,
+3. np.bincount turns (vowel, length) pairs into histograms with the bins
+   a_2, a_3, ..., a_<max>+, e_2, ..., u_<max>+.
+
+Documents are separated by a zero byte, so runs never span two files, and
+their start offsets give a per-document breakdown with the same bincount.
+
+Author: NLP Course Exercise
+"""
+
+import os
+import glob
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+
+VOWELS = 'aeiou'
+
+# Byte value -> vowel code (1-5), 0 for everything else
+VOWEL_CODES = np.zeros(256, dtype=np.uint8)
+for _code, _vowel in enumerate(VOWELS, 1):
+    VOWEL_CODES[ord(_vowel)] = VOWEL_CODES[ord(_vowel.upper())] = _code
+
+
+def load_corpus(corpus_path: str, pattern: str = '*.txt') -> Tuple[np.ndarray, List[str], np.ndarray]:
+    """
+    Read every file of a corpus into one uint8 array.
+
+    Files are read directly into the array (no decoding, no intermediate
+    strings) and separated by a zero byte.
+
+    Args:
+        corpus_path: Directory containing the text files
+        pattern: Glob pattern of the files to read
+
+    Returns:
+        Tuple of (buffer, file names, offsets) where document i occupies
+        buffer[offsets[i]:offsets[i + 1] - 1]
+    """
+    paths = sorted(glob.glob(os.path.join(corpus_path, pattern)))
+    sizes = np.array([os.path.getsize(path) for path in paths], dtype=np.int64)
+    offsets = np.zeros(len(paths) + 1, dtype=np.int64)
+    np.cumsum(sizes + 1, out=offsets[1:])
+
+    buffer = np.zeros(int(offsets[-1]), dtype=np.uint8)
+    for path, start, size in zip(paths, offsets[:-1], sizes):
+        with open(path, 'rb') as f:
+            f.readinto(memoryview(buffer[start:start + size]))
+    return buffer, [os.path.basename(path) for path in paths], offsets
+
+
+def as_buffer(text: Union[str, bytes]) -> np.ndarray:
+    """View a string (UTF-8 encoded) or bytes object as a uint8 array."""
+    if isinstance(text, str):
+        text = text.encode('utf-8')
+    return np.frombuffer(text, dtype=np.uint8)
+
+
+def find_runs(buffer: np.ndarray, min_length: int = 2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find all runs of identical vowels.
+
+    Args:
+        buffer: uint8 array of text
+        min_length: Shortest run to report (at least 2)
+
+    Returns:
+        Tuple of (start positions, vowel indices 0-4, run lengths)
+    """
+    codes = VOWEL_CODES[buffer]
+    # same[i]: byte i + 1 repeats the vowel at byte i
+    same = (codes[1:] == codes[:-1]) & (codes[1:] != 0)
+    edges = np.diff(same.view(np.int8), prepend=np.int8(0), append=np.int8(0))
+    starts = np.flatnonzero(edges == 1)
+    lengths = np.flatnonzero(edges == -1) - starts + 1
+
+    keep = lengths >= max(2, min_length)
+    starts, lengths = starts[keep], lengths[keep]
+    return starts, codes[starts].astype(np.intp) - 1, lengths
+
+
+def _bins(vowels: np.ndarray, lengths: np.ndarray, max_length: int) -> np.ndarray:
+    """Flat bin index of every run: vowel-major, lengths 2..max_length (last bin open-ended)."""
+    return vowels * (max_length - 1) + np.minimum(lengths, max_length) - 2
+
+
+def run_histogram(vowels: np.ndarray, lengths: np.ndarray, max_length: int = 10) -> np.ndarray:
+    """
+    Count runs by vowel and length.
+
+    Args:
+        vowels: Vowel index of every run (from find_runs)
+        lengths: Length of every run
+        max_length: Runs of this length or longer share the last bin
+
+    Returns:
+        Array of shape (5, max_length - 1); column j counts runs of length j + 2
+    """
+    size = len(VOWELS) * (max_length - 1)
+    counts = np.bincount(_bins(vowels, lengths, max_length), minlength=size)
+    return counts.reshape(len(VOWELS), max_length - 1)
+
+
+def per_document_histogram(starts: np.ndarray, vowels: np.ndarray, lengths: np.ndarray,
+                           offsets: np.ndarray, max_length: int = 10) -> np.ndarray:
+    """
+    Count runs by document, vowel and length.
+
+    Args:
+        starts, vowels, lengths: Output of find_runs
+        offsets: Document offsets from load_corpus
+        max_length: Runs of this length or longer share the last bin
+
+    Returns:
+        Array of shape (documents, 5, max_length - 1)
+    """
+    n_docs = len(offsets) - 1
+    documents = np.searchsorted(offsets, starts, side='right') - 1
+    size = len(VOWELS) * (max_length - 1)
+    counts = np.bincount(documents * size + _bins(vowels, lengths, max_length), minlength=n_docs * size)
+    return counts.reshape(n_docs, len(VOWELS), max_length - 1)
+
+
+def histogram_labels(max_length: int = 10) -> List[str]:
+    """Bin labels a_2, a_3, ..., a_<max>+, e_2, ..., u_<max>+ in histogram order."""
+    return [f"{vowel}_{length}{'+' if length == max_length else ''}"
+            for vowel in VOWELS for length in range(2, max_length + 1)]
+
+
+def histogram_dict(histogram: np.ndarray) -> Dict[str, int]:
+    """Non-zero bins of a (5, max_length - 1) histogram as {label: count}."""
+    labels = histogram_labels(histogram.shape[1] + 1)
+    return {label: int(count) for label, count in zip(labels, histogram.ravel()) if count}
+
+
+def text_histogram(text: Union[str, bytes], max_length: int = 10) -> Dict[str, int]:
+    """
+    Run-length histogram of a single text.
+
+    Args:
+        text: Text or raw bytes
+        max_length: Runs of this length or longer share the last bin
+
+    Returns:
+        {label: count} for the non-empty bins
+    """
+    _, vowels, lengths = find_runs(as_buffer(text))
+    return histogram_dict(run_histogram(vowels, lengths, max_length))
+
+
+def main():
+    """Print corpus-wide and per-gender vowel run-length histograms of the blog corpus."""
+    import time
+    import argparse
+
+    default_corpus = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'assets', 'blogs')
+
+    parser = argparse.ArgumentParser(description='Vowel run-length histograms')
+    parser.add_argument('--corpus', default=default_corpus)
+    parser.add_argument('--max-length', type=int, default=10)
+    parser.add_argument('--top', type=int, default=5, help='documents with the most emphatic (3+) runs')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    buffer, names, offsets = load_corpus(args.corpus)
+    loaded = time.perf_counter()
+    starts, vowels, lengths = find_runs(buffer)
+    histogram = run_histogram(vowels, lengths, args.max_length)
+    by_document = per_document_histogram(starts, vowels, lengths, offsets, args.max_length)
+    done = time.perf_counter()
+
+    print("Vowel Run-Length Histograms")
+    print("=" * 60)
+    print(f"Corpus: {args.corpus}")
+    print(f"{len(names)} files, {len(buffer):,} bytes, {len(starts):,} runs of 2+ identical vowels")
+    print(f"Read {loaded - start:.3f}s, runs and histograms {done - loaded:.3f}s")
+
+    lengths_header = ' '.join(f"{label.split('_')[1]:>6}" for label in histogram_labels(args.max_length)[:args.max_length - 1])
+    groups = {'all': np.ones(len(names), dtype=bool),
+              'female': np.array([name.startswith('F-') for name in names]),
+              'male': np.array([name.startswith('M-') for name in names])}
+    for group, mask in groups.items():
+        print(f"\n{group} ({int(mask.sum())} files)")
+        print(f"    {lengths_header}")
+        group_histogram = by_document[mask].sum(axis=0) if group != 'all' else histogram
+        for vowel, row in zip(VOWELS, group_histogram):
+            print(f"  {vowel}: " + ' '.join(f"{int(count):>6}" for count in row))
+
+    emphatic = by_document[:, :, 1:].sum(axis=(1, 2))
+    print("\nFiles with the most emphatic (3+) runs:")
+    for index in np.argsort(-emphatic, kind='stable')[:args.top]:
+        print(f"  {names[index]}: {int(emphatic[index])}")
+
+
+if __name__ == "__main__":
+    main()
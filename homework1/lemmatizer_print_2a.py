@@ -1,5 +1,8 @@
 import nltk
 from nltk.stem import WordNetLemmatizer
+
+from results_writer import ResultsWriter
+
 nltk.download("wordnet")
 nltk.download("omw-1.4")
 
@@ -15,14 +18,9 @@ with open("./assets/sorted_types_HW1.txt", "r", encoding="utf-8") as f:
 unique_lemmas_v = set()
 unique_lemmas_n = set()
 
-# Open output file for writing
-with open("assets/lemmatized_results.txt", "w", encoding="utf-8") as output_file:
-    # Write header to both console and file
-    header = "{0:20}{1:20}{2:20}".format("--Word--", "--Lemma (v)--", "--Lemma (n)--")
-    print(header)
-    output_file.write(header + "\n")
-
-    # Perform lemmatization and print/write 3 columns: word -- lemma (pos=v) -- lemma (pos=n)
+# Write rows in batches (Parquet, or JSON Lines without pyarrow): one row per word and POS
+with ResultsWriter("assets/lemmatized_results", "lemmas") as writer:
+    # Perform lemmatization: word -- lemma (pos=v) -- lemma (pos=n)
     for word in example_words:
         lemma_v = wnl.lemmatize(word, pos="v")
         lemma_n = wnl.lemmatize(word, pos="n")
@@ -31,17 +29,10 @@ with open("assets/lemmatized_results.txt", "w", encoding="utf-8") as output_file
         unique_lemmas_v.add(lemma_v)
         unique_lemmas_n.add(lemma_n)
 
-        # Format the line
-        line = "{0:20}{1:20}{2:20}".format(word, lemma_v, lemma_n)
-        print(line)
-        output_file.write(line + "\n")
-
-    # Write summary to file
-    output_file.write(f"\nTotal rows: {len(example_words)}\n")
-    output_file.write(f"Unique lemmas (pos=v): {len(unique_lemmas_v)}\n")
-    output_file.write(f"Unique lemmas (pos=n): {len(unique_lemmas_n)}\n")
+        writer.write((word, lemma_v, "v"))
+        writer.write((word, lemma_n, "n"))
 
-print(f"\nTotal rows: {len(example_words)}")
+print(f"Total words: {len(example_words)}")
 print(f"Unique lemmas (pos=v): {len(unique_lemmas_v)}")
 print(f"Unique lemmas (pos=n): {len(unique_lemmas_n)}")
-print(f"\nResults saved to: assets/lemmatized_results.txt")
+print(f"Results: {writer.summary()}")
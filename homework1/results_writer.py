@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Buffered Columnar Result Export
+
+The lemmatizer scripts printed and wrote every row separately, and the
+exercise4 analyzers dumped nested dictionaries with json.dump(indent=2).
+ResultsWriter collects rows in memory and writes them in batches:
+
+- as Parquet when pyarrow is installed (one row group per batch, typed
+  columns, compressed),
+- otherwise as JSON Lines (one compact object per row), which needs nothing
+  beyond the standard library and can be appended to and streamed.
+
+Every analyzer has a fixed schema (see SCHEMAS), so the files can be loaded
+with pandas/pyarrow or read back with read_results() whatever the format.
+Scripts print a one-line summary() instead of the rows.
+
+Author: NLP Course Exercise
+"""
+
+import os
+import json
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+
+# Column name and type ('string' or 'int64') of every analyzer's rows
+SCHEMAS: Dict[str, List[Tuple[str, str]]] = {
+    'lemmas': [('word', 'string'), ('lemma', 'string'), ('pos', 'string')],
+    'vowel_frequencies': [('gender', 'string'), ('vowel', 'string'), ('base_word', 'string'), ('freq', 'int64')],
+    'normalization': [('strategy', 'string'), ('file', 'string'), ('substitutions', 'int64')]
+}
+
+EXTENSIONS = {'parquet': '.parquet', 'jsonl': '.jsonl'}
+DEFAULT_BATCH_SIZE = 50_000
+
+
+def _pyarrow():
+    """Return (pyarrow, pyarrow.parquet), or None if pyarrow is not installed."""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow, pyarrow.parquet
+
+
+def available_format() -> str:
+    """'parquet' if pyarrow can be imported, else 'jsonl'."""
+    return 'parquet' if _pyarrow() is not None else 'jsonl'
+
+
+class ResultsWriter:
+    """Buffers result rows and writes them to Parquet or JSON Lines in batches."""
+
+    def __init__(self, path: str, schema: Union[str, Sequence[Tuple[str, str]]],
+                 output_format: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Open a results file.
+
+        Args:
+            path: Output path; the extension (.parquet or .jsonl) is added or
+                replaced to match the format
+            schema: Name of an entry in SCHEMAS or a list of (column, type) pairs
+            output_format: 'parquet', 'jsonl' or None (Parquet if pyarrow is available)
+            batch_size: Rows buffered before a batch is written
+        """
+        self.columns = list(SCHEMAS[schema] if isinstance(schema, str) else schema)
+        self.names = [name for name, _ in self.columns]
+        self.format = output_format or available_format()
+        if self.format not in EXTENSIONS:
+            raise ValueError(f"Unknown output format '{self.format}' (use 'parquet' or 'jsonl')")
+
+        arrow = _pyarrow() if self.format == 'parquet' else None
+        if self.format == 'parquet' and arrow is None:
+            raise ImportError("Parquet output needs pyarrow (pip install pyarrow); use output_format='jsonl'")
+
+        root, extension = os.path.splitext(path)
+        self.path = (root if extension in ('.json', '.jsonl', '.parquet', '.txt') else path) + EXTENSIONS[self.format]
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._buffer: List[tuple] = []
+
+        if arrow is not None:
+            pa, pq = arrow
+            types = {'string': pa.string(), 'int64': pa.int64()}
+            self._arrow = pa
+            self._schema = pa.schema([(name, types[kind]) for name, kind in self.columns])
+            self._writer = pq.ParquetWriter(self.path, self._schema, compression='zstd')
+        else:
+            self._arrow = None
+            self._writer = open(self.path, 'w', encoding='utf-8')
+
+    def write(self, row: Union[Sequence, Dict]) -> None:
+        """
+        Add one row.
+
+        Args:
+            row: Values in schema order, or a dictionary keyed by column name
+        """
+        if isinstance(row, dict):
+            row = tuple(row.get(name) for name in self.names)
+        elif len(row) != len(self.names):
+            raise ValueError(f"Row has {len(row)} values, schema has {len(self.names)} columns: {row!r}")
+        self._buffer.append(tuple(row))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_rows(self, rows: Iterable[Union[Sequence, Dict]]) -> None:
+        for row in rows:
+            self.write(row)
+
+    def flush(self) -> None:
+        """Write the buffered rows as one batch."""
+        if not self._buffer:
+            return
+        if self._arrow is not None:
+            columns = list(zip(*self._buffer))
+            table = self._arrow.Table.from_arrays(
+                [self._arrow.array(values, type=field.type) for values, field in zip(columns, self._schema)],
+                schema=self._schema)
+            self._writer.write_table(table)
+        else:
+            names = self.names
+            self._writer.write(''.join(json.dumps(dict(zip(names, row)), ensure_ascii=False) + '\n'
+                                       for row in self._buffer))
+        self.rows_written += len(self._buffer)
+        self._buffer = []
+
+    def close(self) -> None:
+        """Flush the remaining rows and close the file."""
+        if self._writer is None:
+            return
+        self.flush()
+        self._writer.close()
+        self._writer = None
+
+    def summary(self) -> str:
+        return f"{self.rows_written:,} rows ({', '.join(self.names)}) written to {self.path} [{self.format}]"
+
+    def __enter__(self) -> 'ResultsWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def read_results(path: str) -> Iterator[Dict]:
+    """
+    Read rows written by ResultsWriter.
+
+    Args:
+        path: A .parquet or .jsonl results file
+
+    Yields:
+        One dictionary per row
+    """
+    if path.endswith('.parquet'):
+        arrow = _pyarrow()
+        if arrow is None:
+            raise ImportError(f"Reading {path} needs pyarrow (pip install pyarrow)")
+        parquet_file = arrow[1].ParquetFile(path)
+        for batch in parquet_file.iter_batches():
+            yield from batch.to_pylist()
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
@@ -2,6 +2,8 @@ import spacy
 import subprocess
 import sys
 
+from results_writer import ResultsWriter
+
 def download_spacy_model(model_name):
     """Download spaCy model if not already installed"""
     try:
@@ -28,51 +30,21 @@ with open("assets/sorted_types_HW1.txt", "r", encoding="utf-8") as f:
 
 print(f"Original words: {len(words)}")
 
-# Lemmatize with SpaCy
-lemmatized = []
-lema_pairs = []
-
-for word in words:
-    doc = nlp(word)
-    token = doc[0]
-    lemma = token.lemma_
-    lemmatized.append(lemma)
-    lema_pairs.append((word, lemma, token.pos_))
-
-# Count unique lemmas
-unique_lemmas = set(lemmatized)
-print(f"Unique lemmas after SpaCy lemmatization: {len(unique_lemmas)}")
-
-# Save results to file
-output_filename = "assets/spacy_lemmatized_results.txt"
-with open(output_filename, "w", encoding="utf-8") as output_file:
-    # Write header to both console and file
-    header = "{0:20}{1:20}".format("--Original--", "--Lemma--")
-    print(f"\n{header}")
-    output_file.write(header + "\n")
+# Lemmatize with SpaCy, writing rows in batches (Parquet, or JSON Lines without pyarrow)
+unique_lemmas = set()
+changed = 0
 
-    # Write all lemmatization results (without POS tag)
-    for word, lemma in zip(words, lemmatized):
-        line = "{0:20}{1:20}".format(word, lemma)
-        print(line)
-        output_file.write(line + "\n")
-
-    # Write summary to file
-    output_file.write(f"\nTotal rows: {len(words)}\n")
-    output_file.write(f"Unique lemmas: {len(unique_lemmas)}\n")
+with ResultsWriter("assets/spacy_lemmatized_results", "lemmas") as writer:
+    for word in words:
+        doc = nlp(word)
+        token = doc[0]
+        lemma = token.lemma_
+        unique_lemmas.add(lemma)
+        if lemma != word:
+            changed += 1
+        writer.write((word, lemma, token.pos_))
 
 # Print summary
-print(f"\nTotal rows: {len(words)}")
-print(f"Unique lemmas: {len(unique_lemmas)}")
-print(f"Results saved to: {output_filename}")
-
-# Print the list of unique lemmatized words
-print(f"\nList of unique lemmatized words:")
-print("-" * 40)
-sorted_unique_lemmas = sorted(unique_lemmas)
-for i, lemma in enumerate(sorted_unique_lemmas, 1):
-    print(f"{i:4}. {lemma}")
-
-# Show examples where lemmas differ
-changed = [(orig, lem) for orig, lem, _ in lema_pairs if orig != lem]
-print(f"\nWords that changed: {len(changed)}")
+print(f"Unique lemmas after SpaCy lemmatization: {len(unique_lemmas)}")
+print(f"Words that changed: {changed}")
+print(f"Results: {writer.summary()}")
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Batched Generation Runner for the Prompt-Engineering Comparisons
+
+The homework3 prompt cells call generate() separately for every prompt and
+every model with batch size 1. GenerationRunner instead:
+
+- groups prompts by token length so that each batch wastes little padding,
+- left-pads decoder-only models (TinyLlama) so new tokens line up at the end,
+- runs under torch.inference_mode() with a configurable CPU thread count,
+- records tokens/sec, time-to-first-token and per-prompt latency.
+
+It also strips the prompt by token position rather than by string length, which
+the notebook's llama_output[len(prompt):] only approximates.
+
+torch is imported when a runner first generates, not at import time, so
+model_registry can set up and time the backend imports itself.
+
+Author: NLP Course Exercise
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+
+@dataclass
+class GenerationResult:
+    """Output and timing of one prompt."""
+    prompt: str
+    output: str
+    prompt_tokens: int
+    new_tokens: int
+    latency: float
+    time_to_first_token: float
+    batch_size: int
+    tokens_per_sec: float = field(init=False)
+
+    def __post_init__(self):
+        self.tokens_per_sec = self.new_tokens / self.latency if self.latency else 0.0
+
+
+class _StepTimer:
+    """
+    Streamer that only timestamps generation steps.
+
+    Implements the put()/end() interface generate() expects of a streamer
+    (transformers' BaseStreamer), without importing transformers.
+
+    generate() calls put() once with the prompt (decoder-only) or the decoder
+    start token (seq2seq), then once per step with one new token per row.
+    """
+
+    def __init__(self, batch_size: int, eos_token_id: Optional[int]):
+        self.batch_size = batch_size
+        self.eos_token_id = eos_token_id
+        self.start = time.perf_counter()
+        self.first_token_time = None
+        self.finish_times = [None] * batch_size
+        self._seen_prompt = False
+
+    def put(self, value):
+        now = time.perf_counter()
+        if not self._seen_prompt:
+            self._seen_prompt = True
+            return
+
+        if self.first_token_time is None:
+            self.first_token_time = now - self.start
+
+        if self.eos_token_id is not None:
+            tokens = value.view(-1).tolist()
+            for row, token in enumerate(tokens[:self.batch_size]):
+                if self.finish_times[row] is None and token == self.eos_token_id:
+                    self.finish_times[row] = now - self.start
+
+    def end(self):
+        now = time.perf_counter() - self.start
+        self.finish_times = [t if t is not None else now for t in self.finish_times]
+        if self.first_token_time is None:
+            self.first_token_time = now
+
+
+class GenerationRunner:
+    """Runs batched, length-grouped generation for one model."""
+
+    def __init__(self, model, tokenizer, batch_size: int = 8, num_threads: Optional[int] = None,
+                 max_input_length: int = 512):
+        """
+        Initialize the runner.
+
+        Args:
+            model: A loaded seq2seq or causal language model
+            tokenizer: The matching tokenizer
+            batch_size: Maximum number of prompts per generate() call
+            num_threads: torch intra-op CPU threads (None keeps torch's default)
+            max_input_length: Prompts are truncated to this many tokens
+        """
+        self.model = model.eval()
+        self.tokenizer = tokenizer
+        self.batch_size = batch_size
+        self.num_threads = num_threads
+        self.max_input_length = max_input_length
+        self.is_encoder_decoder = bool(getattr(model.config, 'is_encoder_decoder', False))
+
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        # Decoder-only models continue from the last position, so pad on the left
+        if not self.is_encoder_decoder:
+            self.tokenizer.padding_side = 'left'
+
+    def _length_batches(self, prompts: Sequence[str]) -> List[List[int]]:
+        """Sort prompt indices by token length and cut them into batches."""
+        lengths = [len(ids) for ids in self.tokenizer(list(prompts), truncation=True,
+                                                      max_length=self.max_input_length)['input_ids']]
+        order = sorted(range(len(prompts)), key=lambda i: lengths[i])
+        return [order[i:i + self.batch_size] for i in range(0, len(order), self.batch_size)]
+
+    def _run_batch(self, prompts: List[str], generate_kwargs: Dict) -> List[GenerationResult]:
+        inputs = self.tokenizer(prompts, return_tensors='pt', padding=True, truncation=True,
+                                max_length=self.max_input_length)
+        prompt_lengths = inputs['attention_mask'].sum(dim=1).tolist()
+
+        timer = _StepTimer(len(prompts), self.tokenizer.eos_token_id)
+        kwargs = dict(generate_kwargs)
+        kwargs.setdefault('pad_token_id', self.tokenizer.pad_token_id)
+
+        outputs = self.model.generate(**inputs, streamer=timer, **kwargs)
+
+        # Causal models echo the (padded) prompt; keep only the new tokens
+        if not self.is_encoder_decoder:
+            outputs = outputs[:, inputs['input_ids'].shape[1]:]
+
+        results = []
+        for row, prompt in enumerate(prompts):
+            tokens = outputs[row]
+            special = (tokens == self.tokenizer.pad_token_id)
+            if self.tokenizer.eos_token_id is not None:
+                special |= (tokens == self.tokenizer.eos_token_id)
+            new_tokens = int((~special).sum())
+
+            results.append(GenerationResult(
+                prompt=prompt,
+                output=self.tokenizer.decode(tokens, skip_special_tokens=True).strip(),
+                prompt_tokens=int(prompt_lengths[row]),
+                new_tokens=new_tokens,
+                latency=timer.finish_times[row],
+                time_to_first_token=timer.first_token_time,
+                batch_size=len(prompts)
+            ))
+        return results
+
+    def run(self, prompts: Sequence[str], **generate_kwargs) -> List[GenerationResult]:
+        """
+        Generate completions for all prompts.
+
+        Args:
+            prompts: Prompt strings
+            **generate_kwargs: Passed to model.generate (max_new_tokens, do_sample, temperature, ...)
+
+        Returns:
+            One GenerationResult per prompt, in the order of the input prompts
+        """
+        import torch
+
+        previous_threads = torch.get_num_threads()
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+
+        results = [None] * len(prompts)
+        try:
+            with torch.inference_mode():
+                for batch in self._length_batches(prompts):
+                    batch_results = self._run_batch([prompts[i] for i in batch], generate_kwargs)
+                    for i, result in zip(batch, batch_results):
+                        results[i] = result
+        finally:
+            torch.set_num_threads(previous_threads)
+
+        return results
+
+
+def summarize_results(results: List[GenerationResult]) -> Dict[str, float]:
+    """
+    Aggregate throughput and latency over a list of results.
+
+    Args:
+        results: Results returned by GenerationRunner.run
+
+    Returns:
+        Dictionary with total tokens, mean latency, mean TTFT and tokens/sec per prompt
+    """
+    if not results:
+        return {}
+    total_tokens = sum(r.new_tokens for r in results)
+    return {
+        'prompts': len(results),
+        'new_tokens': total_tokens,
+        'mean_latency': sum(r.latency for r in results) / len(results),
+        'mean_time_to_first_token': sum(r.time_to_first_token for r in results) / len(results),
+        'mean_tokens_per_sec': sum(r.tokens_per_sec for r in results) / len(results)
+    }
+
+
+def compare_models(prompts: Dict[str, str], runners: Dict[str, GenerationRunner],
+                   **generate_kwargs) -> List[Dict]:
+    """
+    Batched replacement for the notebook's test_both_models loop.
+
+    Args:
+        prompts: Mapping of technique name to prompt text
+        runners: Mapping of model label (e.g. 'FLAN-T5', 'TinyLlama') to runner
+        **generate_kwargs: Passed to every generate() call
+
+    Returns:
+        Rows with technique, model, latency, TTFT, tokens/sec and output
+    """
+    names = list(prompts)
+    texts = [prompts[name] for name in names]
+
+    rows = []
+    for label, runner in runners.items():
+        for name, result in zip(names, runner.run(texts, **generate_kwargs)):
+            rows.append({
+                'Technique': name,
+                'Model': label,
+                'Time (s)': round(result.latency, 2),
+                'TTFT (s)': round(result.time_to_first_token, 2),
+                'Tokens/sec': round(result.tokens_per_sec, 1),
+                'Words': len(result.output.split()),
+                'Output': result.output
+            })
+    return rows
+
+
+def main():
+    """Run the notebook's prompt grid on FLAN-T5 and TinyLlama in batches."""
+    import argparse
+    import pandas as pd
+    from model_registry import registry
+    from summarization_prompts import PROMPTS
+
+    parser = argparse.ArgumentParser(description='Batched prompt comparison')
+    parser.add_argument('--threads', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--max-new-tokens', type=int, default=150)
+    parser.add_argument('--quantization', choices=['int8'], default=None)
+    args = parser.parse_args()
+
+    models = {'FLAN-T5': "google/flan-t5-small", 'TinyLlama': "TinyLlama/TinyLlama-1.1B-Chat-v1.0"}
+
+    runners = {}
+    for label, name in models.items():
+        tokenizer, model = registry.get(name, quantization=args.quantization)
+        runners[label] = GenerationRunner(model, tokenizer, batch_size=args.batch_size,
+                                          num_threads=args.threads)
+    registry.print_profile()
+
+    prompts = {p['name']: p['user'] for p in PROMPTS}
+    rows = compare_models(prompts, runners, max_new_tokens=args.max_new_tokens,
+                          do_sample=True, temperature=0.7, top_p=0.9)
+
+    print("\nCOMPARISON SUMMARY\n")
+    df = pd.DataFrame(rows)
+    df['Output Preview'] = df.pop('Output').str[:100] + "..."
+    print(df.to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
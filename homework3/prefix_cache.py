@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Prefix KV-Cache Reuse for Causal Generation
+
+The few-shot and chat-template prompts sent to TinyLlama share long identical
+prefixes (system message, example abstracts). Normally every generate() call
+re-encodes that prefix from scratch. PrefixCache encodes a registered prefix
+once, keeps its past_key_values in an LRU keyed by the prefix token IDs, and
+starts every later generation that begins with the same tokens from a copy of
+the cached state, so only the differing suffix is encoded.
+
+Author: NLP Course Exercise
+"""
+
+import copy
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import torch
+from transformers import DynamicCache
+
+
+class PrefixCache:
+    """LRU of past_key_values for shared prompt prefixes of one causal model."""
+
+    def __init__(self, model, tokenizer, max_entries: int = 8):
+        """
+        Initialize the cache.
+
+        Args:
+            model: Loaded causal language model (e.g. TinyLlama)
+            tokenizer: Matching tokenizer
+            max_entries: Number of prefixes kept before the least recently used is evicted
+        """
+        self.model = model.eval()
+        self.tokenizer = tokenizer
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'prefix_tokens_saved': 0}
+
+    def _encode(self, text: str) -> List[int]:
+        return self.tokenizer(text, add_special_tokens=True)['input_ids']
+
+    def add_prefix(self, prefix: str) -> Tuple[int, ...]:
+        """
+        Encode a prefix once and store its key/value state.
+
+        Args:
+            prefix: Shared prompt text, ideally ending on a whitespace or newline boundary
+
+        Returns:
+            The token-ID key under which the prefix is cached
+        """
+        key = tuple(self._encode(prefix))
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return key
+
+        with torch.inference_mode():
+            outputs = self.model(input_ids=torch.tensor([key]), past_key_values=DynamicCache(), use_cache=True)
+        self.entries[key] = outputs.past_key_values
+
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+        return key
+
+    def _longest_prefix(self, input_ids: List[int]) -> Optional[Tuple[int, ...]]:
+        """Find the longest cached prefix that is a strict prefix of input_ids."""
+        best = None
+        for key in self.entries:
+            if len(key) < len(input_ids) and tuple(input_ids[:len(key)]) == key:
+                if best is None or len(key) > len(best):
+                    best = key
+        return best
+
+    def generate(self, prompt: str, **generate_kwargs) -> Dict:
+        """
+        Generate a completion, starting from a cached prefix state when one matches.
+
+        A prefix only matches if the full prompt tokenizes to the prefix tokens
+        followed by more tokens; otherwise the prompt is encoded normally.
+
+        Args:
+            prompt: Full prompt text (cached prefix + request-specific suffix)
+            **generate_kwargs: Passed to model.generate
+
+        Returns:
+            Dictionary with the decoded output, the number of reused prefix tokens and latency
+        """
+        input_ids = self._encode(prompt)
+        key = self._longest_prefix(input_ids)
+
+        kwargs = dict(generate_kwargs)
+        kwargs.setdefault('pad_token_id', self.tokenizer.eos_token_id)
+
+        if key is not None:
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            self.stats['prefix_tokens_saved'] += len(key)
+            # generate() appends to the cache, so every request works on its own copy
+            kwargs['past_key_values'] = copy.deepcopy(self.entries[key])
+        else:
+            self.stats['misses'] += 1
+
+        ids = torch.tensor([input_ids])
+        start = time.perf_counter()
+        with torch.inference_mode():
+            output = self.model.generate(input_ids=ids, attention_mask=torch.ones_like(ids), **kwargs)
+        latency = time.perf_counter() - start
+
+        return {
+            'output': self.tokenizer.decode(output[0, len(input_ids):], skip_special_tokens=True).strip(),
+            'reused_prefix_tokens': len(key) if key else 0,
+            'prompt_tokens': len(input_ids),
+            'latency': latency
+        }
+
+
+def chat_prefix(tokenizer, system_message: str) -> str:
+    """
+    Render the part of a chat-template prompt that is shared by all user turns.
+
+    The system turn is rendered on its own (no generation prompt), so it is an
+    exact textual prefix of every conversation that starts with it.
+
+    Args:
+        tokenizer: Tokenizer with a chat template (e.g. TinyLlama-Chat)
+        system_message: Shared system instruction
+
+    Returns:
+        The rendered prefix text
+    """
+    return tokenizer.apply_chat_template([{'role': 'system', 'content': system_message}],
+                                         tokenize=False, add_generation_prompt=False)
+
+
+def main():
+    """Few-shot summarization of several abstracts with one shared, cached prefix."""
+    from transformers import AutoTokenizer, AutoModelForCausalLM
+    from summarization_prompts import PROMPTS, ABSTRACT
+
+    causal_name = "TinyLlama/TinyLlama-1.1B-Chat-v1.0"
+    tokenizer = AutoTokenizer.from_pretrained(causal_name)
+    model = AutoModelForCausalLM.from_pretrained(causal_name)
+
+    few_shot = next(p['user'] for p in PROMPTS if p['name'] == 'few-shot')
+    prefix = few_shot[:few_shot.index(ABSTRACT.strip())]
+
+    cache = PrefixCache(model, tokenizer)
+    cache.add_prefix(prefix)
+
+    abstracts = [
+        ABSTRACT.strip(),
+        "We report the discovery of a hot Jupiter orbiting a young M dwarf. "
+        "Radial velocity measurements constrain the planet's mass to 0.8 Jupiter masses.",
+    ]
+
+    for abstract in abstracts:
+        result = cache.generate(prefix + abstract + "\n\nSummary:", max_new_tokens=80, do_sample=False)
+        print(f"Reused {result['reused_prefix_tokens']} of {result['prompt_tokens']} prompt tokens "
+              f"({result['latency']:.2f}s)")
+        print(result['output'])
+        print("-" * 60)
+
+    print(f"Cache stats: {cache.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Quantized CPU Inference for the Causal and Seq2Seq Models
+
+TinyLlama-1.1B and flan-t5-small are loaded in full fp32, which is slow and
+memory-heavy on CPU-only machines. This module offers an optional int8 mode:
+
+- torch.ao dynamic quantization of every nn.Linear layer (weights stored as
+  int8, activations quantized on the fly),
+- an on-disk cache of the quantized state dict, so later loads rebuild the
+  quantized skeleton and load int8 weights directly without re-quantizing
+  (keyed by model, checkpoint revision and torch version, since the pickled
+  packed weights are only valid for the torch build that wrote them),
+- a comparison on the notebook's summarization prompts that reports memory,
+  tokens/sec and the output difference between fp32 and int8.
+
+Author: NLP Course Exercise
+"""
+
+import os
+import re
+import time
+from typing import Dict, List, Tuple
+
+import torch
+from torch.ao.quantization import quantize_dynamic
+from transformers import AutoConfig, AutoModelForCausalLM, AutoModelForSeq2SeqLM, AutoTokenizer
+try:
+    from transformers.initialization import no_init_weights
+except ImportError:
+    # transformers 4.x
+    from transformers.modeling_utils import no_init_weights
+from transformers.utils.hub import cached_file, extract_commit_hash
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'nlp-int8')
+
+
+def _model_class(model_name: str):
+    """Pick the seq2seq or causal auto class from the checkpoint's config."""
+    config = AutoConfig.from_pretrained(model_name)
+    return AutoModelForSeq2SeqLM if config.is_encoder_decoder else AutoModelForCausalLM
+
+
+def quantize_model(model):
+    """
+    Apply dynamic int8 quantization to the linear layers of a model.
+
+    Args:
+        model: fp32 model in eval mode
+
+    Returns:
+        The quantized model (a new module; the input is left untouched)
+    """
+    return quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def model_revision(model_name: str) -> str:
+    """
+    Identify the version of a checkpoint.
+
+    Args:
+        model_name: Hugging Face model name or local checkpoint directory
+
+    Returns:
+        The commit hash of the cached hub snapshot, or the latest file
+        modification time of a local directory
+    """
+    if os.path.isdir(model_name):
+        latest = max((entry.stat().st_mtime for entry in os.scandir(model_name) if entry.is_file()), default=0)
+        return f"local{int(latest)}"
+    commit_hash = extract_commit_hash(cached_file(model_name, 'config.json'), None)
+    return commit_hash[:12] if commit_hash else 'unknown'
+
+
+def _cache_path(model_name: str, cache_dir: str) -> str:
+    """Cache file of a model's int8 state dict for this checkpoint revision and torch version."""
+    safe_name = re.sub(r'[^A-Za-z0-9._-]+', '--', model_name)
+    torch_version = re.sub(r'[^A-Za-z0-9.]+', '_', torch.__version__)
+    return os.path.join(cache_dir, f"{safe_name}@{model_revision(model_name)}.torch{torch_version}.int8.pt")
+
+
+def load_quantized(model_name: str, cache_dir: str = DEFAULT_CACHE_DIR) -> Tuple[object, Dict[str, float]]:
+    """
+    Load an int8 model, reusing cached quantized weights when they exist.
+
+    On a cache miss the fp32 checkpoint is loaded, quantized and its state dict
+    saved. On a hit an uninitialized skeleton is built from the config,
+    quantized (cheap, the weights are placeholders) and the cached int8 weights
+    are loaded into it.
+
+    Args:
+        model_name: Hugging Face model name (e.g. 'google/flan-t5-small')
+        cache_dir: Directory for the quantized state dicts
+
+    Returns:
+        Tuple of (quantized model, timing dictionary)
+    """
+    model_class = _model_class(model_name)
+    path = _cache_path(model_name, cache_dir)
+    timings = {'cache_hit': os.path.exists(path)}
+
+    start = time.perf_counter()
+    if timings['cache_hit']:
+        with no_init_weights():
+            skeleton = model_class.from_config(AutoConfig.from_pretrained(model_name))
+        model = quantize_model(skeleton)
+        model.load_state_dict(torch.load(path, weights_only=False))
+        timings['load_seconds'] = time.perf_counter() - start
+    else:
+        fp32_model = model_class.from_pretrained(model_name)
+        timings['load_seconds'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        model = quantize_model(fp32_model)
+        timings['quantize_seconds'] = time.perf_counter() - start
+
+        os.makedirs(cache_dir, exist_ok=True)
+        torch.save(model.state_dict(), path)
+
+    return model.eval(), timings
+
+
+def model_size_mb(model) -> float:
+    """Size of the model's parameters and buffers, including packed int8 weights."""
+    total = sum(t.numel() * t.element_size() for t in model.state_dict().values() if isinstance(t, torch.Tensor))
+    for module in model.modules():
+        if isinstance(module, torch.ao.nn.quantized.dynamic.Linear):
+            weight, bias = module._packed_params._weight_bias()
+            total += weight.numel() * weight.element_size()
+            if bias is not None:
+                total += bias.numel() * bias.element_size()
+    return total / (1024 * 1024)
+
+
+def _lcs_f1(reference: List[str], candidate: List[str]) -> float:
+    """ROUGE-L style F1 between two word lists."""
+    if not reference or not candidate:
+        return 0.0
+    previous = [0] * (len(candidate) + 1)
+    for ref_word in reference:
+        current = [0]
+        for j, cand_word in enumerate(candidate, 1):
+            current.append(previous[j - 1] + 1 if ref_word == cand_word else max(previous[j], current[j - 1]))
+        previous = current
+    lcs = previous[-1]
+    if lcs == 0:
+        return 0.0
+    precision, recall = lcs / len(candidate), lcs / len(reference)
+    return 2 * precision * recall / (precision + recall)
+
+
+def _generate(model, tokenizer, prompt: str, max_new_tokens: int) -> Tuple[str, int, float]:
+    pad_token_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else tokenizer.eos_token_id
+    inputs = tokenizer(prompt, return_tensors='pt', max_length=512, truncation=True)
+    start = time.perf_counter()
+    with torch.inference_mode():
+        output = model.generate(**inputs, max_new_tokens=max_new_tokens, do_sample=False,
+                                pad_token_id=pad_token_id)
+    elapsed = time.perf_counter() - start
+
+    if not model.config.is_encoder_decoder:
+        output = output[:, inputs['input_ids'].shape[1]:]
+    new_tokens = int((output[0] != pad_token_id).sum())
+    return tokenizer.decode(output[0], skip_special_tokens=True).strip(), new_tokens, elapsed
+
+
+def compare_quality(model_name: str, prompts: List[Dict], max_new_tokens: int = 150,
+                    cache_dir: str = DEFAULT_CACHE_DIR) -> List[Dict]:
+    """
+    Run the prompts greedily on fp32 and int8 and report the difference.
+
+    Greedy decoding is used so that any change in the output comes from
+    quantization and not from sampling.
+
+    Args:
+        model_name: Hugging Face model name
+        prompts: Prompt dictionaries with 'name' and 'user' keys (see summarization_prompts.py)
+        max_new_tokens: Generation length per prompt
+        cache_dir: Directory for the quantized state dicts
+
+    Returns:
+        One row per prompt with tokens/sec for both modes and the ROUGE-L F1 of int8 against fp32
+    """
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    fp32_model = _model_class(model_name).from_pretrained(model_name).eval()
+    int8_model, _ = load_quantized(model_name, cache_dir)
+
+    sizes = {'fp32': model_size_mb(fp32_model), 'int8': model_size_mb(int8_model)}
+
+    rows = []
+    for prompt in prompts:
+        fp32_text, fp32_tokens, fp32_time = _generate(fp32_model, tokenizer, prompt['user'], max_new_tokens)
+        int8_text, int8_tokens, int8_time = _generate(int8_model, tokenizer, prompt['user'], max_new_tokens)
+        rows.append({
+            'Technique': prompt['name'],
+            'fp32 tokens/sec': round(fp32_tokens / fp32_time, 1) if fp32_time else 0.0,
+            'int8 tokens/sec': round(int8_tokens / int8_time, 1) if int8_time else 0.0,
+            'ROUGE-L F1 vs fp32': round(_lcs_f1(fp32_text.split(), int8_text.split()), 3),
+            'Identical': fp32_text == int8_text,
+            'fp32 MB': round(sizes['fp32'], 1),
+            'int8 MB': round(sizes['int8'], 1)
+        })
+    return rows
+
+
+def main():
+    """Report the int8 quality delta on the summarization prompts for both models."""
+    import argparse
+    import pandas as pd
+    from summarization_prompts import PROMPTS
+
+    parser = argparse.ArgumentParser(description='Dynamic int8 quantization comparison')
+    parser.add_argument('--models', nargs='*',
+                        default=["google/flan-t5-small", "TinyLlama/TinyLlama-1.1B-Chat-v1.0"])
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--max-new-tokens', type=int, default=150)
+    args = parser.parse_args()
+
+    for model_name in args.models:
+        print(f"\n{'=' * 80}")
+        print(f"{model_name}: fp32 vs dynamic int8")
+        print("=" * 80)
+        rows = compare_quality(model_name, PROMPTS, args.max_new_tokens, args.cache_dir)
+        print(pd.DataFrame(rows).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
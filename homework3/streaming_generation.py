@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Streaming Generation with Early-Stop Criteria
+
+The homework3 generation cells block until max_new_tokens (up to 400) tokens
+are produced and decode the output only at the end. stream_generate() instead
+yields decoded text pieces as soon as they are produced (built on
+TextIteratorStreamer) and stops the model itself, not just the reader, when:
+
+- a stop sequence appears in the text,
+- a word budget is reached (e.g. the 80-120 word museum label: stop at the
+  first sentence end after 80 words, hard stop at 120),
+- a sentence budget is reached (e.g. the 2-3 sentence summary),
+- the caller cancels (threading.Event, or closing the generator).
+
+Stopping works through a StoppingCriteria that the generation thread checks
+after every step, so no CPU is spent on tokens that would be thrown away.
+astream_generate() wraps the same machinery as an async iterator.
+
+Author: NLP Course Exercise
+"""
+
+import re
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator, Optional, Sequence
+
+import torch
+from transformers import StoppingCriteria, StoppingCriteriaList, TextIteratorStreamer
+
+
+SENTENCE_END = re.compile(r'[.!?](?:["\')\]]*)(?=\s)')
+
+
+@dataclass
+class Budget:
+    """Output limits checked while text is streamed."""
+    stop_sequences: Sequence[str] = ()
+    min_words: Optional[int] = None
+    max_words: Optional[int] = None
+    max_sentences: Optional[int] = None
+
+
+class _StopFlag(StoppingCriteria):
+    """Stopping criterion that the consumer side flips to end generation."""
+
+    def __init__(self, cancel_event: Optional[threading.Event] = None):
+        self.event = cancel_event or threading.Event()
+
+    def __call__(self, input_ids, scores, **kwargs) -> bool:
+        return self.event.is_set()
+
+
+def _cut_point(text: str, budget: Budget) -> Optional[int]:
+    """
+    Return the length the text should be cut to once a budget is exhausted.
+
+    Args:
+        text: All text generated so far
+        budget: Limits to check
+
+    Returns:
+        Character position to cut at, or None while generation should continue
+    """
+    cuts = []
+
+    for stop in budget.stop_sequences:
+        position = text.find(stop)
+        if position != -1:
+            cuts.append(position)
+
+    sentence_ends = [m.end() for m in SENTENCE_END.finditer(text)]
+    if budget.max_sentences and len(sentence_ends) >= budget.max_sentences:
+        cuts.append(sentence_ends[budget.max_sentences - 1])
+
+    if budget.max_words or budget.min_words:
+        words = list(re.finditer(r'\S+', text))
+        if budget.min_words and len(words) >= budget.min_words:
+            # Prefer ending on a full sentence once the minimum is met
+            min_end = words[budget.min_words - 1].end()
+            later_ends = [end for end in sentence_ends if end >= min_end]
+            if later_ends:
+                cuts.append(later_ends[0])
+        if budget.max_words and len(words) > budget.max_words:
+            cuts.append(words[budget.max_words - 1].end())
+
+    return min(cuts) if cuts else None
+
+
+def stream_generate(model, tokenizer, prompt: str, budget: Optional[Budget] = None,
+                    cancel_event: Optional[threading.Event] = None, timeout: Optional[float] = 60.0,
+                    **generate_kwargs) -> Iterator[str]:
+    """
+    Generate text and yield decoded pieces as they are produced.
+
+    Args:
+        model: Loaded seq2seq or causal language model
+        tokenizer: Matching tokenizer
+        prompt: Prompt text (already chat-formatted if needed)
+        budget: Stop sequences and word/sentence limits
+        cancel_event: Event that cancels generation when set from another thread
+        timeout: Seconds to wait for the next piece before giving up
+        **generate_kwargs: Passed to model.generate (max_new_tokens, temperature, ...)
+
+    Yields:
+        Text pieces; their concatenation is the (possibly cut) completion
+
+    Raises:
+        The exception raised by model.generate, after the pieces produced before it
+    """
+    budget = budget or Budget()
+    stop_flag = _StopFlag(cancel_event)
+
+    streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True, timeout=timeout)
+    inputs = tokenizer(prompt, return_tensors='pt')
+
+    kwargs = dict(generate_kwargs)
+    kwargs.setdefault('pad_token_id', tokenizer.pad_token_id if tokenizer.pad_token_id is not None
+                      else tokenizer.eos_token_id)
+    criteria = StoppingCriteriaList(kwargs.pop('stopping_criteria', []))
+    criteria.append(stop_flag)
+
+    errors = []
+
+    def run():
+        try:
+            with torch.inference_mode():
+                model.generate(**inputs, streamer=streamer, stopping_criteria=criteria, **kwargs)
+        except Exception as e:
+            # Hand the error to the consumer instead of leaving it waiting for the timeout
+            errors.append(e)
+            streamer.end()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+
+    emitted = 0
+    text = ''
+    ended = False
+    try:
+        for piece in streamer:
+            text += piece
+            cut = _cut_point(text, budget)
+            if cut is not None:
+                stop_flag.event.set()
+                if cut > emitted:
+                    yield text[emitted:cut]
+                break
+            if stop_flag.event.is_set():
+                break
+            # Hold back a possible partial stop sequence at the end of the text
+            safe = len(text) - max((len(s) - 1 for s in budget.stop_sequences), default=0)
+            if safe > emitted:
+                yield text[emitted:safe]
+                emitted = safe
+        else:
+            ended = True
+            if len(text) > emitted:
+                yield text[emitted:]
+    finally:
+        # Also reached when the consumer closes the generator early
+        stop_flag.event.set()
+        # Unless the streamer already delivered its end signal, read up to it so generate() is not blocked
+        if not ended:
+            try:
+                for _ in streamer:
+                    pass
+            except Exception:
+                pass
+        thread.join()
+
+    if errors:
+        raise errors[0]
+
+
+async def astream_generate(model, tokenizer, prompt: str, budget: Optional[Budget] = None,
+                           cancel_event: Optional[threading.Event] = None,
+                           **generate_kwargs) -> AsyncIterator[str]:
+    """
+    Async iterator version of stream_generate for interactive services.
+
+    Cancelling the consuming task sets the cancel event, which stops the model;
+    the generator is closed once the pending read in the executor has returned.
+
+    Args:
+        model: Loaded seq2seq or causal language model
+        tokenizer: Matching tokenizer
+        prompt: Prompt text
+        budget: Stop sequences and word/sentence limits
+        cancel_event: Optional external cancel event
+        **generate_kwargs: Passed to model.generate
+
+    Yields:
+        Decoded text pieces
+    """
+    cancel_event = cancel_event or threading.Event()
+    pieces = stream_generate(model, tokenizer, prompt, budget=budget, cancel_event=cancel_event,
+                             **generate_kwargs)
+    loop = asyncio.get_running_loop()
+    finished = object()
+    pending = None
+
+    try:
+        while True:
+            # Shielded, so a cancelled task does not abandon the read still running in its thread
+            pending = loop.run_in_executor(None, next, pieces, finished)
+            piece = await asyncio.shield(pending)
+            pending = None
+            if piece is finished:
+                break
+            yield piece
+    finally:
+        cancel_event.set()
+        if pending is not None:
+            # Closing the generator while next() runs would raise "generator already executing"
+            try:
+                await asyncio.shield(pending)
+            except Exception:
+                pass
+        await loop.run_in_executor(None, pieces.close)
+
+
+def main():
+    """Stream the museum label with an 80-120 word budget."""
+    import time
+    from model_registry import registry
+
+    causal_name = "TinyLlama/TinyLlama-1.1B-Chat-v1.0"
+    tokenizer, model = registry.get(causal_name)
+
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "You are a witty museum educator for teenagers. "
+                "Write a short museum label (80-120 words) for Van Gogh's 'Sunflowers'. "
+                "Use vivid, friendly language and include exactly one metaphor. "
+                "Output only the final label."
+            ),
+        },
+        {"role": "user", "content": "Please write the label now."},
+    ]
+    chat_prompt = tokenizer.apply_chat_template(messages, tokenize=False, add_generation_prompt=True)
+
+    start = time.perf_counter()
+    first_piece = None
+    for piece in stream_generate(model, tokenizer, chat_prompt, Budget(min_words=80, max_words=120),
+                                 max_new_tokens=400, do_sample=True, temperature=0.4, top_p=0.95):
+        if first_piece is None:
+            first_piece = time.perf_counter() - start
+        print(piece, end='', flush=True)
+
+    print(f"\n\nFirst text after {first_piece:.2f}s, done after {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
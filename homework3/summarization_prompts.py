@@ -0,0 +1,85 @@
+"""
+Summarization Prompts from the Prompt-Engineering Exercise
+
+The astronomy ABSTRACT and the five prompting techniques (zero-shot, few-shot,
+chain-of-thought, role-based, structured) used in the homework3 notebook, so
+that scripts can run the same prompt grid outside the notebook.
+"""
+
+ABSTRACT = """
+We present observations of the young stellar object (YSO) IRAS 16293-2422
+using the Atacama Large Millimeter Array. The observations reveal complex
+organic molecules in the protostellar envelope, including glycolaldehyde
+and ethylene glycol. These sugar-related molecules are found at temperatures
+of ~100 K, suggesting they formed on dust grain surfaces and were released
+into the gas phase as the grains warmed. The detection of these molecules
+in a solar-type protostar supports the hypothesis that complex organic
+chemistry occurs early in star formation and may seed planetary systems
+with prebiotic molecules.
+"""
+
+TASK = f"Summarize this astronomical research abstract:\n\n{ABSTRACT.strip()}"
+
+PROMPTS = [
+    {
+        "name": "zero-shot",
+        "description": "Direct instruction with no examples or additional context",
+        "user": TASK + "\n\nProvide a 2-3 sentence summary:"
+    },
+    {
+        "name": "few-shot",
+        "description": "Learning from examples before attempting the task",
+        "user": """Summarize scientific abstracts concisely.
+
+Example 1:
+Abstract: "Black holes are regions of spacetime where gravity is so strong that nothing can escape. Recent observations of the black hole in galaxy M87 confirmed Einstein's predictions about their properties."
+Summary: "Observations of M87's black hole confirmed Einstein's predictions about these regions where gravity prevents anything from escaping."
+
+Example 2:
+Abstract: "Climate models predict global temperature increases of 1.5-2°C by 2050 under current emission scenarios. This warming will cause sea level rise, extreme weather, and ecosystem disruption."
+Summary: "Models predict 1.5-2°C warming by 2050, leading to sea level rise and ecosystem changes."
+
+Now summarize this abstract:
+""" + ABSTRACT.strip() + "\n\nSummary:"
+    },
+    {
+        "name": "chain-of-thought",
+        "description": "Step-by-step reasoning before final answer",
+        "user": """Read this scientific abstract and summarize it step-by-step:
+
+""" + ABSTRACT.strip() + """
+
+Let's approach this systematically:
+1. First, identify the main subject and what was studied.
+2. Second, identify the key findings or observations.
+3. Third, explain the significance or implications.
+4. Finally, write a concise 2-sentence summary combining these points.
+
+Step-by-step analysis and summary:"""
+    },
+    {
+        "name": "role-based",
+        "description": "Assigning a specific role/persona to influence style",
+        "user": """You are a science journalist writing for a general audience magazine. Your job is to make complex research accessible and engaging to non-experts.
+
+Scientific Abstract:
+""" + ABSTRACT.strip() + """
+
+Write a brief 2-3 sentence summary that a high school student could understand, while keeping the key scientific findings. Make it engaging but accurate:"""
+    },
+    {
+        "name": "structured",
+        "description": "Requesting specific output format",
+        "user": """Analyze this scientific abstract and provide a structured summary:
+
+""" + ABSTRACT.strip() + """
+
+Format your response as follows:
+- Subject: [What was studied]
+- Method: [How it was studied]
+- Key Findings: [Main discoveries]
+- Significance: [Why it matters]
+
+Structured Summary:"""
+    }
+]
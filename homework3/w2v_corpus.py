@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Cached Corpus Preprocessing for Word2Vec Training
+
+The astro and medline models in the homework3 notebook are trained from
+LineSentence('astro_norm.txt') / LineSentence('medline_norm.txt'), which re-reads
+and re-splits the text for every epoch and every hyperparameter configuration.
+
+This module tokenizes a normalized corpus once into a compact binary cache:
+
+    vocab.txt     - one "word<TAB>count" line per type, line number = token ID
+    tokens.u32    - the whole corpus as a flat uint32 token-ID stream
+    offsets.u64   - sentence boundaries into tokens.u32 (n_sentences + 1 entries)
+    meta.json     - sizes and the source fingerprint used for invalidation
+
+The cache is memory-mapped on load and can feed gensim either through a fast
+in-memory iterable (CachedCorpus) or through the corpus_file path, which lets
+gensim's Cython workers read the corpus directly and use all cores without the
+Python iterator bottleneck.
+
+Author: NLP Course Exercise
+"""
+
+import os
+import json
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+# Same limit gensim's LineSentence uses to split overly long lines
+MAX_SENTENCE_LENGTH = 10000
+
+# Number of token IDs buffered in memory before they are flushed to disk
+FLUSH_EVERY = 1000000
+
+VOCAB_FILE = 'vocab.txt'
+TOKENS_FILE = 'tokens.u32'
+OFFSETS_FILE = 'offsets.u64'
+META_FILE = 'meta.json'
+CORPUS_FILE = 'corpus.txt'
+
+
+def source_fingerprint(path: str) -> Dict[str, float]:
+    """
+    Describe a source file well enough to notice when it changes.
+
+    Args:
+        path: Path to the source text file
+
+    Returns:
+        Dictionary with the absolute path, size and modification time
+    """
+    stat = os.stat(path)
+    return {
+        'path': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime
+    }
+
+
+def build_corpus_cache(source_path: str, cache_dir: str,
+                       max_sentence_length: int = MAX_SENTENCE_LENGTH) -> Dict:
+    """
+    Tokenize a LineSentence-style text file once into the binary cache format.
+
+    Tokenization matches LineSentence: every line is split on whitespace and
+    lines longer than max_sentence_length tokens are cut into several sentences.
+
+    Args:
+        source_path: Path to the normalized corpus (one sentence per line)
+        cache_dir: Directory that receives the cache files
+        max_sentence_length: Maximum number of tokens per sentence
+
+    Returns:
+        The metadata dictionary written to meta.json
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+
+    word_to_id = {}
+    counts = []
+    offsets = [0]
+    buffer = []
+    total_tokens = 0
+
+    start_time = time.time()
+
+    with open(source_path, 'r', encoding='utf-8', errors='ignore') as source, \
+            open(os.path.join(cache_dir, TOKENS_FILE), 'wb') as tokens_out:
+        for line in source:
+            words = line.split()
+            for i in range(0, len(words), max_sentence_length):
+                for word in words[i:i + max_sentence_length]:
+                    word_id = word_to_id.get(word)
+                    if word_id is None:
+                        word_id = len(counts)
+                        word_to_id[word] = word_id
+                        counts.append(0)
+                    counts[word_id] += 1
+                    buffer.append(word_id)
+
+                total_tokens += min(max_sentence_length, len(words) - i)
+                offsets.append(total_tokens)
+
+            if len(buffer) >= FLUSH_EVERY:
+                np.asarray(buffer, dtype=np.uint32).tofile(tokens_out)
+                buffer = []
+
+        if buffer:
+            np.asarray(buffer, dtype=np.uint32).tofile(tokens_out)
+
+    np.asarray(offsets, dtype=np.uint64).tofile(os.path.join(cache_dir, OFFSETS_FILE))
+
+    with open(os.path.join(cache_dir, VOCAB_FILE), 'w', encoding='utf-8') as vocab_out:
+        vocab_out.writelines(f"{word}\t{count}\n" for word, count in zip(word_to_id, counts))
+
+    meta = {
+        'source': source_fingerprint(source_path),
+        'vocab_size': len(counts),
+        'n_tokens': total_tokens,
+        'n_sentences': len(offsets) - 1,
+        'max_sentence_length': max_sentence_length,
+        'build_seconds': round(time.time() - start_time, 2)
+    }
+
+    with open(os.path.join(cache_dir, META_FILE), 'w', encoding='utf-8') as meta_out:
+        json.dump(meta, meta_out, indent=2)
+
+    return meta
+
+
+class CachedCorpus:
+    """Memory-mapped view of a preprocessed corpus that iterates like LineSentence."""
+
+    def __init__(self, cache_dir: str):
+        """
+        Open an existing corpus cache.
+
+        Args:
+            cache_dir: Directory created by build_corpus_cache
+        """
+        self.cache_dir = cache_dir
+
+        with open(os.path.join(cache_dir, META_FILE), 'r', encoding='utf-8') as f:
+            self.meta = json.load(f)
+
+        words = []
+        counts = []
+        with open(os.path.join(cache_dir, VOCAB_FILE), 'r', encoding='utf-8') as f:
+            for line in f:
+                word, count = line.rstrip('\n').rsplit('\t', 1)
+                words.append(word)
+                counts.append(int(count))
+
+        # Object array so a whole sentence can be mapped back to strings with one fancy-index
+        self.words = np.array(words, dtype=object)
+        self.counts = np.array(counts, dtype=np.int64)
+
+        self.tokens = self._memmap(TOKENS_FILE, np.uint32, self.meta['n_tokens'])
+        self.offsets = self._memmap(OFFSETS_FILE, np.uint64, self.meta['n_sentences'] + 1)
+
+    def _memmap(self, filename: str, dtype, length: int) -> np.ndarray:
+        """Map a raw binary array file, tolerating empty corpora."""
+        if length == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(os.path.join(self.cache_dir, filename), dtype=dtype, mode='r', shape=(length,))
+
+    @property
+    def n_sentences(self) -> int:
+        return self.meta['n_sentences']
+
+    @property
+    def n_tokens(self) -> int:
+        return self.meta['n_tokens']
+
+    def __len__(self) -> int:
+        return self.n_sentences
+
+    def __iter__(self) -> Iterator[List[str]]:
+        """Yield every sentence as a list of tokens, exactly like LineSentence."""
+        offsets = np.asarray(self.offsets, dtype=np.int64)
+        for i in range(self.n_sentences):
+            yield self.words[self.tokens[offsets[i]:offsets[i + 1]]].tolist()
+
+    def word_freq(self) -> Dict[str, int]:
+        """Return the raw word counts, suitable for Word2Vec.build_vocab_from_freq."""
+        return dict(zip(self.words.tolist(), self.counts.tolist()))
+
+    def export_corpus_file(self, path: Optional[str] = None) -> str:
+        """
+        Write the cached corpus as a clean LineSentence file for gensim's corpus_file mode.
+
+        The export is reused as long as it is newer than the cache itself.
+
+        Args:
+            path: Output path (defaults to corpus.txt inside the cache directory)
+
+        Returns:
+            Path to the exported file
+        """
+        path = path or os.path.join(self.cache_dir, CORPUS_FILE)
+        tokens_path = os.path.join(self.cache_dir, TOKENS_FILE)
+
+        if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(tokens_path):
+            return path
+
+        with open(path, 'w', encoding='utf-8') as out:
+            batch = []
+            for sentence in self:
+                batch.append(' '.join(sentence))
+                if len(batch) >= 10000:
+                    out.write('\n'.join(batch) + '\n')
+                    batch = []
+            if batch:
+                out.write('\n'.join(batch) + '\n')
+
+        return path
+
+
+def load_or_build_cache(source_path: str, cache_dir: Optional[str] = None) -> CachedCorpus:
+    """
+    Open the cache for a corpus, rebuilding it only when the source file changed.
+
+    Args:
+        source_path: Path to the normalized corpus (e.g. 'astro_norm.txt')
+        cache_dir: Cache directory (defaults to '<source>.cache' next to the source)
+
+    Returns:
+        CachedCorpus for the source file
+    """
+    cache_dir = cache_dir or source_path + '.cache'
+    meta_path = os.path.join(cache_dir, META_FILE)
+
+    if os.path.exists(meta_path):
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('source') == source_fingerprint(source_path):
+            return CachedCorpus(cache_dir)
+
+    print(f"Building corpus cache for {source_path}...")
+    meta = build_corpus_cache(source_path, cache_dir)
+    print(f"  {meta['n_tokens']:,} tokens, {meta['n_sentences']:,} sentences, "
+          f"{meta['vocab_size']:,} types in {meta['build_seconds']}s")
+
+    return CachedCorpus(cache_dir)
+
+
+def _epoch_logger(workers: int, stats: List[Dict]):
+    """Create a gensim callback that records throughput for every epoch."""
+    from gensim.models.callbacks import CallbackAny2Vec
+
+    class EpochThroughput(CallbackAny2Vec):
+        def __init__(self):
+            self.epoch = 0
+            self.start = None
+
+        def on_epoch_begin(self, model):
+            self.start = time.time()
+
+        def on_epoch_end(self, model):
+            elapsed = time.time() - self.start
+            words = model.corpus_total_words
+            stats.append({
+                'epoch': self.epoch,
+                'seconds': round(elapsed, 2),
+                'words_per_sec': round(words / elapsed) if elapsed else 0,
+                'words_per_sec_per_worker': round(words / elapsed / workers) if elapsed else 0
+            })
+            self.epoch += 1
+
+    return EpochThroughput()
+
+
+def train_word2vec(corpus: CachedCorpus, mode: str = 'corpus_file', workers: int = 4,
+                   **params) -> Tuple[object, Dict]:
+    """
+    Train a Word2Vec model from a corpus cache.
+
+    The vocabulary is built from the cached counts, so the corpus is never scanned
+    just to count words.
+
+    Args:
+        corpus: Opened CachedCorpus
+        mode: 'corpus_file' (gensim reads the exported file with all workers)
+              or 'iterable' (sentences come from the memory-mapped cache)
+        workers: Number of gensim worker threads
+        **params: Word2Vec hyperparameters (vector_size, window, min_count, sg, negative, epochs, ...)
+
+    Returns:
+        Tuple of (trained model, training report with words/sec per worker)
+    """
+    from gensim.models.word2vec import Word2Vec
+
+    if mode not in ('corpus_file', 'iterable'):
+        raise ValueError(f"Unknown training mode: {mode}")
+
+    epochs = params.pop('epochs', 5)
+    model = Word2Vec(workers=workers, epochs=epochs, **params)
+    model.build_vocab_from_freq(corpus.word_freq(), corpus_count=corpus.n_sentences)
+    # build_vocab_from_freq leaves this at 0; corpus_file training and the epoch logger need it
+    model.corpus_total_words = corpus.n_tokens
+
+    epoch_stats = []
+    callbacks = [_epoch_logger(workers, epoch_stats)]
+
+    start_time = time.time()
+    if mode == 'corpus_file':
+        trained_words, raw_words = model.train(
+            corpus_file=corpus.export_corpus_file(),
+            total_words=corpus.n_tokens,
+            epochs=epochs,
+            callbacks=callbacks
+        )
+    else:
+        trained_words, raw_words = model.train(
+            corpus_iterable=corpus,
+            total_examples=corpus.n_sentences,
+            epochs=epochs,
+            callbacks=callbacks
+        )
+    training_time = time.time() - start_time
+
+    report = {
+        'mode': mode,
+        'workers': workers,
+        'training_time': round(training_time, 2),
+        'raw_words': raw_words,
+        'effective_words': trained_words,
+        'words_per_sec': round(raw_words / training_time) if training_time else 0,
+        'words_per_sec_per_worker': round(raw_words / training_time / workers) if training_time else 0,
+        'epochs': epoch_stats
+    }
+
+    return model, report
+
+
+def print_training_report(report: Dict) -> None:
+    """Print the throughput numbers collected by train_word2vec."""
+    print(f"Mode: {report['mode']} | Workers: {report['workers']}")
+    print(f"Training time: {report['training_time']:.2f} seconds")
+    print(f"Raw words processed: {report['raw_words']:,} ({report['effective_words']:,} effective)")
+    print(f"Words/sec: {report['words_per_sec']:,} | per worker: {report['words_per_sec_per_worker']:,}")
+    for epoch in report['epochs']:
+        print(f"  Epoch {epoch['epoch'] + 1}: {epoch['seconds']:.2f}s, "
+              f"{epoch['words_per_sec_per_worker']:,} words/sec per worker")
+
+
+def main():
+    """Build (or reuse) the cache for the astro corpus and train the baseline model."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Cached Word2Vec training')
+    parser.add_argument('source', nargs='?', default='astro_norm.txt', help='Normalized corpus file')
+    parser.add_argument('--cache-dir', default=None, help='Cache directory (default: <source>.cache)')
+    parser.add_argument('--mode', choices=['corpus_file', 'iterable'], default='corpus_file')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 4)
+    args = parser.parse_args()
+
+    print("Cached Word2Vec Training")
+    print("=" * 60)
+    print(f"Corpus: {args.source}")
+
+    corpus = load_or_build_cache(args.source, args.cache_dir)
+
+    # Baseline configuration from Exercise 2.2.1
+    model, report = train_word2vec(
+        corpus, mode=args.mode, workers=args.workers,
+        vector_size=100, window=5, min_count=5, sg=0, negative=5, epochs=5
+    )
+    print_training_report(report)
+
+    if 'young' in model.wv:
+        print("\nMost similar to 'young':")
+        for word, score in model.wv.most_similar('young'):
+            print(f"  {word:<20} {score:.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Incremental Word2Vec Updates with Versioned Snapshots
+
+The astro and medline models are normally trained from scratch on the full
+normalized file, which takes up to half an hour for medline. This module
+refreshes an existing model with a batch of newly arriving sentences instead:
+
+1. load the latest snapshot of the model,
+2. extend its vocabulary with build_vocab(update=True),
+3. continue training on the new sentences only, with a decaying learning-rate
+   schedule so later updates move the vectors less,
+4. save the result as a new numbered snapshot with a manifest entry.
+
+Snapshot layout:
+
+    <snapshot_dir>/manifest.json
+    <snapshot_dir>/v0001/model      (the bootstrap model)
+    <snapshot_dir>/v0002/model      (first incremental update)
+    ...
+
+Author: NLP Course Exercise
+"""
+
+import os
+import json
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from gensim.models.word2vec import LineSentence, Word2Vec
+
+
+MANIFEST_FILE = 'manifest.json'
+MODEL_FILE = 'model'
+
+
+class LearningRateSchedule:
+    """Chooses start/end learning rates for every incremental update."""
+
+    def __init__(self, start_alpha: float = 0.025, min_alpha: float = 0.0001, decay: float = 0.5,
+                 floor_alpha: float = 0.0025):
+        """
+        Initialize the schedule.
+
+        Args:
+            start_alpha: Learning rate of the original from-scratch training
+            min_alpha: Learning rate every update decays to by its last epoch
+            decay: Factor applied to the starting rate for every further update
+            floor_alpha: Lowest starting rate an update is allowed to use
+        """
+        self.start_alpha = start_alpha
+        self.min_alpha = min_alpha
+        self.decay = decay
+        self.floor_alpha = floor_alpha
+
+    def alphas_for_update(self, update_number: int) -> Dict[str, float]:
+        """
+        Return the learning rates for the n-th incremental update (1-based).
+
+        Args:
+            update_number: Number of the update since the bootstrap model
+
+        Returns:
+            Dictionary with start_alpha and end_alpha
+        """
+        start = max(self.floor_alpha, self.start_alpha * (self.decay ** update_number))
+        return {'start_alpha': start, 'end_alpha': min(self.min_alpha, start)}
+
+
+class IncrementalWord2Vec:
+    """Applies delta training to a Word2Vec model and versions the snapshots."""
+
+    def __init__(self, snapshot_dir: str, schedule: Optional[LearningRateSchedule] = None):
+        """
+        Initialize the updater.
+
+        Args:
+            snapshot_dir: Directory holding the manifest and all model versions
+            schedule: Learning-rate schedule for updates (defaults to LearningRateSchedule())
+        """
+        self.snapshot_dir = snapshot_dir
+        self.schedule = schedule or LearningRateSchedule()
+        self.manifest = self._load_manifest()
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.snapshot_dir, MANIFEST_FILE)
+
+    def _load_manifest(self) -> Dict:
+        if os.path.exists(self._manifest_path()):
+            with open(self._manifest_path(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return {'latest': None, 'versions': []}
+
+    def _save_manifest(self) -> None:
+        # Write to a temporary file first so a crash never leaves a half-written manifest
+        tmp_path = self._manifest_path() + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self._manifest_path())
+
+    def _version_path(self, version: int) -> str:
+        return os.path.join(self.snapshot_dir, f"v{version:04d}", MODEL_FILE)
+
+    def _save_version(self, model: Word2Vec, entry: Dict) -> Dict:
+        """Store a model as the next version and record it in the manifest."""
+        version = (self.manifest['latest'] or 0) + 1
+        path = self._version_path(version)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        model.save(path)
+
+        entry = dict(entry, version=version, path=path,
+                     created=datetime.now().isoformat(timespec='seconds'),
+                     vocab_size=len(model.wv))
+        self.manifest['versions'].append(entry)
+        self.manifest['latest'] = version
+        self._save_manifest()
+
+        return entry
+
+    def bootstrap(self, model: Word2Vec, description: str = 'from-scratch training') -> Dict:
+        """
+        Register a fully trained model as the first snapshot.
+
+        Args:
+            model: Model trained on the full normalized corpus
+            description: Free-text note stored in the manifest
+
+        Returns:
+            Manifest entry of the new version
+        """
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        return self._save_version(model, {'parent': None, 'description': description})
+
+    def load(self, version: Optional[int] = None) -> Word2Vec:
+        """
+        Load a snapshot (the latest one by default).
+
+        Args:
+            version: Version number to load
+
+        Returns:
+            The stored Word2Vec model
+        """
+        version = version or self.manifest['latest']
+        if version is None:
+            raise FileNotFoundError(f"No snapshots found in {self.snapshot_dir}; call bootstrap() first")
+        return Word2Vec.load(self._version_path(version))
+
+    def update(self, sentences: Iterable[List[str]], epochs: Optional[int] = None,
+               description: str = 'incremental update') -> Dict:
+        """
+        Continue training the latest snapshot on a batch of new sentences.
+
+        Args:
+            sentences: Re-iterable collection of tokenized sentences (list or LineSentence)
+            epochs: Passes over the new batch (defaults to the model's own epochs)
+            description: Free-text note stored in the manifest
+
+        Returns:
+            Manifest entry of the new version, including training statistics
+        """
+        parent = self.manifest['latest']
+        model = self.load(parent)
+
+        vocab_before = len(model.wv)
+        start_time = time.time()
+
+        model.build_vocab(sentences, update=True)
+        new_examples = model.corpus_count
+        new_words = model.corpus_total_words
+
+        update_number = len(self.manifest['versions'])
+        alphas = self.schedule.alphas_for_update(update_number)
+        epochs = epochs or model.epochs
+
+        model.train(
+            sentences,
+            total_examples=new_examples,
+            epochs=epochs,
+            start_alpha=alphas['start_alpha'],
+            end_alpha=alphas['end_alpha']
+        )
+
+        training_time = time.time() - start_time
+
+        return self._save_version(model, {
+            'parent': parent,
+            'description': description,
+            'new_sentences': new_examples,
+            'new_words': new_words,
+            'added_types': len(model.wv) - vocab_before,
+            'epochs': epochs,
+            'start_alpha': alphas['start_alpha'],
+            'end_alpha': alphas['end_alpha'],
+            'training_time': round(training_time, 2)
+        })
+
+    def update_from_file(self, path: str, epochs: Optional[int] = None) -> Dict:
+        """Convenience wrapper: update from a LineSentence-format file of new text."""
+        return self.update(LineSentence(path), epochs=epochs,
+                           description=f"incremental update from {os.path.basename(path)}")
+
+
+def main():
+    """Nightly refresh: bootstrap once from the full corpus, then apply delta files."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Incremental Word2Vec updates')
+    parser.add_argument('snapshot_dir', help='Directory with the versioned model snapshots')
+    parser.add_argument('--bootstrap', help='Full normalized corpus used to train the first version')
+    parser.add_argument('--delta', nargs='*', default=[], help='Files of new sentences to train on')
+    parser.add_argument('--epochs', type=int, default=None)
+    args = parser.parse_args()
+
+    updater = IncrementalWord2Vec(args.snapshot_dir)
+
+    if args.bootstrap:
+        print(f"Training bootstrap model on {args.bootstrap}...")
+        start_time = time.time()
+        model = Word2Vec(sentences=LineSentence(args.bootstrap), vector_size=100, window=5,
+                         min_count=5, sg=0, negative=5, workers=4, epochs=5)
+        print("--- %s seconds ---" % (time.time() - start_time))
+        entry = updater.bootstrap(model, description=f"trained on {os.path.basename(args.bootstrap)}")
+        print(f"Saved version {entry['version']} ({entry['vocab_size']:,} words)")
+
+    for delta_path in args.delta:
+        entry = updater.update_from_file(delta_path, epochs=args.epochs)
+        print(f"Version {entry['version']} from {delta_path}: "
+              f"{entry['new_sentences']:,} sentences, +{entry['added_types']:,} types, "
+              f"alpha {entry['start_alpha']:.4f} -> {entry['end_alpha']:.4f}, "
+              f"{entry['training_time']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Parallel Word2Vec Hyperparameter Sweep
+
+Runs the Exercise 2.2 configuration grid (Baseline CBOW, Skip-gram, 300d, 50d,
+window sizes, min_count, epochs) concurrently instead of one after another.
+
+- The corpus is tokenized and counted once (see w2v_corpus.py); every config
+  builds its vocabulary from those shared counts instead of rescanning the text.
+- Configs are scheduled on a process pool sized from a CPU budget:
+  pool processes x threads per model <= cpu_budget.
+- Every trained model is checkpointed with the corpus it was trained on, so an
+  interrupted sweep resumes where it stopped and a changed corpus is retrained.
+- A failing configuration is reported as a row with its error instead of
+  being dropped from the table.
+- Training time, peak memory and nearest-neighbour quality are collected into
+  one results table.
+
+Author: NLP Course Exercise
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import resource
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from w2v_corpus import CachedCorpus, load_or_build_cache, train_word2vec
+
+
+DEFAULT_CONFIGS = [
+    {'name': 'Baseline (CBOW)', 'vector_size': 100, 'window': 5, 'min_count': 5, 'sg': 0, 'negative': 5, 'epochs': 5},
+    {'name': 'Skip-gram', 'vector_size': 100, 'window': 5, 'min_count': 5, 'sg': 1, 'negative': 5, 'epochs': 5},
+    {'name': 'Large vectors (300d)', 'vector_size': 300, 'window': 5, 'min_count': 5, 'sg': 0, 'negative': 5, 'epochs': 5},
+    {'name': 'Small vectors (50d)', 'vector_size': 50, 'window': 5, 'min_count': 5, 'sg': 0, 'negative': 5, 'epochs': 5},
+    {'name': 'Large window (10)', 'vector_size': 100, 'window': 10, 'min_count': 5, 'sg': 0, 'negative': 5, 'epochs': 5},
+    {'name': 'Small window (2)', 'vector_size': 100, 'window': 2, 'min_count': 5, 'sg': 0, 'negative': 5, 'epochs': 5},
+    {'name': 'Low min_count (2)', 'vector_size': 100, 'window': 5, 'min_count': 2, 'sg': 0, 'negative': 5, 'epochs': 5},
+    {'name': 'More epochs (10)', 'vector_size': 100, 'window': 5, 'min_count': 5, 'sg': 0, 'negative': 5, 'epochs': 10}
+]
+
+TEST_PAIRS = [
+    ('star', 'galaxy'),
+    ('hot', 'cold'),
+    ('young', 'old'),
+    ('large', 'massive'),
+    ('disk', 'accretion')
+]
+
+NEIGHBOUR_WORDS = ['young', 'star']
+
+
+def config_slug(name: str) -> str:
+    """Turn a configuration name into a file-system friendly checkpoint name."""
+    return re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_')
+
+
+def corpus_key(corpus: CachedCorpus) -> Dict:
+    """Identify the corpus a checkpoint was trained on (source file size/mtime and token count)."""
+    return {**corpus.meta['source'], 'n_tokens': corpus.n_tokens}
+
+
+def evaluate_model(model) -> Dict:
+    """
+    Score a trained model with the notebook's similarity and analogy checks.
+
+    Args:
+        model: Trained gensim Word2Vec model
+
+    Returns:
+        Dictionary with average pair similarity, analogy rank and nearest neighbours
+    """
+    similarities = [model.wv.similarity(w1, w2) for w1, w2 in TEST_PAIRS
+                    if w1 in model.wv and w2 in model.wv]
+    avg_similarity = sum(similarities) / len(similarities) if similarities else None
+
+    analogy_rank = None
+    if all(w in model.wv for w in ['hot', 'cold', 'young', 'old']):
+        analogy_words = [w for w, _ in model.wv.most_similar(positive=['cold', 'young'], negative=['hot'], topn=10)]
+        if 'old' in analogy_words:
+            analogy_rank = analogy_words.index('old') + 1
+
+    neighbours = {}
+    for word in NEIGHBOUR_WORDS:
+        if word in model.wv:
+            neighbours[word] = [w for w, _ in model.wv.most_similar(word, topn=5)]
+
+    return {
+        'avg_similarity': round(float(avg_similarity), 4) if avg_similarity is not None else None,
+        'analogy_rank': analogy_rank,
+        'neighbours': neighbours
+    }
+
+
+def run_config(config: Dict, cache_dir: str, output_dir: str, threads: int, mode: str) -> Dict:
+    """
+    Train, checkpoint and evaluate a single configuration (runs inside a pool process).
+
+    Args:
+        config: Configuration dictionary (name plus Word2Vec hyperparameters)
+        cache_dir: Directory of the shared corpus cache
+        output_dir: Directory that receives model checkpoints and per-config results
+        threads: Number of gensim worker threads for this model
+        mode: Training mode passed to train_word2vec
+
+    Returns:
+        Result row for the summary table
+    """
+    corpus = CachedCorpus(cache_dir)
+
+    params = {k: v for k, v in config.items() if k != 'name'}
+    model, report = train_word2vec(corpus, mode=mode, workers=threads, **params)
+
+    slug = config_slug(config['name'])
+    model_path = os.path.join(output_dir, f"{slug}.model")
+    model.save(model_path)
+
+    quality = evaluate_model(model)
+
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak_rss / (1024 * 1024) if os.uname().sysname == 'Darwin' else peak_rss / 1024
+
+    row = {
+        'Configuration': config['name'],
+        'Vector Size': config['vector_size'],
+        'Window': config['window'],
+        'Min Count': config['min_count'],
+        'Algorithm': 'Skip-gram' if config['sg'] == 1 else 'CBOW',
+        'Epochs': config['epochs'],
+        'Threads': threads,
+        'Training Time (s)': report['training_time'],
+        'Words/sec/worker': report['words_per_sec_per_worker'],
+        'Peak Memory (MB)': round(peak_mb, 1),
+        'Vocab Size': len(model.wv),
+        'Avg Similarity': quality['avg_similarity'],
+        'Analogy Rank': quality['analogy_rank'] if quality['analogy_rank'] else '>10',
+        'Neighbours': quality['neighbours'],
+        'Checkpoint': model_path,
+        'Corpus': corpus_key(corpus)
+    }
+
+    with open(os.path.join(output_dir, f"{slug}.json"), 'w', encoding='utf-8') as f:
+        json.dump(row, f, indent=2, ensure_ascii=False)
+
+    return row
+
+
+class Word2VecSweep:
+    """Schedules Word2Vec configurations across a process pool with a CPU budget."""
+
+    def __init__(self, source_path: str, output_dir: str, configs: Optional[List[Dict]] = None,
+                 cpu_budget: Optional[int] = None, threads_per_model: int = 2,
+                 mode: str = 'corpus_file'):
+        """
+        Initialize the sweep.
+
+        Args:
+            source_path: Normalized corpus (e.g. 'astro_norm.txt')
+            output_dir: Directory for checkpoints and the results table
+            configs: Configurations to train (defaults to the notebook grid)
+            cpu_budget: Total number of cores the sweep may use (defaults to all)
+            threads_per_model: gensim worker threads given to every model
+            mode: 'corpus_file' or 'iterable' (see w2v_corpus.train_word2vec)
+        """
+        self.source_path = source_path
+        self.output_dir = output_dir
+        self.configs = configs or DEFAULT_CONFIGS
+        self.cpu_budget = cpu_budget or os.cpu_count() or 4
+        self.threads_per_model = max(1, min(threads_per_model, self.cpu_budget))
+        self.mode = mode
+
+        # Pool processes x threads per model never exceeds the CPU budget
+        self.pool_size = max(1, self.cpu_budget // self.threads_per_model)
+        self.wall_clock = None
+
+    def _load_checkpoint(self, config: Dict, corpus: Dict) -> Optional[Dict]:
+        """Return the stored result of a configuration already trained on this corpus, if any."""
+        slug = config_slug(config['name'])
+        result_path = os.path.join(self.output_dir, f"{slug}.json")
+        model_path = os.path.join(self.output_dir, f"{slug}.model")
+
+        if os.path.exists(result_path) and os.path.exists(model_path):
+            with open(result_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            # A checkpoint of an older version of the corpus is retrained
+            if cached.get('Corpus') == corpus:
+                return cached
+        return None
+
+    def run(self) -> pd.DataFrame:
+        """
+        Run every configuration that has no checkpoint yet.
+
+        Returns:
+            DataFrame with one row per configuration, in the original config order;
+            configurations that failed only have 'Configuration' and 'Error'
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+
+        # Tokenize and count once; every pool process memory-maps the same cache
+        corpus = load_or_build_cache(self.source_path)
+        if self.mode == 'corpus_file':
+            corpus.export_corpus_file()
+        key = corpus_key(corpus)
+
+        rows = {}
+        pending = []
+        for config in self.configs:
+            cached = self._load_checkpoint(config, key)
+            if cached:
+                print(f"  Reusing checkpoint for {config['name']}")
+                rows[config['name']] = cached
+            else:
+                pending.append(config)
+
+        print(f"Training {len(pending)} configurations on {self.pool_size} processes "
+              f"x {self.threads_per_model} threads (CPU budget {self.cpu_budget})")
+
+        start_time = time.time()
+
+        # A fresh process per config keeps the peak-memory measurement per model
+        pool_kwargs = {'max_workers': self.pool_size}
+        if sys.version_info >= (3, 11):
+            pool_kwargs['max_tasks_per_child'] = 1
+
+        with ProcessPoolExecutor(**pool_kwargs) as pool:
+            futures = {
+                pool.submit(run_config, config, corpus.cache_dir, self.output_dir,
+                            self.threads_per_model, self.mode): config
+                for config in pending
+            }
+            for future in as_completed(futures):
+                config = futures[future]
+                try:
+                    rows[config['name']] = future.result()
+                    print(f"  Finished {config['name']} "
+                          f"({rows[config['name']]['Training Time (s)']:.2f}s)")
+                except Exception as e:
+                    print(f"  Error training {config['name']}: {e}")
+                    rows[config['name']] = {'Configuration': config['name'], 'Error': f"{type(e).__name__}: {e}"}
+
+        self.wall_clock = time.time() - start_time
+        print(f"Sweep wall-clock time: {self.wall_clock:.2f} seconds")
+
+        results = pd.DataFrame([rows[c['name']] for c in self.configs if c['name'] in rows])
+        results.to_csv(os.path.join(self.output_dir, 'sweep_results.csv'), index=False)
+
+        return results
+
+
+def main():
+    """Run the notebook's configuration grid as a parallel sweep."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Parallel Word2Vec hyperparameter sweep')
+    parser.add_argument('source', nargs='?', default='astro_norm.txt', help='Normalized corpus file')
+    parser.add_argument('--output-dir', default='w2v_sweep')
+    parser.add_argument('--cpu-budget', type=int, default=None)
+    parser.add_argument('--threads-per-model', type=int, default=2)
+    parser.add_argument('--mode', choices=['corpus_file', 'iterable'], default='corpus_file')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("TRAINING AND EVALUATING DIFFERENT WORD2VEC CONFIGURATIONS")
+    print("=" * 80)
+
+    sweep = Word2VecSweep(args.source, args.output_dir, cpu_budget=args.cpu_budget,
+                          threads_per_model=args.threads_per_model, mode=args.mode)
+    results = sweep.run()
+
+    print("\n" + "=" * 80)
+    print("SUMMARY OF RESULTS")
+    print("=" * 80)
+    failed = results[results['Error'].notna()] if 'Error' in results else results.iloc[0:0]
+    trained = results.drop(failed.index)
+    if trained.empty:
+        print("No configuration was trained.")
+    else:
+        columns = ['Neighbours', 'Checkpoint', 'Corpus', 'Error']
+        print(trained.drop(columns=columns, errors='ignore').to_string(index=False))
+
+    if not failed.empty:
+        print(f"\n{len(failed)} configuration(s) failed:")
+        for _, row in failed.iterrows():
+            print(f"  {row['Configuration']}: {row['Error']}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
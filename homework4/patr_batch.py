@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Batch PATR-II Parsing with a Compiled Grammar Cache
+
+The exercise1.tak workflow (load grammar, load lexicon, file parse
+sentences.txt out.txt) re-reads both source files on every run and parses
+one sentence at a time. This front-end:
+
+- compiles the grammar (rules with their constraint DAGs, left-corner index)
+  and the lexicon (trie of compiled entries, see patr_lexicon.py) into a pickled cache
+  next to the grammar, rebuilt only when a source file really changed
+  (mtime/size checked first, content hash only when those differ),
+- parses large sentence files across a process pool, every worker loading
+  the compiled cache once,
+- writes the same out.txt format as patr_forest.parse_file, in input order.
+
+Usage:
+    python patr_batch.py --sentences regression.txt --output out.txt --workers 8
+
+Author: NLP Course Exercise
+"""
+
+import os
+import time
+import pickle
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from patr_parser import Grammar, Lexicon, PatrParser
+from patr_forest import count_result, format_result, format_statistics
+from patr_lexicon import LemmaFallback, LexiconTrie
+
+
+CACHE_VERSION = 2
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _source_stamp(path: str) -> Dict:
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+def default_cache_path(grammar_path: str) -> str:
+    """Compiled cache location: the grammar path with a .patrc extension."""
+    return os.path.splitext(grammar_path)[0] + '.patrc'
+
+
+def _cache_is_valid(sources: List[Dict], grammar_path: str, lexicon_path: str) -> Tuple[bool, bool]:
+    """
+    Check a cache's source stamps against the current files.
+
+    Returns:
+        Tuple of (valid, stamps_changed). A file that was touched but not
+        edited is still valid; its stamp is then refreshed.
+    """
+    current = [os.path.abspath(grammar_path), os.path.abspath(lexicon_path)]
+    if [s['path'] for s in sources] != current:
+        return False, False
+
+    stamps_changed = False
+    for source in sources:
+        stamp = _source_stamp(source['path'])
+        if stamp['mtime_ns'] == source['mtime_ns'] and stamp['size'] == source['size']:
+            continue
+        if stamp['size'] != source['size'] or _file_hash(source['path']) != source['sha1']:
+            return False, False
+        stamps_changed = True
+    return True, stamps_changed
+
+
+def _write_cache(cache_path: str, payload: Dict) -> None:
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+
+def load_compiled(grammar_path: str, lexicon_path: str,
+                  cache_path: Optional[str] = None) -> Tuple[Grammar, LexiconTrie, bool]:
+    """
+    Load the compiled grammar and lexicon, rebuilding the cache if needed.
+
+    Args:
+        grammar_path: .grm file
+        lexicon_path: .lex file
+        cache_path: Cache file (default: next to the grammar, see default_cache_path)
+
+    Returns:
+        Tuple of (grammar, lexicon trie, whether the cache was used)
+    """
+    cache_path = cache_path or default_cache_path(grammar_path)
+
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            payload = None
+        if payload and payload.get('version') == CACHE_VERSION:
+            valid, stamps_changed = _cache_is_valid(payload['sources'], grammar_path, lexicon_path)
+            if valid:
+                if stamps_changed:
+                    for source in payload['sources']:
+                        source.update(_source_stamp(source['path']))
+                    _write_cache(cache_path, payload)
+                return payload['grammar'], payload['lexicon'], True
+
+    grammar = Grammar.from_file(grammar_path)
+    lexicon = LexiconTrie.from_lexicon(Lexicon.from_file(lexicon_path), grammar)
+
+    sources = []
+    for path in (grammar_path, lexicon_path):
+        stamp = _source_stamp(path)
+        stamp['sha1'] = _file_hash(path)
+        sources.append(stamp)
+
+    _write_cache(cache_path, {'version': CACHE_VERSION, 'sources': sources,
+                              'grammar': grammar, 'lexicon': lexicon})
+    return grammar, lexicon, False
+
+
+# Per-process parser, created once by the pool initializer
+_worker_parser = None
+
+
+def _init_worker(grammar_path: str, lexicon_path: str, cache_path: Optional[str],
+                 guess_unknown: bool = False) -> None:
+    global _worker_parser
+    grammar, lexicon, _ = load_compiled(grammar_path, lexicon_path, cache_path)
+    if guess_unknown:
+        lexicon.fallback = LemmaFallback()
+    _worker_parser = PatrParser(grammar, lexicon)
+
+
+def _parse_chunk(args: Tuple[List[str], Optional[int]]) -> List[Tuple[str, int, float]]:
+    sentences, max_trees = args
+    rows = []
+    for sentence in sentences:
+        result = _worker_parser.parse(sentence)
+        rows.append((format_result(result, max_trees), count_result(result), result.stats['seconds']))
+    return rows
+
+
+def batch_parse(grammar_path: str, lexicon_path: str, sentences_path: str, output_path: str,
+                workers: Optional[int] = None, chunk_size: int = 64, max_trees: Optional[int] = None,
+                cache_path: Optional[str] = None, guess_unknown: bool = False) -> Dict:
+    """
+    Parse a sentence file in parallel and write out.txt-style output.
+
+    Args:
+        grammar_path: .grm file
+        lexicon_path: .lex file
+        sentences_path: One sentence per line
+        output_path: Output file (same format as patr_forest.parse_file)
+        workers: Worker processes (default: CPU count; 1 parses in this process)
+        chunk_size: Sentences sent to a worker at a time
+        max_trees: Print at most this many trees per sentence
+        cache_path: Compiled cache file
+        guess_unknown: Propose entries for unknown words from their lemmas (see patr_lexicon.py)
+
+    Returns:
+        Summary with sentence counts, cache use and timings
+    """
+    start = time.perf_counter()
+    # Build or validate the cache once here so the workers only ever read it
+    _, _, cache_hit = load_compiled(grammar_path, lexicon_path, cache_path)
+
+    with open(sentences_path, 'r', encoding='utf-8', errors='ignore') as f:
+        sentences = [line.strip() for line in f if line.strip()]
+    chunks = [(sentences[i:i + chunk_size], max_trees) for i in range(0, len(sentences), chunk_size)]
+
+    workers = workers or os.cpu_count() or 1
+    summary = {'sentences': len(sentences), 'parsed': 0, 'parse_seconds': 0.0,
+               'cache_hit': cache_hit, 'workers': workers}
+
+    with open(output_path, 'w', encoding='utf-8') as out:
+        if workers == 1:
+            _init_worker(grammar_path, lexicon_path, cache_path, guess_unknown)
+            chunk_results = map(_parse_chunk, chunks)
+            executor = None
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=(grammar_path, lexicon_path, cache_path, guess_unknown))
+            chunk_results = executor.map(_parse_chunk, chunks)
+
+        parse_counts = {}
+        try:
+            for rows in chunk_results:
+                for text, total, seconds in rows:
+                    out.write(text)
+                    parse_counts[total] = parse_counts.get(total, 0) + 1
+                    summary['parsed'] += total > 0
+                    summary['parse_seconds'] += seconds
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        out.write(format_statistics(parse_counts))
+
+    summary['wall_seconds'] = time.perf_counter() - start
+    return summary
+
+
+def main():
+    """Batch-parse sentences.txt with the exercise1 grammar and lexicon."""
+    import argparse
+
+    here = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'NLP-HW4-files')
+
+    parser = argparse.ArgumentParser(description='Parallel PATR-II batch parser')
+    parser.add_argument('--grammar', default=os.path.join(here, 'exercise1.grm'))
+    parser.add_argument('--lexicon', default=os.path.join(here, 'exercise1.lex'))
+    parser.add_argument('--sentences', default=os.path.join(here, 'sentences.txt'))
+    parser.add_argument('--output', default='out.txt')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=64)
+    parser.add_argument('--max-trees', type=int, default=None)
+    parser.add_argument('--cache', default=None, help='Compiled cache file (default: <grammar>.patrc)')
+    parser.add_argument('--guess-unknown', action='store_true', help='Guess entries for unknown word forms')
+    args = parser.parse_args()
+
+    summary = batch_parse(args.grammar, args.lexicon, args.sentences, args.output, args.workers,
+                          args.chunk_size, args.max_trees, args.cache, args.guess_unknown)
+
+    print(f"Compiled grammar cache: {'reused' if summary['cache_hit'] else 'rebuilt'}")
+    print(f"Parsed {summary['parsed']}/{summary['sentences']} sentences with {summary['workers']} workers")
+    print(f"Parse time {summary['parse_seconds']:.2f}s, wall clock {summary['wall_seconds']:.2f}s")
+    print(f"Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Grammar Regression Benchmark and Coverage Profiler
+
+Edits to exercise1.grm can silently change coverage (sentences that stop or
+start parsing), cause ambiguity explosions or slow the parser down. This
+tool runs the parser over a sentence suite and records per sentence:
+
+- number of parses (counted on the packed forest, see patr_forest.py),
+- chart size (active and passive edges) and packed alternatives,
+- unification attempts and failures,
+- parse time (best of several repeats),
+
+plus the rules that are never used in any parse. The report is saved as a
+JSON baseline; later runs are diffed against it and regressions (lost
+coverage or readings, parse count growth, chart or unification growth,
+slowdowns) are listed.
+
+Usage:
+    python patr_benchmark.py --update-baseline      # record the current grammar
+    python patr_benchmark.py                        # compare an edited grammar
+
+Author: NLP Course Exercise
+"""
+
+import os
+import sys
+import json
+import time
+from typing import Dict, List, Optional
+
+from patr_parser import PatrParser
+from patr_forest import count_result
+
+
+def _rules_in_parses(result, used: set) -> None:
+    """Add the rules of every tree in the forest under the result's roots to used."""
+    stack = list(result.roots)
+    visited = set()
+    while stack:
+        node = stack.pop()
+        if id(node) in visited or node.word is not None:
+            continue
+        visited.add(id(node))
+        for rule, children in node.alternatives:
+            used.add(repr(rule))
+            stack.extend(children)
+
+
+def run_benchmark(parser: PatrParser, sentences: List[str], repeat: int = 3) -> Dict:
+    """
+    Parse a sentence suite and collect per-sentence measurements.
+
+    Args:
+        parser: Configured parser
+        sentences: Sentences to parse
+        repeat: Parses per sentence; the fastest time is kept
+
+    Returns:
+        Report dictionary (JSON-serializable)
+    """
+    rows = []
+    used_rules = set()
+    for sentence in sentences:
+        timings = []
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            result = parser.parse(sentence)
+            timings.append(time.perf_counter() - start)
+
+        _rules_in_parses(result, used_rules)
+        stats = result.stats
+        rows.append({
+            'sentence': sentence,
+            'parses': count_result(result),
+            'chart_edges': stats['active_edges'] + stats['passive_edges'],
+            'packed_alternatives': stats['packed_alternatives'],
+            'unify_attempts': stats['unify_attempts'],
+            'unify_failures': stats['unify_failures'],
+            'unknown_words': result.unknown_words,
+            'ms': round(min(timings) * 1000, 3)
+        })
+
+    all_rules = [repr(rule) for rule in parser.grammar.rules]
+    return {
+        'rules': len(all_rules),
+        'lexical_entries': len(parser.lexicon),
+        'sentences': rows,
+        'coverage': sum(1 for row in rows if row['parses']),
+        'total_ms': round(sum(row['ms'] for row in rows), 3),
+        'used_rules': sorted(used_rules),
+        'unused_rules': sorted(set(all_rules) - used_rules)
+    }
+
+
+def save_baseline(report: Dict, path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+
+def load_baseline(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def diff_reports(baseline: Dict, current: Dict, ambiguity_factor: float = 2.0,
+                 chart_factor: float = 1.5, unify_factor: float = 1.5,
+                 slowdown_factor: float = 1.5, min_ms: float = 1.0) -> Dict[str, List[str]]:
+    """
+    Compare a benchmark report against a baseline.
+
+    Args:
+        baseline: Earlier report
+        current: New report
+        ambiguity_factor: Flag sentences whose parse count grew by at least this factor
+        chart_factor: Flag sentences whose chart grew by at least this factor
+        unify_factor: Flag sentences whose unification attempts or failures grew by at least this factor
+        slowdown_factor: Flag sentences that got at least this much slower...
+        min_ms: ...and take longer than this, so timer noise on tiny sentences is ignored
+
+    Returns:
+        Dictionary with 'regressions', 'improvements' and 'notes' message lists
+    """
+    regressions = []
+    improvements = []
+    notes = []
+    previous = {row['sentence']: row for row in baseline['sentences']}
+
+    for row in current['sentences']:
+        old = previous.get(row['sentence'])
+        if old is None:
+            continue
+        sentence = row['sentence']
+
+        if old['parses'] and not row['parses']:
+            regressions.append(f"lost coverage: {sentence}")
+        elif row['parses'] and not old['parses']:
+            improvements.append(f"new coverage ({row['parses']} parses): {sentence}")
+        elif old['parses'] and row['parses'] >= old['parses'] * ambiguity_factor:
+            regressions.append(f"parses {old['parses']} -> {row['parses']}: {sentence}")
+        elif row['parses'] < old['parses']:
+            # Readings the grammar used to find are lost coverage too
+            regressions.append(f"lost readings, parses {old['parses']} -> {row['parses']}: {sentence}")
+
+        if old['chart_edges'] and row['chart_edges'] >= old['chart_edges'] * chart_factor:
+            regressions.append(f"chart edges {old['chart_edges']} -> {row['chart_edges']}: {sentence}")
+
+        for key, label in (('unify_attempts', 'unification attempts'), ('unify_failures', 'unification failures')):
+            # A baseline of 0 counts as 1, so a single new failure is not flagged
+            if row[key] > old[key] and row[key] >= max(old[key], 1) * unify_factor:
+                regressions.append(f"{label} {old[key]} -> {row[key]}: {sentence}")
+
+        if row['ms'] > min_ms and row['ms'] >= old['ms'] * slowdown_factor:
+            regressions.append(f"time {old['ms']:.1f} ms -> {row['ms']:.1f} ms: {sentence}")
+
+    # Only rules the baseline parses used count; an unused rule may simply be new
+    unused = set(current['unused_rules']) - set(baseline['unused_rules'])
+    if 'used_rules' in baseline:
+        for rule in sorted(unused & set(baseline['used_rules'])):
+            regressions.append(f"rule no longer used: {rule}")
+        for rule in sorted(unused - set(baseline['used_rules'])):
+            notes.append(f"new rule not covered by the suite: {rule}")
+    else:
+        for rule in sorted(unused):
+            notes.append(f"rule not used by the suite (baseline has no rule list, use --update-baseline): {rule}")
+
+    missing = set(previous) - {row['sentence'] for row in current['sentences']}
+    if missing:
+        regressions.append(f"{len(missing)} baseline sentence(s) missing from the suite")
+
+    return {'regressions': regressions, 'improvements': improvements, 'notes': notes}
+
+
+def print_report(report: Dict) -> None:
+    print(f"{'Parses':>8} {'Edges':>7} {'Unify':>7} {'Fail':>7} {'ms':>8}  Sentence")
+    print("-" * 90)
+    for row in report['sentences']:
+        print(f"{row['parses']:>8} {row['chart_edges']:>7} {row['unify_attempts']:>7} "
+              f"{row['unify_failures']:>7} {row['ms']:>8.2f}  {row['sentence']}")
+    print("-" * 90)
+    print(f"Coverage: {report['coverage']}/{len(report['sentences'])} sentences, "
+          f"{report['rules']} rules, {report['lexical_entries']} lexical entries, {report['total_ms']:.1f} ms")
+    if report['unused_rules']:
+        print(f"Rules never used in a parse ({len(report['unused_rules'])}):")
+        for rule in report['unused_rules']:
+            print(f"  {rule}")
+
+
+def main():
+    """Benchmark the exercise1 grammar on sentences.txt and compare with the stored baseline."""
+    import argparse
+
+    here = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'NLP-HW4-files')
+
+    parser = argparse.ArgumentParser(description='PATR-II grammar regression benchmark')
+    parser.add_argument('--grammar', default=os.path.join(here, 'exercise1.grm'))
+    parser.add_argument('--lexicon', default=os.path.join(here, 'exercise1.lex'))
+    parser.add_argument('--sentences', default=os.path.join(here, 'sentences.txt'))
+    parser.add_argument('--baseline', default='patr_baseline.json')
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with open(args.sentences, 'r', encoding='utf-8', errors='ignore') as f:
+        sentences = [line.strip() for line in f if line.strip()]
+
+    patr = PatrParser.from_files(args.grammar, args.lexicon)
+    report = run_benchmark(patr, sentences, args.repeat)
+    print_report(report)
+
+    baseline = load_baseline(args.baseline)
+    if args.update_baseline or baseline is None:
+        save_baseline(report, args.baseline)
+        print(f"\nBaseline saved to: {args.baseline}")
+        return
+
+    changes = diff_reports(baseline, report)
+    print(f"\nCompared with {args.baseline}:")
+    for message in changes['improvements']:
+        print(f"  + {message}")
+    for message in changes['regressions']:
+        print(f"  - {message}")
+    for message in changes['notes']:
+        print(f"  * {message}")
+    if not changes['improvements'] and not changes['regressions'] and not changes['notes']:
+        print("  no changes")
+
+    if changes['regressions']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+Packed Parse Forest Read-Out for the PATR-II Parser
+
+PatrParser (patr_parser.py) returns a packed forest: every constituent is
+stored once, with all the ways of building it. On PP-attachment sentences
+such as "the fan fans the researcher with a fan" the number of trees grows
+exponentially with the number of PPs while the forest stays polynomial.
+This module reads trees out of the forest without ever materializing all of
+them:
+
+- count_trees(): number of trees, by dynamic programming over the forest,
+- tree_at(): build tree number i directly (mixed-radix unranking), so
+  iter_trees() is lazy and tree i costs only the size of tree i,
+- k_best(): the k cheapest trees (default cost: number of phrase nodes,
+  i.e. the flattest attachments first), computed bottom-up with a heap over
+  the children's k-best lists,
+- format_result() / parse_file(): out.txt writer in PC-PATR's layout (tree
+  diagrams, root feature structures, parse counts, the file statistics
+  footer) that prints the exact parse count and at most max_trees trees.
+
+Trees are nested tuples: (category, child, child, ...) for phrases and
+(category, word) for words.
+
+Author: NLP Course Exercise
+"""
+
+import heapq
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from patr_parser import FNode, ForestNode, ParseResult, PatrError, PatrParser, Rule, deref
+
+# A derivation is (forest node, child derivations); words have no children
+Derivation = Tuple[ForestNode, Tuple]
+
+# PC-PATR gives every word column at least this many characters plus one
+MIN_COLUMN = 6
+
+
+def _cycle_error(node: ForestNode) -> PatrError:
+    return PatrError(f"Cyclic unary derivation at {node}; the forest has infinitely many trees")
+
+
+def count_trees(node: ForestNode, memo: Optional[Dict[int, int]] = None) -> int:
+    """
+    Count the trees packed under a forest node without enumerating them.
+
+    Args:
+        node: Forest node (a root from ParseResult.roots)
+        memo: Shared memo, keyed by node id, reused across roots of one sentence
+
+    Returns:
+        Number of distinct derivations
+    """
+    memo = {} if memo is None else memo
+    key = id(node)
+    if key in memo:
+        if memo[key] is None:
+            raise _cycle_error(node)
+        return memo[key]
+    if node.word is not None:
+        memo[key] = 1
+        return 1
+
+    memo[key] = None  # in progress
+    total = 0
+    for _, children in node.alternatives:
+        product = 1
+        for child in children:
+            product *= count_trees(child, memo)
+        total += product
+    memo[key] = total
+    return total
+
+
+def count_result(result: ParseResult) -> int:
+    """Total number of trees over all roots of a parse result."""
+    memo = {}
+    return sum(count_trees(root, memo) for root in result.roots)
+
+
+def _derivation_at(node: ForestNode, index: int, memo: Dict[int, int]) -> Derivation:
+    """Derivation number index of a forest node, keeping the forest nodes (see tree_at)."""
+    if node.word is not None:
+        return (node, ())
+
+    for _, children in node.alternatives:
+        counts = [count_trees(child, memo) for child in children]
+        size = 1
+        for count in counts:
+            size *= count
+        if index >= size:
+            index -= size
+            continue
+
+        digits = []
+        for count in reversed(counts):
+            index, digit = divmod(index, count)
+            digits.append(digit)
+        digits.reverse()
+        return (node, tuple(_derivation_at(child, digit, memo) for child, digit in zip(children, digits)))
+
+    raise IndexError(f"Tree index out of range for {node}")
+
+
+def _as_tree(derivation: Derivation) -> Tuple:
+    node, children = derivation
+    if node.word is not None:
+        return (node.category, node.word)
+    return (node.category,) + tuple(_as_tree(child) for child in children)
+
+
+def tree_at(node: ForestNode, index: int, memo: Optional[Dict[int, int]] = None) -> Tuple:
+    """
+    Build tree number index of a forest node.
+
+    Trees are numbered by alternative, then by the children's tree numbers
+    with the last child varying fastest (the order of itertools.product).
+
+    Args:
+        node: Forest node
+        index: 0 <= index < count_trees(node)
+        memo: Count memo shared with count_trees
+
+    Returns:
+        The tree as a nested tuple
+    """
+    return _as_tree(_derivation_at(node, index, {} if memo is None else memo))
+
+
+def _iter_derivations(result: ParseResult, limit: Optional[int] = None) -> Iterator[Derivation]:
+    memo = {}
+    produced = 0
+    for root in result.roots:
+        for index in range(count_trees(root, memo)):
+            if limit is not None and produced >= limit:
+                return
+            yield _derivation_at(root, index, memo)
+            produced += 1
+
+
+def iter_trees(result: ParseResult, limit: Optional[int] = None) -> Iterator[Tuple]:
+    """
+    Lazily yield the trees of a parse result.
+
+    Args:
+        result: Result returned by PatrParser.parse
+        limit: Stop after this many trees
+
+    Yields:
+        Trees as nested tuples
+    """
+    for derivation in _iter_derivations(result, limit):
+        yield _as_tree(derivation)
+
+
+def _unit_cost(rule: Rule) -> float:
+    return 1.0
+
+
+def k_best(result: ParseResult, k: int,
+           rule_cost: Callable[[Rule], float] = _unit_cost) -> List[Tuple[float, Tuple]]:
+    """
+    Return the k cheapest trees of a parse result.
+
+    A tree's cost is the sum of rule_cost over its phrase nodes. Every forest
+    node keeps at most k derivations, so the work is O(nodes * k log k)
+    whatever the total number of trees.
+
+    Args:
+        result: Result returned by PatrParser.parse
+        k: Number of trees
+        rule_cost: Cost of applying a rule (default 1, i.e. fewest nodes first)
+
+    Returns:
+        List of (cost, tree) pairs, cheapest first
+    """
+    # node id -> sorted list of (cost, alternative index, child ranks)
+    best = {}
+
+    def derivations(node: ForestNode) -> List[Tuple[float, int, Tuple[int, ...]]]:
+        key = id(node)
+        if key in best:
+            if best[key] is None:
+                raise _cycle_error(node)
+            return best[key]
+        if node.word is not None:
+            best[key] = [(0.0, -1, ())]
+            return best[key]
+
+        best[key] = None  # in progress
+        heap = []
+        seen = set()
+        child_lists = []
+        for alt, (rule, children) in enumerate(node.alternatives):
+            lists = [derivations(child) for child in children]
+            child_lists.append((rule_cost(rule), lists))
+            ranks = (0,) * len(children)
+            cost = child_lists[alt][0] + sum(lst[0][0] for lst in lists)
+            heapq.heappush(heap, (cost, alt, ranks))
+            seen.add((alt, ranks))
+
+        found = []
+        while heap and len(found) < k:
+            cost, alt, ranks = heapq.heappop(heap)
+            found.append((cost, alt, ranks))
+            base, lists = child_lists[alt]
+            for position in range(len(ranks)):
+                if ranks[position] + 1 >= len(lists[position]):
+                    continue
+                next_ranks = ranks[:position] + (ranks[position] + 1,) + ranks[position + 1:]
+                if (alt, next_ranks) in seen:
+                    continue
+                seen.add((alt, next_ranks))
+                next_cost = base + sum(lst[r][0] for lst, r in zip(lists, next_ranks))
+                heapq.heappush(heap, (next_cost, alt, next_ranks))
+
+        best[key] = found
+        return found
+
+    def build(node: ForestNode, rank: int) -> Tuple:
+        if node.word is not None:
+            return (node.category, node.word)
+        _, alt, ranks = best[id(node)][rank]
+        children = node.alternatives[alt][1]
+        return (node.category,) + tuple(build(child, r) for child, r in zip(children, ranks))
+
+    candidates = []
+    for root in result.roots:
+        for rank, (cost, _, _) in enumerate(derivations(root)):
+            candidates.append((cost, root, rank))
+    candidates.sort(key=lambda item: item[0])
+
+    return [(cost, build(root, rank)) for cost, root, rank in candidates[:k]]
+
+
+def format_tree(tree: Tuple, indent: int = 0) -> str:
+    """Indented rendering of a (label, children...) tuple tree."""
+    pad = '    ' * indent
+    if len(tree) == 2 and isinstance(tree[1], str):
+        return f"{pad}{tree[0]} {tree[1]}"
+    lines = [f"{pad}{tree[0]}"]
+    lines.extend(format_tree(child, indent + 1) for child in tree[1:])
+    return '\n'.join(lines)
+
+
+def _column_width(derivation: Derivation, label: Callable[[Derivation], str]) -> int:
+    """Characters a subtree takes: word columns are sized by the word and every label above it."""
+    texts = []
+    while True:
+        node, children = derivation
+        # PC-PATR sizes columns without the shared-node marker
+        texts.append(label(derivation).rstrip('+'))
+        if node.word is not None:
+            return max(max(map(len, texts)), len(node.word), MIN_COLUMN) + 1
+        if len(children) != 1:
+            return sum(_column_width(child, label) for child in children)
+        derivation = children[0]
+
+
+def draw_tree(derivation: Derivation, label: Callable[[Derivation], str]) -> List[str]:
+    """
+    Draw a derivation as a PC-PATR tree diagram.
+
+    Every word gets a column; a phrase label is centred over its first and
+    last daughter and joined to them by an underscore line, and a word is
+    printed directly under its category.
+
+    Args:
+        derivation: (forest node, child derivations) as read out of the forest
+        label: Text printed for a node
+
+    Returns:
+        Lines of the diagram
+    """
+    rows: List[List[str]] = []
+
+    def put(row: int, column: int, text: str) -> None:
+        while len(rows) <= row:
+            rows.append([])
+        line = rows[row]
+        column = max(column, 0)
+        if len(line) < column + len(text):
+            line.extend(' ' * (column + len(text) - len(line)))
+        line[column:column + len(text)] = text
+
+    def draw(derivation: Derivation, start: int, width: int, depth: int) -> int:
+        node, children = derivation
+        if node.word is not None:
+            center = start + width // 2
+            put(2 * depth + 1, center - len(node.word) // 2, node.word + ' ')
+        elif len(children) == 1:
+            center = draw(children[0], start, width, depth + 1)
+            put(2 * depth + 1, center, '|')
+        else:
+            centers = []
+            for child in children:
+                child_width = _column_width(child, label)
+                centers.append(draw(child, start, child_width, depth + 1))
+                start += child_width
+            center = (centers[0] + centers[-1]) // 2
+            put(2 * depth + 1, centers[0], '_' * (centers[-1] - centers[0] + 1))
+            put(2 * depth + 1, center, '|')
+        text = label(derivation)
+        put(2 * depth, center - len(text) // 2, text + ' ')
+        return center
+
+    draw(derivation, 0, _column_width(derivation, label), 0)
+    return [''.join(row) for row in rows]
+
+
+def _node_labels(derivations: List[Derivation]) -> Callable[[Derivation], str]:
+    """
+    Number the nodes of several trees like PC-PATR: category_N, with a '+'
+    on nodes that all the trees share.
+
+    A node is the same in two trees only if its whole subtree is, so a packed
+    forest node that is built in different ways gets several numbers.
+    """
+    subtrees = {}       # (forest node id, child subtree keys) -> subtree key
+    keys = {}           # derivation id -> subtree key
+    numbers = {}        # subtree key -> node number, in preorder over the trees
+    trees_using = {}    # subtree key -> trees that contain it
+
+    def identify(derivation: Derivation) -> int:
+        node, children = derivation
+        key = subtrees.setdefault((id(node), tuple(identify(child) for child in children)), len(subtrees))
+        keys[id(derivation)] = key
+        return key
+
+    def number(derivation: Derivation, seen: set) -> None:
+        key = keys[id(derivation)]
+        numbers.setdefault(key, len(numbers) + 1)
+        if key not in seen:
+            seen.add(key)
+            trees_using[key] = trees_using.get(key, 0) + 1
+        for child in derivation[1]:
+            number(child, seen)
+
+    for derivation in derivations:
+        identify(derivation)
+        number(derivation, set())
+
+    def label(derivation: Derivation) -> str:
+        key = keys[id(derivation)]
+        shared = '+' if trees_using[key] == len(derivations) else ''
+        return f"{derivation[0].category}_{numbers[key]}{shared}"
+
+    return label
+
+
+def format_features(dag: FNode) -> List[str]:
+    """
+    Render a feature structure the way PC-PATR prints it.
+
+    cat comes first, then the other features alphabetically; feature
+    structures reached by more than one path are marked $N each time.
+
+    Args:
+        dag: Feature structure (e.g. the dag of a root forest node)
+
+    Returns:
+        Lines of the attribute-value matrix
+    """
+    paths_to = {}
+
+    def count(node: FNode) -> None:
+        node = deref(node)
+        if not node.arcs:
+            return
+        paths_to[id(node)] = paths_to.get(id(node), 0) + 1
+        if paths_to[id(node)] == 1:
+            for value in node.arcs.values():
+                count(value)
+
+    count(dag)
+    tags = {}
+
+    def render(node: FNode, column: int) -> List[str]:
+        features = [(name, deref(node.arcs[name]))
+                    for name in sorted(node.arcs, key=lambda name: (name != 'cat', name))]
+        # Open variables carry no information and are left out
+        features = [(name, value) for name, value in features if value.atom is not None or value.arcs]
+        if not features:
+            return ['[]']
+        lines = []
+        for i, (name, value) in enumerate(features):
+            head = ('[ ' if i == 0 else ' ' * (column + 2)) + f"{name}:".ljust(7)
+            if value.atom is not None:
+                lines.append(head + value.atom)
+                continue
+            if paths_to[id(value)] > 1:
+                tag = f"${tags.setdefault(id(value), len(tags) + 1)}"
+            else:
+                tag = '  '
+            inner = render(value, column + 2 + len(f"{name}:".ljust(7)) + len(tag))
+            lines.append(head + tag + inner[0])
+            lines.extend(inner[1:])
+        lines[-1] += ' ]'
+        return lines
+
+    return render(deref(dag), 0)
+
+
+def format_result(result: ParseResult, max_trees: Optional[int] = None) -> str:
+    """
+    Render a parse result as a PC-PATR out.txt entry.
+
+    Each tree is followed by the feature structure of its root. Guessed
+    entries (see patr_lexicon.py) have no counterpart in PC-PATR and are
+    drawn like any other word; ParseResult.guessed_words lists them.
+
+    Args:
+        result: Result returned by PatrParser.parse
+        max_trees: Print at most this many trees (the count line is always exact)
+
+    Returns:
+        The sentence, numbered trees with their features and a parse count line
+    """
+    lines = [result.sentence]
+    if result.unknown_words:
+        lines.extend(f'    "{word}" is not in the lexicon' for word in result.unknown_words)
+        return '\n'.join(lines) + '\n'
+
+    total = count_result(result)
+    if total == 0:
+        lines.append("**** Not able to parse this sentence ****")
+        lines.append("**** No output available ****")
+        return '\n'.join(lines) + '\n'
+
+    derivations = list(_iter_derivations(result, limit=max_trees))
+    # Node numbers only appear when a sentence is ambiguous
+    label = _node_labels(derivations) if total > 1 else (lambda derivation: derivation[0].category)
+    for number, derivation in enumerate(derivations, 1):
+        if number > 1:
+            lines.append('')
+        lines.extend(['', f"{number}:"])
+        lines.extend(draw_tree(derivation, label))
+        root = derivation[0]
+        lines.extend(['', f"{root.category}:"])
+        lines.extend(format_features(root.dag))
+
+    count_line = f"{total} parse{'s' if total != 1 else ''} found"
+    if len(derivations) < total:
+        count_line += f" ({len(derivations)} printed)"
+    lines.extend(['', count_line, ''])
+    return '\n'.join(lines) + '\n'
+
+
+def format_statistics(parse_counts: Dict[int, int]) -> str:
+    """
+    PC-PATR's "File parsing statistics" footer.
+
+    Args:
+        parse_counts: Number of sentences for every parse count (sentences
+            with unknown words count as 0 parses)
+
+    Returns:
+        The footer, including the blank line that separates it from the entries
+    """
+    sentences = sum(parse_counts.values())
+    parsed = sentences - parse_counts.get(0, 0)
+    lines = [f"File parsing statistics: {sentences} sentence{'s' if sentences != 1 else ''} read"]
+    for parses in sorted(parse_counts):
+        count = parse_counts[parses]
+        lines.append(f"{count:>12} {'sentence' if count == 1 else 'sentences':<9} "
+                     f"with {parses} parse{'s' if parses != 1 else ''}")
+    # PC-PATR truncates the percentage to one decimal
+    tenths = parsed * 1000 // sentences if sentences else 0
+    lines.append(f"{parsed} of {sentences} ({tenths // 10}.{tenths % 10} %) parsed at least once")
+    return '\n' + '\n'.join(lines) + '\n'
+
+
+def parse_file(parser: PatrParser, sentences_path: str, output_path: str,
+               max_trees: Optional[int] = None) -> List[ParseResult]:
+    """
+    Parse every non-empty line of a sentence file (the 'file parse' command).
+
+    Args:
+        parser: Configured parser
+        sentences_path: Input file with one sentence per line
+        output_path: Output file in PC-PATR out.txt format
+        max_trees: Print at most this many trees per sentence
+
+    Returns:
+        List of parse results
+    """
+    with open(sentences_path, 'r', encoding='utf-8', errors='ignore') as f:
+        sentences = [line.strip() for line in f if line.strip()]
+
+    results = []
+    parse_counts = {}
+    with open(output_path, 'w', encoding='utf-8') as out:
+        for sentence in sentences:
+            result = parser.parse(sentence)
+            out.write(format_result(result, max_trees))
+            total = count_result(result)
+            parse_counts[total] = parse_counts.get(total, 0) + 1
+            results.append(result)
+        out.write(format_statistics(parse_counts))
+    return results
+
+
+def main():
+    """Show tree counts and the best trees for increasingly ambiguous PP chains."""
+    import os
+    import time
+    import argparse
+
+    here = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'NLP-HW4-files')
+
+    parser = argparse.ArgumentParser(description='Packed forest statistics')
+    parser.add_argument('--grammar', default=os.path.join(here, 'exercise1.grm'))
+    parser.add_argument('--lexicon', default=os.path.join(here, 'exercise1.lex'))
+    parser.add_argument('--sentences', default=os.path.join(here, 'sentences.txt'))
+    parser.add_argument('--k', type=int, default=3)
+    args = parser.parse_args()
+
+    patr = PatrParser.from_files(args.grammar, args.lexicon)
+    with open(args.sentences, 'r', encoding='utf-8', errors='ignore') as f:
+        sentences = [line.strip() for line in f if line.strip()]
+
+    print(f"{'Trees':>12} {'Parse ms':>9} {'Count ms':>9}  Sentence")
+    print("-" * 80)
+    for sentence in sentences:
+        result = patr.parse(sentence)
+        start = time.perf_counter()
+        total = count_result(result)
+        count_ms = (time.perf_counter() - start) * 1000
+        print(f"{total:>12} {result.stats['seconds'] * 1000:>9.1f} {count_ms:>9.2f}  {sentence}")
+
+    most_ambiguous = max((patr.parse(s) for s in sentences), key=count_result)
+    if count_result(most_ambiguous):
+        print(f"\n{args.k} best trees for: {most_ambiguous.sentence}")
+        for cost, tree in k_best(most_ambiguous, args.k):
+            print(f"\ncost {cost:.0f}")
+            print(format_tree(tree))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Compiled Lexicon Store for the PATR-II Parser
+
+Lexicon (patr_parser.py) keeps the \\w records of a .lex file in a plain
+dictionary and builds each entry's feature structure again on every parse.
+LexiconTrie instead:
+
+- stores the entries in a character trie keyed by the lower-cased surface
+  form, so lookup cost depends only on the length of the word, not on the
+  size of the lexicon,
+- compiles every entry once into a bundle (category plus feature DAG, with
+  the grammar's templates applied),
+- can be pickled into the compiled grammar cache used by patr_batch.py,
+- optionally guesses entries for unknown words: a LemmaFallback maps an
+  inflected form to candidate lemmas (WordNet via nltk when available,
+  suffix rules otherwise) and, if a lemma is in the lexicon, proposes its
+  categories for the unknown form (e.g. "likes" -> Verb from "like").
+
+Guessed entries carry only the category; their other features are left
+open, so they unify with any agreement values. They are listed in
+ParseResult.guessed_words.
+
+LexiconTrie offers the same lookup()/bundles()/len() interface as Lexicon,
+so it can be handed to PatrParser directly.
+
+Author: NLP Course Exercise
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from patr_parser import Grammar, Lexicon, LexicalBundle, LexicalEntry, compile_entry
+
+
+# Inflectional endings tried when WordNet is not available: (suffix, replacement)
+SUFFIX_RULES = [
+    ('ies', 'y'), ('es', ''), ('s', ''),
+    ('ied', 'y'), ('ed', ''), ('ed', 'e'), ('d', ''),
+    ('ing', ''), ('ing', 'e'),
+    ('er', ''), ('est', '')
+]
+
+
+class LemmaFallback:
+    """Proposes lemmas for word forms missing from the lexicon."""
+
+    def __init__(self, use_wordnet: bool = True):
+        """
+        Initialize the fallback.
+
+        Args:
+            use_wordnet: Try nltk's WordNetLemmatizer first (needs the wordnet corpus)
+        """
+        self.lemmatizer = None
+        if use_wordnet:
+            try:
+                from nltk.stem import WordNetLemmatizer
+                lemmatizer = WordNetLemmatizer()
+                lemmatizer.lemmatize('fans')  # raises LookupError if the corpus is missing
+                self.lemmatizer = lemmatizer
+            except (ImportError, LookupError):
+                pass
+
+    def candidates(self, word: str) -> List[str]:
+        """
+        Candidate lemmas for a word form, most plausible first.
+
+        Args:
+            word: Lower-cased surface form
+
+        Returns:
+            Distinct lemmas different from the word itself
+        """
+        forms = []
+        if self.lemmatizer is not None:
+            for pos in ('n', 'v', 'a'):
+                forms.append(self.lemmatizer.lemmatize(word, pos))
+        for suffix, replacement in SUFFIX_RULES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+                forms.append(word[:-len(suffix)] + replacement)
+
+        seen = {word}
+        lemmas = []
+        for form in forms:
+            if form not in seen:
+                seen.add(form)
+                lemmas.append(form)
+        return lemmas
+
+
+class _Leaf:
+    """Entries and compiled bundles stored at the end of a word's trie path."""
+
+    __slots__ = ('entries', 'bundles')
+
+    def __init__(self):
+        self.entries = []
+        self.bundles = []
+
+
+_LEAF = ''  # key of the leaf in a trie node (never a single character)
+
+
+class LexiconTrie:
+    """Character trie from surface form to lexical entries and compiled bundles."""
+
+    def __init__(self, grammar: Optional[Grammar] = None):
+        """
+        Initialize an empty trie.
+
+        Args:
+            grammar: Grammar whose templates are applied when entries are compiled;
+                without one, entries are stored but not compiled
+        """
+        self.root = {}
+        self.size = 0
+        self.grammar = grammar
+        self.fallback = None
+        self._guesses = {}
+
+    @classmethod
+    def from_lexicon(cls, lexicon: Lexicon, grammar: Optional[Grammar] = None) -> 'LexiconTrie':
+        """
+        Build a trie holding every entry of a parsed lexicon.
+
+        Args:
+            lexicon: Lexicon read from a .lex file
+            grammar: Grammar used to compile the feature bundles
+
+        Returns:
+            The populated trie
+        """
+        trie = cls(grammar)
+        for entries in lexicon.entries.values():
+            for entry in entries:
+                trie.add(entry)
+        return trie
+
+    def __getstate__(self) -> Dict:
+        # The fallback holds an nltk lemmatizer and is attached per process
+        state = self.__dict__.copy()
+        state['fallback'] = None
+        state['_guesses'] = {}
+        return state
+
+    def _leaf(self, word: str) -> Optional[_Leaf]:
+        node = self.root
+        for char in word.lower():
+            node = node.get(char)
+            if node is None:
+                return None
+        return node.get(_LEAF)
+
+    def add(self, entry: LexicalEntry) -> None:
+        node = self.root
+        for char in entry.word.lower():
+            node = node.setdefault(char, {})
+        leaf = node.get(_LEAF)
+        if leaf is None:
+            leaf = node[_LEAF] = _Leaf()
+        leaf.entries.append(entry)
+        if self.grammar is not None:
+            bundle = compile_entry(entry, self.grammar)
+            if bundle is not None:
+                leaf.bundles.append(bundle)
+        self.size += 1
+
+    def lookup(self, word: str) -> List[LexicalEntry]:
+        """Return the entries for a surface form (case-insensitive)."""
+        leaf = self._leaf(word)
+        return leaf.entries if leaf is not None else []
+
+    def bundles(self, word: str, grammar: Optional[Grammar] = None) -> List[LexicalBundle]:
+        """
+        Return the compiled bundles for a surface form, guessing if it is unknown.
+
+        Args:
+            word: Surface form
+            grammar: Grammar used when the trie was built without one
+
+        Returns:
+            Compiled bundles; guessed bundles have their lemma set
+        """
+        grammar = self.grammar or grammar
+        leaf = self._leaf(word)
+        if leaf is not None:
+            if self.grammar is not None:
+                return leaf.bundles
+            compiled = (compile_entry(entry, grammar) for entry in leaf.entries)
+            return [bundle for bundle in compiled if bundle is not None]
+
+        if self.fallback is None:
+            return []
+        key = word.lower()
+        if key not in self._guesses:
+            self._guesses[key] = self._guess(key, grammar)
+        return self._guesses[key]
+
+    def _guess(self, word: str, grammar: Grammar) -> List[LexicalBundle]:
+        """Propose category-only entries from the first candidate lemma found in the lexicon."""
+        for lemma in self.fallback.candidates(word):
+            leaf = self._leaf(lemma)
+            if leaf is None:
+                continue
+            categories = list(dict.fromkeys(entry.category for entry in leaf.entries))
+            guessed = (compile_entry(LexicalEntry(word, category, []), grammar, lemma=lemma)
+                       for category in categories)
+            return [bundle for bundle in guessed if bundle is not None]
+        return []
+
+    def items(self) -> Iterator[Tuple[str, List[LexicalEntry]]]:
+        """Yield (surface form, entries) pairs in sorted order."""
+        stack = [('', self.root)]
+        while stack:
+            prefix, node = stack.pop()
+            if _LEAF in node:
+                yield prefix, node[_LEAF].entries
+            for char in sorted((c for c in node if c != _LEAF), reverse=True):
+                stack.append((prefix + char, node[char]))
+
+    def __len__(self) -> int:
+        return self.size
+
+
+def main():
+    """Look up the sentences.txt words in the exercise1 lexicon, guessing unknown forms."""
+    import os
+    import argparse
+
+    here = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'NLP-HW4-files')
+
+    parser = argparse.ArgumentParser(description='Compiled PATR-II lexicon lookup')
+    parser.add_argument('--grammar', default=os.path.join(here, 'exercise1.grm'))
+    parser.add_argument('--lexicon', default=os.path.join(here, 'exercise1.lex'))
+    parser.add_argument('--sentences', default=os.path.join(here, 'sentences.txt'))
+    args = parser.parse_args()
+
+    grammar = Grammar.from_file(args.grammar)
+    trie = LexiconTrie.from_lexicon(Lexicon.from_file(args.lexicon), grammar)
+    trie.fallback = LemmaFallback()
+    print(f"{len(trie)} entries, lemmatizer: {'WordNet' if trie.fallback.lemmatizer else 'suffix rules'}\n")
+
+    with open(args.sentences, 'r', encoding='utf-8', errors='ignore') as f:
+        words = sorted({word for line in f for word in line.split()})
+
+    for word in words:
+        bundles = trie.bundles(word)
+        if not bundles:
+            print(f"  {word:<15} unknown")
+        for bundle in bundles:
+            source = f"guessed from {bundle.lemma}" if bundle.lemma else "lexicon"
+            print(f"  {word:<15} {bundle.category:<10} {source}")
+
+
+if __name__ == "__main__":
+    main()
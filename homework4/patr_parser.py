@@ -0,0 +1,776 @@
+#!/usr/bin/env python3
+"""
+PATR-II Unification Chart Parser
+
+An in-process replacement for the pcpatr / pcpatr32.exe binaries used in
+homework4. It reads the same grammar (.grm) and lexicon (.lex) files:
+
+    Rule
+    S -> NP VP
+        <S head> = <VP head>
+        <NP head agr> = <VP head agr>
+
+    \\w fans
+    \\c Noun
+    \\f <head agr number> = plural
+
+and parses sentences with an Earley chart whose completed constituents are
+packed: constituents with the same category, span and feature structure share
+one forest node that records every way of building it. Feature structures are
+DAGs unified destructively with an undo trail, so nothing is copied unless a
+unification succeeds.
+
+Supported grammar statements: Rule (with optional {name}, optional (X) and
+alternative {X / Y} right-hand-side elements, path equations), Let ... be
+(templates) and Parameter Start symbol is X. Lexicon fields: \\w, \\c, \\f
+(template names and path equations), \\g (gloss, kept but unused).
+
+Author: NLP Course Exercise
+"""
+
+import re
+import os
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+
+# ---------------------------------------------------------------------------
+# Feature structures
+# ---------------------------------------------------------------------------
+
+class FNode:
+    """Feature-structure DAG node: a variable, an atom or a set of labelled arcs."""
+
+    __slots__ = ('arcs', 'atom', 'forward')
+
+    def __init__(self, atom: Optional[str] = None):
+        self.arcs = {}
+        self.atom = atom
+        self.forward = None
+
+
+def deref(node: FNode) -> FNode:
+    """Follow forwarding pointers left by unification."""
+    while node.forward is not None:
+        node = node.forward
+    return node
+
+
+def unify(a: FNode, b: FNode, trail: list) -> bool:
+    """
+    Destructively unify two DAGs, recording every change on the trail.
+
+    Args:
+        a: First node
+        b: Second node
+        trail: List that receives undo records; pass it to undo() to roll back
+
+    Returns:
+        True if the structures are compatible
+    """
+    stack = [(a, b)]
+    while stack:
+        a, b = stack.pop()
+        a = deref(a)
+        b = deref(b)
+        if a is b:
+            continue
+
+        a_empty = a.atom is None and not a.arcs
+        b_empty = b.atom is None and not b.arcs
+
+        if b_empty:
+            b.forward = a
+            trail.append((b, None))
+        elif a_empty:
+            a.forward = b
+            trail.append((a, None))
+        elif a.atom is not None or b.atom is not None:
+            if a.atom != b.atom:
+                return False
+            b.forward = a
+            trail.append((b, None))
+        else:
+            b.forward = a
+            trail.append((b, None))
+            for label, value in b.arcs.items():
+                existing = a.arcs.get(label)
+                if existing is None:
+                    a.arcs[label] = value
+                    trail.append((a, label))
+                else:
+                    stack.append((existing, value))
+    return True
+
+
+def undo(trail: list) -> None:
+    """Roll back the changes recorded by unify()."""
+    for node, label in reversed(trail):
+        if label is None:
+            node.forward = None
+        else:
+            del node.arcs[label]
+    trail.clear()
+
+
+def copy_dag(node: FNode, memo: Optional[Dict[int, FNode]] = None) -> FNode:
+    """
+    Copy the dereferenced structure of a DAG, preserving re-entrancy.
+
+    Args:
+        node: Root to copy
+        memo: Shared memo so several roots copied together keep shared substructure
+
+    Returns:
+        A fresh DAG without forwarding pointers
+    """
+    memo = {} if memo is None else memo
+    node = deref(node)
+    if id(node) in memo:
+        return memo[id(node)]
+
+    new = FNode(node.atom)
+    memo[id(node)] = new
+    for label, value in node.arcs.items():
+        new.arcs[label] = copy_dag(value, memo)
+    return new
+
+
+def get_path(node: FNode, path: List[str]) -> FNode:
+    """Return the node at a feature path, creating empty nodes along the way."""
+    node = deref(node)
+    for label in path:
+        child = node.arcs.get(label)
+        if child is None:
+            child = FNode()
+            node.arcs[label] = child
+        node = deref(child)
+    return node
+
+
+def dag_signature(node: FNode) -> str:
+    """
+    Canonical string for a DAG; equal strings mean equal feature structures.
+
+    Shared nodes are printed once with a tag and referenced afterwards.
+    """
+    counts = defaultdict(int)
+
+    def count(n):
+        n = deref(n)
+        counts[id(n)] += 1
+        if counts[id(n)] == 1:
+            for value in n.arcs.values():
+                count(value)
+
+    count(node)
+    tags = {}
+    parts = []
+
+    def emit(n):
+        n = deref(n)
+        if id(n) in tags:
+            parts.append(f"#{tags[id(n)]}")
+            return
+        if counts[id(n)] > 1:
+            tags[id(n)] = len(tags) + 1
+            parts.append(f"#{tags[id(n)]}=")
+        if n.atom is not None:
+            parts.append(n.atom)
+        elif not n.arcs:
+            parts.append('_')
+        else:
+            parts.append('[')
+            for label in sorted(n.arcs):
+                parts.append(label + ':')
+                emit(n.arcs[label])
+                parts.append(' ')
+            parts.append(']')
+
+    emit(node)
+    return ''.join(parts)
+
+
+def format_dag(node: FNode, indent: int = 0) -> str:
+    """Render a feature structure as an indented attribute-value matrix."""
+    node = deref(node)
+    if node.atom is not None:
+        return node.atom
+    if not node.arcs:
+        return '[]'
+    pad = ' ' * (indent + 1)
+    lines = []
+    for label in sorted(node.arcs):
+        lines.append(f"{label}: {format_dag(node.arcs[label], indent + len(label) + 3)}")
+    return '[' + ('\n' + pad).join(lines) + ']'
+
+
+# ---------------------------------------------------------------------------
+# Grammar and lexicon readers
+# ---------------------------------------------------------------------------
+
+FEATURE_TOKEN = re.compile(r'<[^>]*>|=|[^\s<=]+')
+STATEMENT_START = re.compile(r'^\s*(rule|let|parameter|define|lexicon)\b', re.IGNORECASE)
+
+
+class PatrError(Exception):
+    """Raised for malformed grammar or lexicon files."""
+
+
+def _strip_comments(text: str) -> List[str]:
+    return [line.split(';', 1)[0].rstrip() for line in text.splitlines()]
+
+
+def _parse_path(token: str) -> List[str]:
+    return token.strip('<>').split()
+
+
+class Rule:
+    """A phrase-structure rule with its unification constraints compiled into a DAG."""
+
+    __slots__ = ('name', 'lhs', 'rhs', 'dag', 'index')
+
+    def __init__(self, name: str, lhs: str, rhs: List[str], dag: FNode, index: int):
+        self.name = name
+        self.lhs = lhs
+        self.rhs = rhs
+        self.dag = dag
+        self.index = index
+
+    def __repr__(self):
+        return f"{self.lhs} -> {' '.join(self.rhs)}"
+
+
+class Grammar:
+    """PATR-II grammar: rules indexed by left-hand side, plus templates."""
+
+    def __init__(self):
+        self.rules = []
+        self.rules_by_lhs = defaultdict(list)
+        self.templates = {}
+        self.start_symbol = None
+        self.left_corners = {}
+
+    @classmethod
+    def from_file(cls, path: str) -> 'Grammar':
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return cls.from_string(f.read())
+
+    @classmethod
+    def from_string(cls, text: str) -> 'Grammar':
+        grammar = cls()
+        statements = []
+        for line in _strip_comments(text):
+            if STATEMENT_START.match(line):
+                statements.append(line)
+            elif statements and line.strip():
+                statements[-1] += '\n' + line
+
+        for statement in statements:
+            keyword = statement.split(None, 1)[0].lower()
+            body = statement.split(None, 1)[1] if len(statement.split(None, 1)) > 1 else ''
+            if keyword == 'rule':
+                grammar._add_rule(body)
+            elif keyword == 'let':
+                grammar._add_template(body)
+            elif keyword == 'parameter':
+                match = re.search(r'start\s+symbol\s+is\s+(\S+)', body, re.IGNORECASE)
+                if match:
+                    grammar.start_symbol = match.group(1)
+
+        if grammar.start_symbol is None and grammar.rules:
+            grammar.start_symbol = grammar.rules[0].lhs
+        grammar.left_corners = grammar.left_corner_table()
+        return grammar
+
+    def left_corner_table(self) -> Dict[str, frozenset]:
+        """
+        Compute, for every category, the categories that can start one of its phrases.
+
+        The relation is reflexive and transitive: NP -> Det N and Det -> the give
+        NP the left corners {NP, Det}. The parser only predicts a rule when the
+        next word's category is a left corner of the rule's first daughter.
+
+        Returns:
+            Dictionary mapping category to a frozenset of left-corner categories
+        """
+        table = defaultdict(set)
+        for rule in self.rules:
+            table[rule.lhs].add(rule.lhs)
+            table[rule.lhs].add(rule.rhs[0])
+
+        changed = True
+        while changed:
+            changed = False
+            for category, corners in table.items():
+                extra = set()
+                for corner in corners:
+                    if corner != category and corner in table:
+                        extra |= table[corner]
+                if not extra <= corners:
+                    corners |= extra
+                    changed = True
+        return {category: frozenset(corners) for category, corners in table.items()}
+
+    def _add_template(self, body: str) -> None:
+        match = re.match(r'\s*(\S+)\s+be\s+(.*)', body, re.DOTALL | re.IGNORECASE)
+        if not match:
+            raise PatrError(f"Malformed template: Let {body}")
+        self.templates[match.group(1)] = FEATURE_TOKEN.findall(match.group(2))
+
+    def apply_features(self, root: FNode, tokens: List[str], prefix: Optional[List[str]] = None,
+                       depth: int = 0) -> bool:
+        """
+        Apply path equations and template names to a DAG.
+
+        Args:
+            root: DAG to constrain
+            tokens: Feature tokens (paths, '=', atoms, template names)
+            prefix: Path prepended to every path (used for lexical entries)
+            depth: Template nesting depth, to catch recursive templates
+
+        Returns:
+            False if the constraints are inconsistent
+        """
+        if depth > 20:
+            raise PatrError("Template definitions are recursive")
+        prefix = prefix or []
+        trail = []
+        i = 0
+        while i < len(tokens):
+            token = tokens[i]
+            if token.startswith('<') and i + 1 < len(tokens) and tokens[i + 1] == '=':
+                if i + 2 >= len(tokens):
+                    raise PatrError(f"Missing value after {token} =")
+                left = get_path(root, prefix + _parse_path(token))
+                value = tokens[i + 2]
+                if value.startswith('<'):
+                    right = get_path(root, prefix + _parse_path(value))
+                else:
+                    right = FNode(value)
+                if not unify(left, right, trail):
+                    return False
+                i += 3
+            elif token in self.templates:
+                if not self.apply_features(root, self.templates[token], prefix, depth + 1):
+                    return False
+                i += 1
+            else:
+                raise PatrError(f"Unknown template or malformed constraint: {token}")
+        return True
+
+    def _expand_rhs(self, symbols: List[str]) -> List[List[str]]:
+        """Expand optional (X) and alternative {X / Y} elements into plain sequences."""
+        expansions = [[]]
+        for symbol in symbols:
+            if symbol.startswith('(') and symbol.endswith(')'):
+                inner = symbol[1:-1].split()
+                expansions = [e + extra for e in expansions for extra in ([], inner)]
+            elif symbol.startswith('{') and symbol.endswith('}'):
+                choices = [c.split() for c in symbol[1:-1].split('/')]
+                expansions = [e + choice for e in expansions for choice in choices]
+            else:
+                expansions = [e + [symbol] for e in expansions]
+        return expansions
+
+    def _add_rule(self, body: str) -> None:
+        name = None
+        name_match = re.match(r'\s*\{([^}]*)\}', body)
+        if name_match and '->' in body[name_match.end():]:
+            name = name_match.group(1).strip()
+            body = body[name_match.end():]
+
+        if '->' not in body:
+            raise PatrError(f"Rule without '->': {body.strip()}")
+        lhs, rest = body.split('->', 1)
+        lhs = lhs.strip()
+
+        constraint_start = rest.find('<')
+        rhs_text = rest if constraint_start == -1 else rest[:constraint_start]
+        constraints = FEATURE_TOKEN.findall(rest[constraint_start:]) if constraint_start != -1 else []
+
+        # Keep (...) and {...} groups together as single symbols
+        rhs_symbols = re.findall(r'\([^)]*\)|\{[^}]*\}|\S+', rhs_text)
+
+        all_labels = {lhs}
+        for symbol in rhs_symbols:
+            all_labels.update(symbol.strip('(){}').replace('/', ' ').split())
+
+        for rhs in self._expand_rhs(rhs_symbols):
+            if not rhs:
+                continue  # empty expansions are not supported by the chart parser
+            self._compile_rule(name, lhs, rhs, self._group_constraints(constraints), all_labels)
+
+    @staticmethod
+    def _group_constraints(tokens: List[str]) -> List[List[str]]:
+        """Split constraint tokens into [left, '=', right] equations and single template names."""
+        groups = []
+        i = 0
+        while i < len(tokens):
+            if i + 2 < len(tokens) and tokens[i + 1] == '=':
+                groups.append(tokens[i:i + 3])
+                i += 3
+            else:
+                groups.append(tokens[i:i + 1])
+                i += 1
+        return groups
+
+    def _compile_rule(self, name: Optional[str], lhs: str, rhs: List[str], constraints: List[List[str]],
+                      all_labels: set) -> None:
+        labels = [lhs] + rhs
+        root = FNode()
+        for position, label in enumerate(labels):
+            category = label.rsplit('_', 1)[0] if re.match(r'.+_\d+$', label) else label
+            get_path(root, [str(position), 'cat']).atom = category
+
+        # Constraints name daughters by label (NP, NP_1, ...); map them to positions
+        positions = {label: str(i) for i, label in enumerate(labels)}
+        tokens = []
+        for group in constraints:
+            paths = [_parse_path(t) for t in group if t.startswith('<')]
+            for path in paths:
+                if not path or path[0] not in all_labels:
+                    raise PatrError(f"Constraint refers to unknown symbol: {' '.join(group)} in rule {lhs} -> ...")
+            if not all(path[0] in positions for path in paths):
+                continue  # the symbol was left out by an optional element
+            tokens.extend('<' + ' '.join([positions[_parse_path(t)[0]]] + _parse_path(t)[1:]) + '>'
+                          if t.startswith('<') else t for t in group)
+
+        if not self.apply_features(root, tokens):
+            return  # constraints can never be satisfied
+
+        categories = [deref(get_path(root, [str(i), 'cat'])).atom for i in range(len(labels))]
+        rule = Rule(name, categories[0], categories[1:], copy_dag(root), len(self.rules))
+        self.rules.append(rule)
+        self.rules_by_lhs[rule.lhs].append(rule)
+
+
+class LexicalEntry:
+    """One \\w record of the lexicon."""
+
+    __slots__ = ('word', 'category', 'features', 'gloss')
+
+    def __init__(self, word: str, category: str, features: List[str], gloss: Optional[str] = None):
+        self.word = word
+        self.category = category
+        self.features = features
+        self.gloss = gloss
+
+
+class LexicalBundle:
+    """A lexical entry compiled against a grammar: category plus feature DAG."""
+
+    __slots__ = ('category', 'dag', 'signature', 'lemma')
+
+    def __init__(self, category: str, dag: FNode, signature: str, lemma: Optional[str] = None):
+        self.category = category
+        self.dag = dag
+        self.signature = signature
+        self.lemma = lemma  # set when the entry was guessed from another word form
+
+
+def compile_entry(entry: LexicalEntry, grammar: 'Grammar', lemma: Optional[str] = None) -> Optional[LexicalBundle]:
+    """
+    Build the feature structure of a lexical entry.
+
+    Args:
+        entry: Entry read from the lexicon
+        grammar: Grammar providing the templates used in \\f fields
+        lemma: Word form the entry was derived from, for guessed entries
+
+    Returns:
+        The compiled bundle, or None if the entry's features are inconsistent
+    """
+    root = FNode()
+    get_path(root, ['cat']).atom = entry.category
+    if not grammar.apply_features(root, entry.features):
+        return None
+    dag = copy_dag(root)
+    return LexicalBundle(entry.category, dag, dag_signature(dag), lemma)
+
+
+class Lexicon:
+    """Word-form to lexical-entry mapping read from a .lex file."""
+
+    def __init__(self):
+        self.entries = defaultdict(list)
+
+    @classmethod
+    def from_file(cls, path: str) -> 'Lexicon':
+        with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+            return cls.from_string(f.read())
+
+    @classmethod
+    def from_string(cls, text: str) -> 'Lexicon':
+        lexicon = cls()
+        record = None
+        for line in _strip_comments(text):
+            match = re.match(r'\s*\\(\w+)\s*(.*)', line)
+            if not match:
+                if record is not None and line.strip() and record.get('_last'):
+                    record[record['_last']] += ' ' + line.strip()
+                continue
+            field, value = match.group(1), match.group(2).strip()
+            if field == 'w':
+                if record:
+                    lexicon._add_record(record)
+                record = {'w': value, 'c': None, 'f': '', 'g': None, '_last': 'w'}
+            elif record is not None:
+                record[field] = (record.get(field) or '') + (' ' if record.get(field) else '') + value
+                record['_last'] = field
+        if record:
+            lexicon._add_record(record)
+        return lexicon
+
+    def _add_record(self, record: Dict) -> None:
+        if not record['c']:
+            raise PatrError(f"Lexical entry '{record['w']}' has no \\c category")
+        entry = LexicalEntry(record['w'], record['c'], FEATURE_TOKEN.findall(record['f']), record['g'])
+        self.entries[entry.word.lower()].append(entry)
+
+    def lookup(self, word: str) -> List[LexicalEntry]:
+        return self.entries.get(word.lower(), [])
+
+    def bundles(self, word: str, grammar: 'Grammar') -> List[LexicalBundle]:
+        """Compile the entries of a word form (see patr_lexicon.LexiconTrie for a precompiled store)."""
+        compiled = (compile_entry(entry, grammar) for entry in self.lookup(word))
+        return [bundle for bundle in compiled if bundle is not None]
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.entries.values())
+
+
+# ---------------------------------------------------------------------------
+# Packed parse forest
+# ---------------------------------------------------------------------------
+
+class ForestNode:
+    """
+    A packed constituent: category, span and feature structure.
+
+    Leaves carry the word; inner nodes list every (rule, daughters) pair that
+    derives the same constituent.
+    """
+
+    __slots__ = ('category', 'start', 'end', 'dag', 'word', 'alternatives', 'signature')
+
+    def __init__(self, category: str, start: int, end: int, dag: FNode, signature: str,
+                 word: Optional[str] = None):
+        self.category = category
+        self.start = start
+        self.end = end
+        self.dag = dag
+        self.signature = signature
+        self.word = word
+        self.alternatives = []
+
+    def __repr__(self):
+        return f"{self.category}[{self.start}:{self.end}]"
+
+
+class _ActiveEdge:
+    __slots__ = ('rule', 'dot', 'start', 'end', 'dag', 'children')
+
+    def __init__(self, rule: Rule, dot: int, start: int, end: int, dag: FNode, children: Tuple):
+        self.rule = rule
+        self.dot = dot
+        self.start = start
+        self.end = end
+        self.dag = dag
+        self.children = children
+
+
+class ParseResult:
+    """
+    Roots of the parse forest for one sentence plus chart statistics.
+
+    Trees are read out of the forest by patr_forest.py.
+    """
+
+    def __init__(self, sentence: str, words: List[str], roots: List[ForestNode],
+                 unknown_words: List[str], stats: Dict[str, float],
+                 guessed_words: Optional[Dict[str, str]] = None):
+        self.sentence = sentence
+        self.words = words
+        self.roots = roots
+        self.unknown_words = unknown_words
+        self.stats = stats
+        self.guessed_words = guessed_words or {}
+
+
+# ---------------------------------------------------------------------------
+# Earley chart parser
+# ---------------------------------------------------------------------------
+
+class PatrParser:
+    """Earley chart parser over a PATR-II grammar with packed completed edges."""
+
+    def __init__(self, grammar: Grammar, lexicon: Lexicon):
+        """
+        Initialize the parser.
+
+        Args:
+            grammar: Loaded Grammar
+            lexicon: Loaded Lexicon
+        """
+        self.grammar = grammar
+        self.lexicon = lexicon
+
+    @classmethod
+    def from_files(cls, grammar_path: str, lexicon_path: str) -> 'PatrParser':
+        return cls(Grammar.from_file(grammar_path), Lexicon.from_file(lexicon_path))
+
+    def _lexical_nodes(self, words: List[str]) -> Tuple[List[ForestNode], List[str], Dict[str, str]]:
+        nodes = []
+        unknown = []
+        guessed = {}
+        for i, word in enumerate(words):
+            bundles = self.lexicon.bundles(word, self.grammar)
+            if not bundles:
+                unknown.append(word)
+            seen = set()
+            for bundle in bundles:
+                if (bundle.category, bundle.signature) in seen:
+                    continue
+                seen.add((bundle.category, bundle.signature))
+                if bundle.lemma is not None:
+                    guessed[word] = bundle.lemma
+                # Lexical DAGs are shared between parses; unification always undoes its changes
+                nodes.append(ForestNode(bundle.category, i, i + 1, bundle.dag, bundle.signature, word=word))
+        return nodes, unknown, guessed
+
+    def parse(self, sentence: str) -> ParseResult:
+        """
+        Parse one sentence.
+
+        Args:
+            sentence: Whitespace-separated words
+
+        Returns:
+            ParseResult whose roots span the sentence with the start symbol
+        """
+        start_time = time.perf_counter()
+        words = sentence.split()
+        n = len(words)
+
+        passive = defaultdict(list)       # (start, category) -> [ForestNode]
+        active = defaultdict(list)        # (end, next category) -> [_ActiveEdge]
+        packed = {}                       # (category, start, end, signature) -> ForestNode
+        predicted = set()
+        agenda = []
+        stats = {'active_edges': 0, 'passive_edges': 0, 'packed_alternatives': 0,
+                 'unify_attempts': 0, 'unify_failures': 0}
+
+        lexical, unknown, guessed = self._lexical_nodes(words)
+        for node in lexical:
+            packed[(node.category, node.start, node.end, node.signature)] = node
+            agenda.append(('passive', node))
+
+        word_categories = defaultdict(set)
+        for node in lexical:
+            word_categories[node.start].add(node.category)
+        left_corners = self.grammar.left_corners
+
+        def predict(category, position):
+            if (position, category) in predicted:
+                return
+            predicted.add((position, category))
+            next_word = word_categories.get(position)
+            if not next_word:
+                return
+            for rule in self.grammar.rules_by_lhs.get(category, ()):
+                first = rule.rhs[0]
+                if first not in next_word and next_word.isdisjoint(left_corners.get(first, ())):
+                    continue
+                agenda.append(('active', _ActiveEdge(rule, 0, position, position, rule.dag, ())))
+
+        def combine(edge, node):
+            trail = []
+            daughter = edge.dag.arcs[str(edge.dot + 1)]
+            stats['unify_attempts'] += 1
+            if not unify(daughter, node.dag, trail):
+                undo(trail)
+                stats['unify_failures'] += 1
+                return
+
+            dot = edge.dot + 1
+            children = edge.children + (node,)
+            rule = edge.rule
+
+            if dot == len(rule.rhs):
+                dag = copy_dag(edge.dag.arcs['0'])
+                undo(trail)
+                signature = dag_signature(dag)
+                key = (rule.lhs, edge.start, node.end, signature)
+                existing = packed.get(key)
+                if existing is not None:
+                    existing.alternatives.append((rule, children))
+                    stats['packed_alternatives'] += 1
+                    return
+                new_node = ForestNode(rule.lhs, edge.start, node.end, dag, signature)
+                new_node.alternatives.append((rule, children))
+                packed[key] = new_node
+                agenda.append(('passive', new_node))
+            else:
+                # Keep only the mother and the daughters still to be found
+                memo = {}
+                dag = FNode()
+                for label, value in edge.dag.arcs.items():
+                    if label == '0' or int(label) > dot:
+                        dag.arcs[label] = copy_dag(value, memo)
+                undo(trail)
+                agenda.append(('active', _ActiveEdge(rule, dot, edge.start, node.end, dag, children)))
+
+        if self.grammar.start_symbol:
+            predict(self.grammar.start_symbol, 0)
+
+        while agenda:
+            kind, item = agenda.pop()
+            if kind == 'active':
+                stats['active_edges'] += 1
+                next_category = item.rule.rhs[item.dot]
+                active[(item.end, next_category)].append(item)
+                predict(next_category, item.end)
+                for node in list(passive.get((item.end, next_category), ())):
+                    combine(item, node)
+            else:
+                stats['passive_edges'] += 1
+                passive[(item.start, item.category)].append(item)
+                for edge in list(active.get((item.start, item.category), ())):
+                    combine(edge, item)
+
+        roots = [node for node in passive.get((0, self.grammar.start_symbol), ()) if node.end == n and n > 0]
+        stats['seconds'] = time.perf_counter() - start_time
+
+        return ParseResult(sentence, words, roots, unknown, stats, guessed)
+
+
+def main():
+    """Equivalent of exercise1.tak: load grammar and lexicon, parse sentences.txt into out.txt."""
+    import argparse
+    from patr_forest import parse_file
+
+    here = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'NLP-HW4-files')
+
+    parser = argparse.ArgumentParser(description='PATR-II chart parser')
+    parser.add_argument('--grammar', default=os.path.join(here, 'exercise1.grm'))
+    parser.add_argument('--lexicon', default=os.path.join(here, 'exercise1.lex'))
+    parser.add_argument('--sentences', default=os.path.join(here, 'sentences.txt'))
+    parser.add_argument('--output', default='out.txt')
+    parser.add_argument('--max-trees', type=int, default=None)
+    args = parser.parse_args()
+
+    patr = PatrParser.from_files(args.grammar, args.lexicon)
+    print(f"Loaded {len(patr.grammar.rules)} rules and {len(patr.lexicon)} lexical entries")
+
+    results = parse_file(patr, args.sentences, args.output, args.max_trees)
+
+    parsed = sum(1 for r in results if r.roots)
+    total_time = sum(r.stats['seconds'] for r in results)
+    print(f"Parsed {parsed}/{len(results)} sentences in {total_time * 1000:.1f} ms")
+    print(f"Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()